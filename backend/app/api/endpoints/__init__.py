@@ -1,3 +1 @@
-from . import categories, transactions, goals, investments, dashboard
-
-__all__ = ["categories", "transactions", "goals", "investments", "dashboard"]
\ No newline at end of file
+# Módulos de endpoints são importados individualmente (ver app.api.router)
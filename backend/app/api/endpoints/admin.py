@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db, async_engine, engine, sqlite_pragmas, IS_SQLITE
+from app.services.cache_service import response_cache
+from app.services.auth_cache import auth_cache_stats
+from app.services.password_service import password_hasher
+
+router = APIRouter()
+
+def _pool_info(pool) -> dict:
+    info = {"class": type(pool).__name__, "status": pool.status()}
+    for attr in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, attr, None)
+        if callable(method):
+            info[attr] = method()
+    return info
+
+@router.get("/db-info")
+async def get_db_info(db: AsyncSession = Depends(get_async_db)):
+    """Informações do banco: pragmas efetivos da conexão e estado dos pools"""
+    effective = {}
+    if IS_SQLITE:
+        for name in sqlite_pragmas():
+            effective[name] = (await db.execute(text(f"PRAGMA {name}"))).scalar()
+        effective["sqlite_version"] = (await db.execute(text("SELECT sqlite_version()"))).scalar()
+    else:
+        effective["server_version"] = (await db.execute(text("SELECT version()"))).scalar()
+    
+    return {
+        "dialect": async_engine.dialect.name,
+        "driver": async_engine.dialect.driver,
+        "configured_pragmas": sqlite_pragmas() if IS_SQLITE else {},
+        "effective": effective,
+        "pools": {
+            "sync": _pool_info(engine.pool),
+            "async": _pool_info(async_engine.pool)
+        }
+    }
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Contadores do cache de respostas (acertos, falhas, despejos e memória)"""
+    return response_cache.stats()
+
+
+@router.get("/auth-cache-stats")
+async def get_auth_cache_stats():
+    """Acertos e falhas dos caches de tokens verificados e de usuários"""
+    return auth_cache_stats()
+
+
+@router.get("/password-hash-stats")
+async def get_password_hash_stats():
+    """Estado do pool de bcrypt (workers, em andamento, concluídos e rejeitados)"""
+    return password_hasher.stats()
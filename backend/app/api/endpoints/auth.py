@@ -4,12 +4,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.database import get_db
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token, TokenData
 from app.services.user_service import (
-    get_user_by_username, get_user_by_email, create_user, authenticate_user, get_user_by_id
+    get_user_by_username, get_user_by_email, create_user_async, authenticate_user_async, get_user_by_id
 )
 from app.services.category_service import create_default_categories
+from app.services.auth_cache import decode_token, get_cached_user
 
 # Configuração JWT
 SECRET_KEY = "ruviopay_secret_key_2025"  # Em produção, use uma chave mais segura
@@ -35,7 +37,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token, SECRET_KEY, ALGORITHM)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -43,44 +45,53 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = get_user_by_username(db, username=token_data.username)
+    user = get_cached_user(
+        "username", token_data.username,
+        lambda: get_user_by_username(db, username=token_data.username)
+    )
     if user is None:
         raise credentials_exception
+    # O token continua válido até o exp: a desativação vale pelo usuário
+    # (relido do banco após invalidate_user; nos outros workers, após o TTL)
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/register", response_model=UserResponse)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    # Verificar se usuário já existe
-    if get_user_by_username(db, user.username):
+async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+    # Verificar se usuário já existe (consultas no threadpool, fora do event loop)
+    if await run_in_threadpool(get_user_by_username, db, user.username):
         raise HTTPException(
             status_code=400,
             detail="Username already registered"
         )
-    if get_user_by_email(db, user.email):
+    if await run_in_threadpool(get_user_by_email, db, user.email):
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
     
-    # Criar usuário
-    db_user = create_user(db=db, user=user)
+    # Criar usuário (bcrypt no pool de hashing, fora do threadpool)
+    db_user = await create_user_async(db, user)
     
     # Criar categorias padrão
-    create_default_categories(db, db_user.id)
+    await run_in_threadpool(create_default_categories, db, db_user.id)
     
     return db_user
 
 @router.post("/login", response_model=Token)
-def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
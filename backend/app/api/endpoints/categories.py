@@ -1,10 +1,11 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
-from app.services.category_service import (
-    get_categories_by_user, get_categories_by_type, get_category_by_id,
+from typing import List, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryStats
+from app.services.async_services import (
+    get_categories_by_user, get_categories_by_type, get_category_by_id, get_category_stats,
     create_category, update_category, delete_category
 )
 
@@ -14,22 +15,38 @@ DEFAULT_USER_ID = 1
 router = APIRouter()
 
 @router.get("/", response_model=List[CategoryResponse])
-def get_user_categories(
+async def get_user_categories(
     category_type: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obter todas as categorias do usuário"""
     if category_type:
-        return get_categories_by_type(db, DEFAULT_USER_ID, category_type)
-    return get_categories_by_user(db, DEFAULT_USER_ID)
+        return await get_categories_by_type(db, DEFAULT_USER_ID, category_type)
+    return await get_categories_by_user(db, DEFAULT_USER_ID)
+
+@router.get("/stats", response_model=List[CategoryStats])
+async def get_user_category_stats(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category_type: Optional[str] = Query(None, pattern="^(income|expense)$"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Quantidade e total de transações por categoria, opcionalmente por período
+
+    ``end_date`` é inclusivo; no primeiro dia de um mês à meia-noite vale
+    como limite exclusivo (ex.: ``end_date=2024-06-01`` vai até o fim de maio).
+    """
+    return await get_category_stats(
+        db, DEFAULT_USER_ID, start_date=start_date, end_date=end_date, category_type=category_type
+    )
 
 @router.get("/{category_id}", response_model=CategoryResponse)
-def get_category(
+async def get_category(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obter uma categoria específica"""
-    category = get_category_by_id(db, category_id, DEFAULT_USER_ID)
+    category = await get_category_by_id(db, category_id, DEFAULT_USER_ID)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,21 +55,21 @@ def get_category(
     return category
 
 @router.post("/", response_model=CategoryResponse)
-def create_new_category(
+async def create_new_category(
     category: CategoryCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Criar uma nova categoria"""
-    return create_category(db, category, DEFAULT_USER_ID)
+    return await create_category(db, category, DEFAULT_USER_ID)
 
 @router.put("/{category_id}", response_model=CategoryResponse)
-def update_existing_category(
+async def update_existing_category(
     category_id: int,
     category_update: CategoryUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualizar uma categoria"""
-    category = update_category(db, category_id, category_update, DEFAULT_USER_ID)
+    category = await update_category(db, category_id, category_update, DEFAULT_USER_ID)
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -61,12 +78,12 @@ def update_existing_category(
     return category
 
 @router.delete("/{category_id}")
-def delete_existing_category(
+async def delete_existing_category(
     category_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Deletar uma categoria"""
-    success = delete_category(db, category_id, DEFAULT_USER_ID)
+    success = await delete_category(db, category_id, DEFAULT_USER_ID)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
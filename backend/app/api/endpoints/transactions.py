@@ -1,12 +1,16 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse
-from app.services.transaction_service import (
-    get_transactions_by_user, get_transaction_by_id, create_transaction,
+from app.database import get_async_db, AsyncSessionLocal
+from app.api.responses import FastJSONResponse
+from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse, TransactionPage
+from app.services.async_services import (
+    get_transactions_by_user, get_transactions_page, get_transaction_by_id, create_transaction,
+    search_transactions,
+    stream_transactions_for_export,
     update_transaction, delete_transaction, get_user_balance,
     get_monthly_summary, get_recent_transactions
 )
@@ -16,42 +20,81 @@ DEFAULT_USER_ID = 1
 
 router = APIRouter()
 
-@router.get("/", response_model=List[TransactionResponse])
-def get_user_transactions(
+@router.get("/", response_model=Union[List[TransactionResponse], TransactionPage])
+async def get_user_transactions(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     transaction_type: Optional[str] = None,
     category_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    sort_by: str = Query("date", pattern="^(date|amount|description)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Paginação por cursor: envie vazio na primeira página e depois o next_cursor recebido"
+    ),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obter todas as transações do usuário"""
-    return get_transactions_by_user(
-        db, DEFAULT_USER_ID, skip, limit, 
+    if cursor is not None:
+        try:
+            page = await get_transactions_page(
+                db, DEFAULT_USER_ID, limit, cursor,
+                start_date, end_date, transaction_type, category_id,
+                sort_by, order
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        return FastJSONResponse(page)
+
+    # Saída do service já tem o formato de TransactionResponse: serializar direto
+    return FastJSONResponse(await get_transactions_by_user(
+        db, DEFAULT_USER_ID, skip, limit,
+        start_date, end_date, transaction_type, category_id,
+        sort_by, order
+    ))
+
+@router.get("/search", response_model=List[TransactionResponse])
+async def search_user_transactions(
+    q: str = Query(..., min_length=1, description="Termos buscados (por prefixo) na descrição e nas observações"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Buscar transações por texto, ordenadas por relevância"""
+    return FastJSONResponse(await search_transactions(
+        db, DEFAULT_USER_ID, q, skip, limit,
         start_date, end_date, transaction_type, category_id
-    )
+    ))
 
 @router.get("/recent", response_model=List[TransactionResponse])
-def get_recent_user_transactions(
+async def get_recent_user_transactions(
     limit: int = Query(5, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obter as transações mais recentes"""
-    return get_recent_transactions(db, DEFAULT_USER_ID, limit)
+    return FastJSONResponse(await get_recent_transactions(db, DEFAULT_USER_ID, limit))
 
 @router.get("/balance")
-def get_balance(
-    db: Session = Depends(get_db)
+async def get_balance(
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obter saldo do usuário"""
-    return get_user_balance(db, DEFAULT_USER_ID)
+    return await get_user_balance(db, DEFAULT_USER_ID)
 
 @router.get("/summary/{year}/{month}")
-def get_summary(
+async def get_summary(
     year: int,
     month: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obter resumo mensal"""
     if month < 1 or month > 12:
@@ -59,15 +102,45 @@ def get_summary(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Month must be between 1 and 12"
         )
-    return get_monthly_summary(db, DEFAULT_USER_ID, year, month)
+    return await get_monthly_summary(db, DEFAULT_USER_ID, year, month)
+
+@router.get("/export")
+async def export_transactions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category_id: Optional[int] = None
+):
+    """Exportar transações em CSV ou NDJSON (resposta em streaming)"""
+    # Importação/exportação carregadas no primeiro uso (fora da startup)
+    from app.services.export_service import ENCODERS, encode_stream
+
+    encoder = ENCODERS[format]()
+
+    async def generate():
+        # Sessão própria: o streaming continua depois que o endpoint retorna
+        async with AsyncSessionLocal() as db:
+            rows = stream_transactions_for_export(
+                db, DEFAULT_USER_ID, start_date, end_date, transaction_type, category_id
+            )
+            async for chunk in encode_stream(rows, encoder):
+                yield chunk
+
+    filename = f"transacoes-{datetime.now():%Y%m%d}.{format}"
+    return StreamingResponse(
+        generate(),
+        media_type=encoder.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
-def get_transaction(
+async def get_transaction(
     transaction_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obter uma transação específica"""
-    transaction = get_transaction_by_id(db, transaction_id, DEFAULT_USER_ID)
+    transaction = await get_transaction_by_id(db, transaction_id, DEFAULT_USER_ID)
     if not transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -76,21 +149,60 @@ def get_transaction(
     return transaction
 
 @router.post("/", response_model=TransactionResponse)
-def create_new_transaction(
+async def create_new_transaction(
     transaction: TransactionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Criar uma nova transação"""
-    return create_transaction(db, transaction, DEFAULT_USER_ID)
+    return await create_transaction(db, transaction, DEFAULT_USER_ID)
+
+@router.post("/bulk")
+async def bulk_import_transactions(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ofx|ndjson)$"),
+    category_id: Optional[int] = Query(None, description="Categoria usada nas linhas sem category_id (ex.: OFX)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Importar transações em lote (CSV, OFX ou NDJSON) a partir do corpo da requisição"""
+    from app.services.import_parsers import CONTENT_TYPES, get_parser
+    from app.services.import_service import TransactionImporter
+
+    import_format = format or CONTENT_TYPES.get(
+        request.headers.get("content-type", "").split(";")[0].strip().lower()
+    )
+    if not import_format:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Use format=csv|ofx|ndjson or a matching Content-Type"
+        )
+
+    parser = get_parser(import_format)
+    importer = await db.run_sync(TransactionImporter, DEFAULT_USER_ID, category_id)
+    try:
+        # O corpo é lido em pedaços e validado/inserido à medida que chega
+        async for chunk in request.stream():
+            rows = parser.feed(chunk)
+            if rows:
+                await db.run_sync(lambda _: importer.add_rows(rows))
+        rows = parser.close()
+        await db.run_sync(lambda _: importer.add_rows(rows))
+    except ValueError as e:
+        await db.run_sync(lambda _: importer.abort())
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except BaseException:
+        await db.run_sync(lambda _: importer.abort())
+        raise
+
+    return await db.run_sync(lambda _: importer.finish())
 
 @router.put("/{transaction_id}", response_model=TransactionResponse)
-def update_existing_transaction(
+async def update_existing_transaction(
     transaction_id: int,
     transaction_update: TransactionUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Atualizar uma transação"""
-    transaction = update_transaction(db, transaction_id, transaction_update, DEFAULT_USER_ID)
+    transaction = await update_transaction(db, transaction_id, transaction_update, DEFAULT_USER_ID)
     if not transaction:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -99,12 +211,12 @@ def update_existing_transaction(
     return transaction
 
 @router.delete("/{transaction_id}")
-def delete_existing_transaction(
+async def delete_existing_transaction(
     transaction_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Deletar uma transação"""
-    success = delete_transaction(db, transaction_id, DEFAULT_USER_ID)
+    success = await delete_transaction(db, transaction_id, DEFAULT_USER_ID)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
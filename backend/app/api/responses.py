@@ -0,0 +1,35 @@
+"""
+Respostas JSON serializadas com orjson.
+
+``FastJSONResponse`` é a classe de resposta padrão da API. Para listas
+grandes montadas pelos services (dados já confiáveis, com as mesmas
+chaves do response_model), os endpoints devolvem ``FastJSONResponse``
+diretamente: o FastAPI não valida cada item de novo com pydantic e o
+orjson serializa a lista de dicts em uma única chamada.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(value: Any) -> Any:
+    # Mesmo formato do pydantic no modo JSON: Decimal vira string ("12.30")
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse com orjson; aceita Decimal e datetime sem jsonable_encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,11 +1,89 @@
-from fastapi import APIRouter
-from .endpoints import transactions, categories, dashboard, investments, goals
+import importlib
+from typing import List, Tuple
 
-api_router = APIRouter()
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
 
-# Incluir rotas
-api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
-api_router.include_router(categories.router, prefix="/categories", tags=["categories"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
-api_router.include_router(investments.router, prefix="/investments", tags=["investments"])
-api_router.include_router(goals.router, prefix="/goals", tags=["goals"])
\ No newline at end of file
+# (módulo com ``router``, prefixo, tags)
+API_ROUTERS: List[Tuple[str, str, List[str]]] = [
+    ("app.api.endpoints.transactions", "/transactions", ["transactions"]),
+    ("app.api.endpoints.categories", "/categories", ["categories"]),
+    ("app.api.endpoints.dashboard", "/dashboard", ["dashboard"]),
+    ("app.api.endpoints.admin", "/admin", ["admin"]),
+    ("app.api.endpoints.investments", "/investments", ["investments"]),
+    ("app.api.endpoints.goals", "/goals", ["goals"]),
+]
+
+
+class LazyRouter(BaseRoute):
+    """Rota provisória de um prefixo cujo módulo ainda não foi importado.
+
+    No primeiro acesso ao prefixo o módulo é importado, o router real é
+    incluído no app no lugar desta rota e a requisição é despachada de
+    novo. Handlers de exceção, classe de resposta padrão e overrides de
+    dependências são os do próprio app.
+    """
+
+    def __init__(self, app: FastAPI, module: str, prefix: str, tags: List[str]):
+        self.app = app
+        self.module = module
+        self.prefix = prefix
+        self.tags = tags
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] == "http":
+            path = scope["path"]
+            root_path = scope.get("root_path", "")
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            if path == self.prefix or path.startswith(self.prefix + "/"):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def load(self) -> None:
+        routes = self.app.router.routes
+        if self not in routes:
+            return
+        position = routes.index(self)
+        routes.remove(self)
+        count = len(routes)
+        router = importlib.import_module(self.module).router
+        self.app.include_router(router, prefix=self.prefix, tags=self.tags)
+        # Mantém a ordem original: as rotas novas entram onde estava a provisória
+        added = routes[count:]
+        del routes[count:]
+        routes[position:position] = added
+        self.app.openapi_schema = None
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.load()
+        await self.app.router(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params):
+        raise NoMatchFound(name, path_params)
+
+
+def load_lazy_routers(app: FastAPI) -> None:
+    for route in [r for r in app.router.routes if isinstance(r, LazyRouter)]:
+        route.load()
+
+
+def include_api_routers(app: FastAPI, prefix: str, lazy: bool = False) -> None:
+    """Registra os routers da API; com ``lazy`` cada módulo só é importado no primeiro acesso"""
+    for module, router_prefix, tags in API_ROUTERS:
+        if lazy:
+            app.router.routes.append(LazyRouter(app, module, prefix + router_prefix, tags))
+        else:
+            router = importlib.import_module(module).router
+            app.include_router(router, prefix=prefix + router_prefix, tags=tags)
+
+    if lazy:
+        # /docs e /openapi.json carregam todos os routers antes de gerar o schema
+        default_openapi = app.openapi
+
+        def openapi():
+            load_lazy_routers(app)
+            return default_openapi()
+
+        app.openapi = openapi
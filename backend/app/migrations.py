@@ -0,0 +1,307 @@
+"""
+Migrações incrementais do banco de dados.
+
+Cada migração é uma função que recebe uma conexão aberta dentro de uma
+transação. As migrações aplicadas ficam registradas na tabela
+``schema_migrations`` e são executadas uma única vez, em ordem.
+
+A tabela ``schema_version`` guarda a última migração e um hash do schema
+declarado (modelos + lista de migrações). Na startup, ``ensure_schema``
+lê esse hash com uma única consulta e, se ele confere, não faz reflexão
+nem ``create_all``.
+
+``rebuild_table_online`` substitui o antigo DROP + CREATE de
+``update_database.py``: a tabela é recriada com o schema dos modelos e os
+dados são copiados em lotes por id, com o progresso gravado em
+``schema_copy_progress`` para que uma cópia interrompida continue de onde
+parou.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Dialect, Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+import app.models  # noqa: F401  (registra as tabelas em Base.metadata para o schema_hash)
+from app.database import Base
+from app.services.rollup_service import rebuild_rollups
+from app.services.search_service import create_search_index
+
+migrations_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migrations_metadata,
+    Column("name", String(100), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+schema_version = Table(
+    "schema_version",
+    migrations_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("version", String(100), nullable=False),
+    Column("schema_hash", String(64), nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+schema_copy_progress = Table(
+    "schema_copy_progress",
+    migrations_metadata,
+    Column("table_name", String(100), primary_key=True),
+    Column("last_id", BigInteger, nullable=False),
+    Column("copied", BigInteger, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+def _create_managed_indexes(conn: Connection) -> None:
+    """Cria os índices declarados nos modelos que ainda não existem no banco"""
+    # create_all só cria índices junto com tabelas novas; bancos antigos
+    # precisam que os índices compostos sejam criados explicitamente.
+    Base.metadata.create_all(bind=conn)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+# Colunas monetárias que passaram de NUMERIC/REAL para centavos inteiros (Money)
+MONEY_COLUMNS = (
+    ("transactions", "amount"),
+    ("transaction_rollups", "total"),
+    ("goals", "target_amount"),
+    ("goals", "current_amount"),
+    ("investments", "amount_invested"),
+    ("investments", "current_value"),
+)
+
+
+def _money_to_cents(conn: Connection) -> None:
+    """Converte valores em reais para centavos inteiros nas colunas monetárias"""
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    for table_name, column_name in MONEY_COLUMNS:
+        # Bancos de layouts antigos podem não ter a tabela ou a coluna
+        if table_name not in tables:
+            continue
+        column_types = {c["name"]: c["type"] for c in inspector.get_columns(table_name)}
+        # Tabelas criadas já com o tipo Money (BIGINT) não precisam de conversão
+        if column_name not in column_types or isinstance(column_types[column_name], (BigInteger, Integer)):
+            continue
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(
+                f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                f"TYPE BIGINT USING ROUND({column_name} * 100)::BIGINT"
+            ))
+        else:
+            # SQLite: a afinidade NUMERIC da coluna guarda o resultado como INTEGER
+            conn.execute(text(
+                f"UPDATE {table_name} SET {column_name} = CAST(ROUND({column_name} * 100) AS INTEGER) "
+                f"WHERE {column_name} IS NOT NULL"
+            ))
+
+
+def _backfill_rollups(conn: Connection) -> None:
+    """Popula transaction_rollups a partir das transações já existentes"""
+    # Sem isso, saldo, resumo mensal e gráficos leem uma tabela vazia até
+    # alguém rodar rebuild_rollups.py. O commit da sessão vira um savepoint
+    # dentro da transação da migração.
+    with Session(bind=conn, join_transaction_mode="create_savepoint") as db:
+        rebuild_rollups(db)
+
+
+MIGRATIONS: List[Tuple[str, Callable[[Connection], None]]] = [
+    ("0001_composite_indexes", _create_managed_indexes),
+    ("0002_transactions_fts", create_search_index),
+    ("0003_money_cents", _money_to_cents),
+    ("0004_backfill_rollups", _backfill_rollups),
+]
+
+
+_schema_hashes: Dict[str, str] = {}
+
+
+def schema_hash(dialect: Dialect) -> str:
+    """Hash do schema declarado: DDL das tabelas e índices dos modelos + migrações"""
+    if dialect.name in _schema_hashes:
+        return _schema_hashes[dialect.name]
+    digest = hashlib.sha256()
+    for name, _ in MIGRATIONS:
+        digest.update(name.encode())
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    _schema_hashes[dialect.name] = digest.hexdigest()
+    return _schema_hashes[dialect.name]
+
+
+def stored_schema_hash(conn: Connection) -> Optional[str]:
+    """Hash gravado na última migração; None em bancos novos ou anteriores a schema_version"""
+    try:
+        return conn.execute(
+            select(schema_version.c.schema_hash).where(schema_version.c.id == 1)
+        ).scalar_one_or_none()
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def _record_schema_version(conn: Connection) -> None:
+    values = {
+        "version": MIGRATIONS[-1][0],
+        "schema_hash": schema_hash(conn.dialect),
+        "updated_at": datetime.utcnow(),
+    }
+    if conn.execute(schema_version.update().where(schema_version.c.id == 1).values(**values)).rowcount == 0:
+        conn.execute(schema_version.insert().values(id=1, **values))
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """Aplica as migrações pendentes e retorna os nomes aplicadas"""
+    migrations_metadata.create_all(bind=engine)
+
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.name)).scalars())
+
+    newly_applied = []
+    for name, migration in MIGRATIONS:
+        if name in applied:
+            continue
+        with engine.begin() as conn:
+            migration(conn)
+            conn.execute(
+                schema_migrations.insert().values(name=name, applied_at=datetime.utcnow())
+            )
+        newly_applied.append(name)
+
+    with engine.begin() as conn:
+        _record_schema_version(conn)
+    return newly_applied
+
+
+def ensure_schema(engine: Engine) -> List[str]:
+    """Startup: uma consulta quando o schema está em dia; senão cria tabelas e migra"""
+    with engine.connect() as conn:
+        if stored_schema_hash(conn) == schema_hash(engine.dialect):
+            return []
+
+    Base.metadata.create_all(bind=engine)
+    return run_migrations(engine)
+
+
+def _copy_batch(conn: Connection, source: str, target: str, columns: str,
+                expressions: str, last_id: int, batch_size: int) -> Tuple[int, int]:
+    """Copia o próximo lote (id > last_id); retorna (último id copiado, linhas)"""
+    upper = conn.execute(
+        text(f"SELECT id FROM {source} WHERE id > :last ORDER BY id LIMIT 1 OFFSET :offset"),
+        {"last": last_id, "offset": batch_size - 1}
+    ).scalar()
+    if upper is None:
+        upper = conn.execute(text(f"SELECT MAX(id) FROM {source}")).scalar()
+        if upper is None or upper <= last_id:
+            return last_id, 0
+    copied = conn.execute(
+        text(f"INSERT INTO {target} ({columns}) SELECT {expressions} FROM {source} "
+             f"WHERE id > :last AND id <= :upper"),
+        {"last": last_id, "upper": upper}
+    ).rowcount
+    return upper, copied
+
+
+def rebuild_table_online(
+    engine: Engine,
+    table: Table,
+    column_map: Optional[Dict[str, str]] = None,
+    batch_size: int = 5000,
+    max_batches: Optional[int] = None,
+) -> bool:
+    """Recria ``table`` com o schema dos modelos sem perder dados.
+
+    As linhas são copiadas para ``<tabela>__new`` em lotes por id, cada um
+    em sua própria transação (escritas concorrentes só esperam um lote).
+    ``column_map`` mapeia coluna nova -> expressão SQL sobre a tabela
+    antiga; colunas com o mesmo nome são copiadas diretamente. A troca
+    final (último lote, DROP da antiga e RENAME da nova) é atômica.
+
+    Linhas alteradas na tabela antiga depois de copiadas não são copiadas
+    de novo: rode fora dos horários de escrita intensa.
+
+    Com ``max_batches`` a cópia para depois de N lotes e retorna False;
+    uma nova chamada continua do id gravado em ``schema_copy_progress``.
+    Retorna True quando a tabela foi trocada. Pensado para o SQLite, que
+    não altera tipos de coluna com ALTER TABLE.
+    """
+    migrations_metadata.create_all(bind=engine)
+    name = table.name
+    target_name = f"{name}__new"
+    column_map = column_map or {}
+
+    source_columns = {c["name"] for c in inspect(engine).get_columns(name)}
+    mapping = {}
+    for column in table.columns:
+        if column.name in column_map:
+            mapping[column.name] = column_map[column.name]
+        elif column.name in source_columns:
+            mapping[column.name] = column.name
+        elif not column.nullable and column.server_default is None and not column.primary_key:
+            raise ValueError(f"{name}.{column.name}: coluna obrigatória sem origem em column_map")
+    columns = ", ".join(mapping)
+    expressions = ", ".join(mapping.values())
+
+    # Índices só depois da troca: nomes de índice são globais no SQLite
+    # As chaves estrangeiras da cópia precisam das tabelas referenciadas
+    scratch = MetaData()
+    for other in table.metadata.sorted_tables:
+        if other is not table:
+            other.to_metadata(scratch)
+    target = table.to_metadata(scratch, name=target_name)
+    target.indexes.clear()
+    target.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        progress = conn.execute(
+            select(schema_copy_progress.c.last_id, schema_copy_progress.c.copied)
+            .where(schema_copy_progress.c.table_name == name)
+        ).first()
+        if progress is None:
+            conn.execute(schema_copy_progress.insert().values(
+                table_name=name, last_id=0, copied=0, updated_at=datetime.utcnow()
+            ))
+            last_id, total = 0, 0
+        else:
+            last_id, total = progress
+
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with engine.begin() as conn:
+            last_id, copied = _copy_batch(conn, name, target_name, columns, expressions, last_id, batch_size)
+            if copied == 0:
+                break
+            total += copied
+            conn.execute(
+                schema_copy_progress.update()
+                .where(schema_copy_progress.c.table_name == name)
+                .values(last_id=last_id, copied=total, updated_at=datetime.utcnow())
+            )
+        batches += 1
+    else:
+        return False
+
+    with engine.begin() as conn:
+        # Linhas inseridas durante a cópia entram no mesmo commit da troca
+        copied = True
+        while copied:
+            last_id, copied = _copy_batch(conn, name, target_name, columns, expressions, last_id, batch_size)
+        conn.execute(text(f"DROP TABLE {name}"))
+        conn.execute(text(f"ALTER TABLE {target_name} RENAME TO {name}"))
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+        if name == "transactions":
+            # Os ids são preservados; só os triggers do FTS caem com o DROP
+            create_search_index(conn)
+        conn.execute(schema_copy_progress.delete().where(schema_copy_progress.c.table_name == name))
+    return True
@@ -3,5 +3,6 @@ from .category import Category
 from .transaction import Transaction
 from .investment import Investment
 from .goal import Goal
+from .transaction_rollup import TransactionRollup
 
-__all__ = ["User", "Category", "Transaction", "Investment", "Goal"]
\ No newline at end of file
+__all__ = ["User", "Category", "Transaction", "Investment", "Goal", "TransactionRollup"]
\ No newline at end of file
@@ -1,17 +1,21 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from app.models.types import Money
 from app.database import Base
 
 class Goal(Base):
     __tablename__ = "goals"
+    __table_args__ = (
+        Index("ix_goals_user_active_created", "user_id", "is_active", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(String(500))
     goal_type = Column(String(50), nullable=False)  # 'expense_limit', 'savings_target', 'investment_goal'
-    target_amount = Column(Numeric(15, 2), nullable=False)
-    current_amount = Column(Numeric(15, 2), default=0)
+    target_amount = Column(Money, nullable=False)
+    current_amount = Column(Money, default=0)
     period_type = Column(String(20), nullable=False)  # 'monthly', 'yearly', 'custom'
     start_date = Column(DateTime(timezone=True), nullable=False)
     end_date = Column(DateTime(timezone=True), nullable=False)
@@ -23,4 +27,5 @@ class Goal(Base):
     
     # Relacionamentos
     user = relationship("User", back_populates="goals")
-    category = relationship("Category")
\ No newline at end of file
+    # Nunca carregada item a item (N+1): consulte a categoria junto, se precisar
+    category = relationship("Category", lazy="raise_on_sql")
\ No newline at end of file
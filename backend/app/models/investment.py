@@ -1,16 +1,23 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from app.models.types import Money
 from app.database import Base
 
 class Investment(Base):
     __tablename__ = "investments"
+    __table_args__ = (
+        # Listagem por data de compra e somas por período (metas de investimento)
+        Index("ix_investments_user_date", "user_id", "purchase_date", "amount_invested"),
+        # Resumo por tipo: índice de cobertura
+        Index("ix_investments_user_type", "user_id", "type", "amount_invested", "current_value"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     type = Column(String(50), nullable=False)  # 'stocks', 'crypto', 'funds', 'real_estate', etc
-    amount_invested = Column(Numeric(15, 2), nullable=False)
-    current_value = Column(Numeric(15, 2), nullable=False)
+    amount_invested = Column(Money, nullable=False)
+    current_value = Column(Money, nullable=False)
     purchase_date = Column(DateTime(timezone=True), nullable=False)
     description = Column(Text)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from app.models.types import Money
 
 Base = declarative_base()
 
@@ -40,7 +41,7 @@ class Transaction(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     type = Column(String, nullable=False)  # 'receita' ou 'despesa'
     date = Column(DateTime, nullable=False)
     is_recurring = Column(Boolean, default=False)
@@ -60,7 +61,7 @@ class Budget(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Money, nullable=False)
     period = Column(String, nullable=False)  # 'monthly', 'yearly'
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
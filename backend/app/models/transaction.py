@@ -1,14 +1,25 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from app.models.types import Money
 from app.database import Base
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Listagem ordenada por data (também serve a paginação por cursor)
+        Index("ix_transactions_user_date", "user_id", "date"),
+        # Somas por tipo/período (saldo, resumos, metas): índice de cobertura
+        Index("ix_transactions_user_type_date", "user_id", "type", "date", "amount"),
+        Index("ix_transactions_user_category_date", "user_id", "category_id", "date"),
+        # Ordenações alternativas da listagem
+        Index("ix_transactions_user_amount", "user_id", "amount"),
+        Index("ix_transactions_user_description", "user_id", "description"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String(255), nullable=False)
-    amount = Column(Numeric(10, 2), nullable=False)
+    amount = Column(Money, nullable=False)
     type = Column(String(20), nullable=False)  # 'income' ou 'expense'
     date = Column(DateTime(timezone=True), nullable=False)
     notes = Column(Text)
@@ -19,4 +30,5 @@ class Transaction(Base):
     
     # Relacionamentos
     user = relationship("User", back_populates="transactions")
-    category = relationship("Category", back_populates="transactions")
\ No newline at end of file
+    # Os services trazem o nome da categoria no JOIN; carregar item a item seria N+1
+    category = relationship("Category", back_populates="transactions", lazy="raise_on_sql")
\ No newline at end of file
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.models.types import Money
+from app.database import Base
+
+class TransactionRollup(Base):
+    """Totais mensais de transações por usuário, tipo e categoria.
+
+    Mantida incrementalmente pelo transaction_service na mesma transação
+    do banco que grava a transação; pode ser reconstruída com
+    ``rebuild_rollups.py``.
+    """
+    __tablename__ = "transaction_rollups"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    year_month = Column(String(7), primary_key=True)  # 'YYYY-MM'
+    type = Column(String(20), primary_key=True)  # 'income' ou 'expense'
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    total = Column(Money, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
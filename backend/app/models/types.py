@@ -0,0 +1,54 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
+from sqlalchemy import BigInteger, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+CENT = Decimal("0.01")
+
+
+def to_cents(value) -> int:
+    """Converte um valor monetário (Decimal, int, float ou str) em centavos"""
+    if not isinstance(value, Decimal):
+        # str() evita levar o erro binário do float para o Decimal
+        value = Decimal(str(value))
+    return int(value.quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def from_cents(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+class Money(TypeDecorator):
+    """Valor monetário gravado como inteiro de 64 bits em centavos.
+
+    Na aplicação os valores continuam sendo Decimal com duas casas; no
+    banco, somas e comparações são aritmética inteira e exata (em SQLite,
+    somas de NUMERIC caem para float).
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return Decimal
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return to_cents(value)
+
+    def process_result_value(self, value, dialect) -> Optional[Decimal]:
+        if value is None:
+            return None
+        return from_cents(value)
+
+
+def cents(expression):
+    """Lê uma expressão Money (ex.: uma soma) como centavos inteiros, sem Decimal"""
+    return type_coerce(expression, BigInteger)
+
+
+def cents_to_float(value: Optional[int]) -> float:
+    """Centavos inteiros para float na resposta (caminho rápido, sem Decimal)"""
+    return (value or 0) / 100
@@ -1,13 +1,13 @@
 from .user import UserCreate, UserUpdate, UserResponse, UserLogin, Token, TokenData
 from .category import CategoryCreate, CategoryUpdate, CategoryResponse
-from .transaction import TransactionCreate, TransactionUpdate, TransactionResponse
+from .transaction import TransactionCreate, TransactionUpdate, TransactionResponse, TransactionPage
 from .investment import InvestmentCreate, InvestmentUpdate, InvestmentResponse
 from .goal import GoalCreate, GoalUpdate, GoalResponse
 
 __all__ = [
     "UserCreate", "UserUpdate", "UserResponse", "UserLogin", "Token", "TokenData",
     "CategoryCreate", "CategoryUpdate", "CategoryResponse", 
-    "TransactionCreate", "TransactionUpdate", "TransactionResponse",
+    "TransactionCreate", "TransactionUpdate", "TransactionResponse", "TransactionPage",
     "InvestmentCreate", "InvestmentUpdate", "InvestmentResponse",
     "GoalCreate", "GoalUpdate", "GoalResponse"
 ]
\ No newline at end of file
@@ -27,4 +27,13 @@ class CategoryResponse(CategoryBase):
     updated_at: Optional[datetime] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CategoryStats(BaseModel):
+    id: int
+    name: str
+    type: str
+    color: Optional[str] = None
+    icon: Optional[str] = None
+    transaction_count: int
+    total_amount: float
\ No newline at end of file
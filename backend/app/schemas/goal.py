@@ -1,6 +1,6 @@
 from pydantic import BaseModel, validator
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 class GoalBase(BaseModel):
     title: str
@@ -85,4 +85,8 @@ class GoalSummary(BaseModel):
     completed_goals: int
     total_target_amount: float
     total_current_amount: float
-    overall_progress_percentage: float
\ No newline at end of file
+    overall_progress_percentage: float
+    in_progress_goals: int = 0
+    completion_rate: float = 0.0
+    goals_by_type: Dict[str, Dict[str, float]] = {}
+    expiring_soon: int = 0
\ No newline at end of file
@@ -1,8 +1,14 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from decimal import Decimal
 
+def wall_clock(value: Optional[datetime]) -> Optional[datetime]:
+    """Descarta o fuso mantendo a hora local informada (como o SQLite grava a coluna)"""
+    if value is not None and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
 class TransactionBase(BaseModel):
     description: str
     amount: Decimal
@@ -12,7 +18,8 @@ class TransactionBase(BaseModel):
     category_id: int
 
 class TransactionCreate(TransactionBase):
-    pass
+    # Criação unitária e importação em lote gravam (e agrupam por mês) a mesma data
+    _wall_clock_date = validator('date', allow_reuse=True)(wall_clock)
 
 class TransactionUpdate(BaseModel):
     description: Optional[str] = None
@@ -22,6 +29,8 @@ class TransactionUpdate(BaseModel):
     notes: Optional[str] = None
     category_id: Optional[int] = None
 
+    _wall_clock_date = validator('date', allow_reuse=True)(wall_clock)
+
 class TransactionResponse(TransactionBase):
     id: int
     user_id: int
@@ -30,4 +39,9 @@ class TransactionResponse(TransactionBase):
     category: Optional[str] = None  # Nome da categoria
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TransactionPage(BaseModel):
+    """Página de transações na paginação por cursor"""
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None
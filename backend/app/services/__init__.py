@@ -1,23 +1,56 @@
-from .user_service import (
-    get_user_by_id, get_user_by_username, get_user_by_email,
-    create_user, update_user, authenticate_user
-)
-from .category_service import (
-    get_categories_by_user, get_categories_by_type, get_category_by_id,
-    create_category, update_category, delete_category, create_default_categories
-)
-from .transaction_service import (
-    get_transactions_by_user, get_transaction_by_id, create_transaction,
-    update_transaction, delete_transaction, get_user_balance,
-    get_monthly_summary, get_recent_transactions
-)
+"""
+Reexporta as funções dos services mais usados.
+
+Os módulos são importados no primeiro acesso a cada nome (PEP 562):
+importar um service isolado (ex.: ``app.services.password_service``) não
+carrega os demais, nem os schemas pydantic, na startup.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "get_user_by_id": "user_service",
+    "get_user_by_username": "user_service",
+    "get_user_by_email": "user_service",
+    "create_user": "user_service",
+    "update_user": "user_service",
+    "deactivate_user": "user_service",
+    "authenticate_user": "user_service",
+    "get_categories_by_user": "category_service",
+    "get_categories_by_type": "category_service",
+    "get_category_by_id": "category_service",
+    "create_category": "category_service",
+    "update_category": "category_service",
+    "delete_category": "category_service",
+    "create_default_categories": "category_service",
+    "get_transactions_by_user": "transaction_service",
+    "get_transactions_page": "transaction_service",
+    "get_transaction_by_id": "transaction_service",
+    "create_transaction": "transaction_service",
+    "update_transaction": "transaction_service",
+    "delete_transaction": "transaction_service",
+    "get_user_balance": "transaction_service",
+    "get_user_totals": "transaction_service",
+    "get_monthly_summary": "transaction_service",
+    "get_recent_transactions": "transaction_service",
+    "iter_transactions_for_export": "transaction_service",
+}
 
 __all__ = [
     "get_user_by_id", "get_user_by_username", "get_user_by_email",
-    "create_user", "update_user", "authenticate_user",
+    "create_user", "update_user", "deactivate_user", "authenticate_user",
     "get_categories_by_user", "get_categories_by_type", "get_category_by_id",
     "create_category", "update_category", "delete_category", "create_default_categories",
-    "get_transactions_by_user", "get_transaction_by_id", "create_transaction",
-    "update_transaction", "delete_transaction", "get_user_balance",
-    "get_monthly_summary", "get_recent_transactions"
-]
\ No newline at end of file
+    "get_transactions_by_user", "get_transactions_page", "get_transaction_by_id", "create_transaction",
+    "update_transaction", "delete_transaction", "get_user_balance", "get_user_totals",
+    "get_monthly_summary", "get_recent_transactions", "iter_transactions_for_export"
+]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,89 @@
+"""
+Versões assíncronas dos services de transações, categorias, metas e
+investimentos, para uso com AsyncSession nos endpoints.
+
+Cada função executa o service síncrono correspondente via
+``AsyncSession.run_sync``: as consultas usam o driver assíncrono
+(aiosqlite/asyncpg) e rodam no event loop, sem ocupar o threadpool, e a
+lógica de negócio continua em um único lugar.
+"""
+
+import functools
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import (
+    category_service, dashboard_service, goal_service, investment_service,
+    transaction_service,
+)
+
+
+def run_in_session(func: Callable) -> Callable:
+    """Adapta um service síncrono ``func(db, ...)`` para ``await f(async_db, ...)``"""
+    @functools.wraps(func)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(func, *args, **kwargs)
+    return wrapper
+
+
+# Transações
+get_transactions_by_user = run_in_session(transaction_service.get_transactions_by_user)
+get_transactions_page = run_in_session(transaction_service.get_transactions_page)
+search_transactions = run_in_session(transaction_service.search_transactions)
+get_transaction_by_id = run_in_session(transaction_service.get_transaction_by_id)
+create_transaction = run_in_session(transaction_service.create_transaction)
+update_transaction = run_in_session(transaction_service.update_transaction)
+delete_transaction = run_in_session(transaction_service.delete_transaction)
+get_user_balance = run_in_session(transaction_service.get_user_balance)
+get_user_totals = run_in_session(transaction_service.get_user_totals)
+get_monthly_summary = run_in_session(transaction_service.get_monthly_summary)
+get_recent_transactions = run_in_session(transaction_service.get_recent_transactions)
+
+# Categorias
+get_categories_by_user = run_in_session(category_service.get_categories_by_user)
+get_categories_by_type = run_in_session(category_service.get_categories_by_type)
+get_category_by_id = run_in_session(category_service.get_category_by_id)
+get_category_stats = run_in_session(category_service.get_category_stats)
+create_category = run_in_session(category_service.create_category)
+update_category = run_in_session(category_service.update_category)
+delete_category = run_in_session(category_service.delete_category)
+
+# Metas
+get_goals_by_user = run_in_session(goal_service.get_goals_by_user)
+get_goal_by_id = run_in_session(goal_service.get_goal_by_id)
+create_goal = run_in_session(goal_service.create_goal)
+update_goal = run_in_session(goal_service.update_goal)
+delete_goal = run_in_session(goal_service.delete_goal)
+get_goals_summary = run_in_session(goal_service.get_goals_summary)
+
+# Investimentos
+get_investments_by_user = run_in_session(investment_service.get_investments_by_user)
+get_investment_by_id = run_in_session(investment_service.get_investment_by_id)
+create_investment = run_in_session(investment_service.create_investment)
+update_investment = run_in_session(investment_service.update_investment)
+delete_investment = run_in_session(investment_service.delete_investment)
+get_investments_summary = run_in_session(investment_service.get_investments_summary)
+
+# Dashboard
+get_dashboard_stats = run_in_session(dashboard_service.get_dashboard_stats)
+get_chart_data = run_in_session(dashboard_service.get_chart_data)
+
+
+async def stream_transactions_for_export(
+    db: AsyncSession,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category_id: Optional[int] = None,
+    batch_size: int = 1000
+) -> AsyncIterator[Dict[str, Any]]:
+    """Versão assíncrona de iter_transactions_for_export (cursor no servidor)"""
+    query = transaction_service.export_transactions_query(
+        user_id, start_date, end_date, transaction_type, category_id
+    ).execution_options(yield_per=batch_size)
+
+    result = await db.stream(query)
+    async for row in result:
+        yield row._asdict()
@@ -0,0 +1,208 @@
+"""
+Caches do caminho de autenticação.
+
+- ``token_cache``: LRU limitado de tokens JWT já verificados, indexado
+  pelo SHA-256 de (chave do verificador, algoritmo, token) e válido até o
+  ``exp`` do próprio token. Um token repetido não passa de novo pela
+  verificação de assinatura da mesma chave.
+- ``user_cache``: usuários carregados por username/e-mail, com TTL curto.
+  Uma requisição autenticada com token e usuário em cache não vai ao
+  banco.
+
+``invalidate_user`` deve ser chamado em toda alteração ou desativação de
+usuário; ele remove o usuário e os tokens emitidos para ele.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import inspect
+
+from config import settings
+
+
+class _Counters:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self, entries: int, max_entries: int) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+class VerifiedTokenCache:
+    """Payloads de tokens verificados, até o ``exp`` de cada token"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # sha256(chave, algoritmo, token) -> (payload, exp em segundos Unix)
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._counters = _Counters()
+
+    @staticmethod
+    def _key(token: str, secret_key: str, algorithm: str) -> bytes:
+        # A chave e o algoritmo do verificador entram na chave do cache: um
+        # token aceito com uma chave não vale como verificado com outra
+        digest = hashlib.sha256()
+        for part in (secret_key, algorithm, token):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.digest()
+
+    def get(self, token: str, secret_key: str = "", algorithm: str = "") -> Optional[Dict[str, Any]]:
+        key = self._key(token, secret_key, algorithm)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self._counters.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self._counters.misses += 1
+            return None
+
+    def put(self, token: str, payload: Dict[str, Any], secret_key: str = "", algorithm: str = "") -> None:
+        exp = payload.get("exp")
+        # Sem exp o token não expira: não guardar, para não contornar revogações
+        if exp is None:
+            return
+        key = self._key(token, secret_key, algorithm)
+        with self._lock:
+            self._entries[key] = (payload, float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters.evictions += 1
+
+    def invalidate_subjects(self, subjects: Iterable[str]) -> None:
+        subjects = set(subjects)
+        with self._lock:
+            for key in [k for k, (payload, _) in self._entries.items() if payload.get("sub") in subjects]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._counters.stats(len(self._entries), self.max_entries)
+
+
+class UserCache:
+    """Usuários por chave (ex.: ("username", "ana")), com TTL curto.
+
+    Guarda só os valores das colunas; cada acerto devolve uma instância
+    nova, fora de qualquer Session, que pode ser usada com segurança por
+    requisições concorrentes.
+    """
+
+    def __init__(self, max_entries: int = 5000, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[type, Dict[str, Any], float]]" = OrderedDict()
+        self._counters = _Counters()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[2] < self.ttl:
+                self._entries.move_to_end(key)
+                self._counters.hits += 1
+                model, values, _ = entry
+                return model(**values)
+            if entry is not None:
+                del self._entries[key]
+            self._counters.misses += 1
+            return None
+
+    def put(self, key: Hashable, user: Any) -> None:
+        mapper = inspect(user).mapper
+        values = {attr.key: getattr(user, attr.key) for attr in mapper.column_attrs}
+        with self._lock:
+            self._entries[key] = (mapper.class_, values, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters.evictions += 1
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = self._counters.stats(len(self._entries), self.max_entries)
+            stats["ttl_seconds"] = self.ttl
+            return stats
+
+
+token_cache = VerifiedTokenCache(max_entries=settings.AUTH_TOKEN_CACHE_SIZE)
+user_cache = UserCache(
+    max_entries=settings.AUTH_USER_CACHE_SIZE,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
+
+def decode_token(token: str, secret_key: str, algorithm: str) -> Dict[str, Any]:
+    """jwt.decode com cache; propaga JWTError para tokens inválidos"""
+    if settings.AUTH_CACHE_ENABLED:
+        payload = token_cache.get(token, secret_key, algorithm)
+        if payload is not None:
+            return payload
+    from jose import jwt  # python-jose só no primeiro token
+    payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+    if settings.AUTH_CACHE_ENABLED:
+        token_cache.put(token, payload, secret_key, algorithm)
+    return payload
+
+
+def get_cached_user(field: str, value: str, load: Callable[[], Optional[Any]]) -> Optional[Any]:
+    """Usuário por ``field`` (username ou email); ``load`` consulta o banco em caso de falha"""
+    if not settings.AUTH_CACHE_ENABLED:
+        return load()
+    user = user_cache.get((field, value))
+    if user is None:
+        user = load()
+        if user is not None:
+            user_cache.put((field, value), user)
+    return user
+
+
+def invalidate_user(*users: Any) -> None:
+    """Remove dos caches os usuários (e seus tokens) por username e e-mail"""
+    keys = []
+    subjects = []
+    for user in users:
+        for field in ("username", "email"):
+            value = getattr(user, field, None)
+            if value is not None:
+                keys.append((field, value))
+                subjects.append(value)
+    user_cache.invalidate(keys)
+    token_cache.invalidate_subjects(subjects)
+
+
+def auth_cache_stats() -> Dict[str, Any]:
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
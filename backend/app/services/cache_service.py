@@ -0,0 +1,246 @@
+"""
+Cache de respostas por usuário, versionado, com TTL e despejo LRU.
+
+A chave de cada entrada é (user_id, endpoint, parâmetros normalizados,
+versão dos dados do usuário). Toda escrita chama ``bump_user_version``:
+a versão muda em O(1) e as entradas antigas deixam de ser encontradas,
+saindo do cache pelo LRU. Se o recálculo falhar, o último valor
+calculado ainda pode ser servido durante um curto período de graça.
+
+As entradas ficam na memória de cada processo, mas as versões precisam
+ser vistas por todos os workers. Com ``CACHE_VERSION_DIR`` cada usuário
+tem um arquivo no diretório compartilhado: ``bump_user_version`` acrescenta
+um byte (O_APPEND é atômico entre processos) e a versão é o tamanho do
+arquivo, lido com um ``stat`` a cada consulta. Sem o diretório as versões
+ficam no processo, e o cache só é usado com um único worker
+(``WEB_CONCURRENCY``).
+"""
+
+import functools
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[int, str, Hashable, int]
+
+
+class _Entry:
+    __slots__ = ("value", "size", "stored_at")
+
+    def __init__(self, value: Any, size: int, stored_at: float):
+        self.value = value
+        self.size = size
+        self.stored_at = stored_at
+
+
+def _estimate_size(value: Any) -> int:
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+def normalize_params(args: tuple, kwargs: dict) -> Hashable:
+    """Parâmetros em forma canônica e hasheável (kwargs em ordem alfabética)"""
+    return tuple(repr(arg) for arg in args) + tuple(
+        (name, repr(value)) for name, value in sorted(kwargs.items())
+    )
+
+
+class LocalVersions:
+    """Versões por usuário na memória do processo (um único worker)"""
+
+    shared = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: Dict[int, int] = {}
+
+    def get(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    def bump(self, user_id: int) -> None:
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+
+class SharedVersions:
+    """Versões por usuário num diretório compartilhado pelos workers"""
+
+    shared = True
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, user_id: int) -> str:
+        return os.path.join(self.directory, f"user_{int(user_id)}.version")
+
+    def get(self, user_id: int) -> int:
+        try:
+            return os.stat(self._path(user_id)).st_size
+        except FileNotFoundError:
+            return 0
+
+    def bump(self, user_id: int) -> None:
+        fd = os.open(self._path(user_id), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, b".")
+        finally:
+            os.close(fd)
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 300,
+        stale_grace: float = 30,
+        versions=None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_grace = stale_grace
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        # Última chave calculada para (usuário, endpoint, parâmetros), usada no modo stale
+        self._latest: Dict[Tuple[int, str, Hashable], CacheKey] = {}
+        self.versions = versions if versions is not None else LocalVersions()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def get_user_version(self, user_id: int) -> int:
+        return self.versions.get(user_id)
+
+    def bump_user_version(self, user_id: int) -> None:
+        self.versions.bump(user_id)
+
+    def get_or_compute(self, user_id: int, endpoint: str, params: Hashable, compute: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        key = (user_id, endpoint, params, self.versions.get(user_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+
+        try:
+            value = compute()
+        except Exception:
+            stale = self._get_stale(user_id, endpoint, params, now)
+            if stale is None:
+                raise
+            logger.warning("Serving stale cache entry for %s (user %s) after error", endpoint, user_id, exc_info=True)
+            return stale
+
+        self._store(key, value, now)
+        return value
+
+    def _get_stale(self, user_id: int, endpoint: str, params: Hashable, now: float) -> Optional[Any]:
+        with self._lock:
+            key = self._latest.get((user_id, endpoint, params))
+            entry = self._entries.get(key) if key else None
+            if entry is None or now - entry.stored_at > self.ttl + self.stale_grace:
+                return None
+            self.stale_hits += 1
+            return entry.value
+
+    def _store(self, key: CacheKey, value: Any, now: float) -> None:
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = _Entry(value, size, now)
+            self._latest[key[:3]] = key
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, old_entry = self._entries.popitem(last=False)
+                self._bytes -= old_entry.size
+                if self._latest.get(old_key[:3]) == old_key:
+                    del self._latest[old_key[:3]]
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "evictions": self.evictions,
+                "shared_versions": self.versions.shared,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    ttl=settings.CACHE_TTL_SECONDS,
+    stale_grace=settings.CACHE_STALE_GRACE_SECONDS,
+    versions=SharedVersions(settings.CACHE_VERSION_DIR) if settings.CACHE_VERSION_DIR else LocalVersions()
+)
+
+
+def cache_active() -> bool:
+    """Cache ligado e seguro: um worker só, ou versões compartilhadas entre eles"""
+    if not settings.CACHE_ENABLED:
+        return False
+    return settings.WEB_CONCURRENCY <= 1 or response_cache.versions.shared
+
+
+if settings.CACHE_ENABLED and not cache_active():
+    logger.warning(
+        "Response cache disabled: WEB_CONCURRENCY=%d without CACHE_VERSION_DIR "
+        "(writes in one worker would not invalidate the others)", settings.WEB_CONCURRENCY
+    )
+
+
+def bump_user_version(user_id: int) -> None:
+    """Invalida (em O(1)) todas as respostas em cache do usuário"""
+    response_cache.bump_user_version(user_id)
+
+
+def cached(endpoint: str) -> Callable:
+    """Decorator para services de leitura com assinatura ``func(db, user_id, ...)``"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(db, user_id: int, *args, **kwargs):
+            if not cache_active():
+                return func(db, user_id, *args, **kwargs)
+            return response_cache.get_or_compute(
+                user_id,
+                endpoint,
+                normalize_params(args, kwargs),
+                lambda: func(db, user_id, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
@@ -1,7 +1,14 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import and_, func, select
+from typing import List, Optional, Dict, Any
+from datetime import datetime, time, timedelta
 from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionRollup
+from app.models.types import cents, cents_to_float
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.services.cache_service import bump_user_version, cached
+from app.services.rollup_service import year_month
 
 def get_categories_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Category]:
     return db.query(Category).filter(
@@ -16,6 +23,92 @@ def get_categories_by_type(db: Session, user_id: int, category_type: str) -> Lis
         Category.is_active == True
     ).all()
 
+def _is_month_start(value: Optional[datetime]) -> bool:
+    return value is None or (value.day == 1 and value.time() == time.min)
+
+def _is_month_end(value: Optional[datetime]) -> bool:
+    # Só o último microssegundo do mês: com 23:59:59.000 o rollup contaria
+    # transações que o filtro ``date <= end`` deixa de fora
+    return value is None or (
+        (value + timedelta(days=1)).day == 1 and value.time() == time.max
+    )
+
+def _is_exclusive_end(value: Optional[datetime]) -> bool:
+    """Fim no primeiro dia de um mês à meia-noite: limite exclusivo"""
+    return value is not None and _is_month_start(value)
+
+def _covers_whole_months(start_date: Optional[datetime], end_date: Optional[datetime]) -> bool:
+    return _is_month_start(start_date) and (_is_exclusive_end(end_date) or _is_month_end(end_date))
+
+@cached("category_stats")
+def get_category_stats(
+    db: Session,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Quantidade e total de transações por categoria em uma única consulta.
+
+    ``end_date`` é inclusivo, exceto no primeiro dia de um mês à meia-noite,
+    que vale como limite exclusivo (``date < end_date``). Quando o período
+    cobre meses inteiros (ou não há período), os números saem da tabela de
+    rollups; caso contrário, das transações.
+    """
+    exclusive_end = _is_exclusive_end(end_date)
+    if _covers_whole_months(start_date, end_date):
+        join_on = [TransactionRollup.user_id == user_id, TransactionRollup.category_id == Category.id]
+        if start_date:
+            join_on.append(TransactionRollup.year_month >= year_month(start_date))
+        if exclusive_end:
+            join_on.append(TransactionRollup.year_month < year_month(end_date))
+        elif end_date:
+            join_on.append(TransactionRollup.year_month <= year_month(end_date))
+        source = TransactionRollup
+        count_column = func.sum(TransactionRollup.count)
+        total_column = func.sum(TransactionRollup.total)
+    else:
+        join_on = [Transaction.user_id == user_id, Transaction.category_id == Category.id]
+        if start_date:
+            join_on.append(Transaction.date >= start_date)
+        if exclusive_end:
+            join_on.append(Transaction.date < end_date)
+        elif end_date:
+            join_on.append(Transaction.date <= end_date)
+        source = Transaction
+        count_column = func.count(Transaction.id)
+        total_column = func.sum(Transaction.amount)
+
+    filters = [Category.user_id == user_id, Category.is_active == True]
+    if category_type:
+        filters.append(Category.type == category_type)
+
+    rows = db.execute(
+        select(
+            Category.id, Category.name, Category.type, Category.color, Category.icon,
+            func.coalesce(count_column, 0).label("transaction_count"),
+            cents(func.coalesce(total_column, 0)).label("total_amount")
+        )
+        .select_from(Category)
+        .outerjoin(source, and_(*join_on))
+        .where(*filters)
+        .group_by(Category.id, Category.name, Category.type, Category.color, Category.icon)
+        .order_by(Category.type, Category.name)
+    ).all()
+
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "type": row.type,
+            "color": row.color,
+            "icon": row.icon,
+            "transaction_count": int(row.transaction_count),
+            "total_amount": cents_to_float(row.total_amount)
+        }
+        for row in rows
+    ]
+
 def get_category_by_id(db: Session, category_id: int, user_id: int) -> Optional[Category]:
     return db.query(Category).filter(
         Category.id == category_id,
@@ -26,6 +119,7 @@ def create_category(db: Session, category: CategoryCreate, user_id: int) -> Cate
     db_category = Category(**category.dict(), user_id=user_id)
     db.add(db_category)
     db.commit()
+    bump_user_version(user_id)
     db.refresh(db_category)
     return db_category
 
@@ -39,6 +133,8 @@ def update_category(db: Session, category_id: int, category_update: CategoryUpda
         setattr(db_category, field, value)
     
     db.commit()
+    # Nomes de categoria aparecem nos payloads em cache do dashboard
+    bump_user_version(user_id)
     db.refresh(db_category)
     return db_category
 
@@ -50,6 +146,7 @@ def delete_category(db: Session, category_id: int, user_id: int) -> bool:
     # Soft delete
     db_category.is_active = False
     db.commit()
+    bump_user_version(user_id)
     return True
 
 def create_default_categories(db: Session, user_id: int):
@@ -0,0 +1,68 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import List, Dict, Any
+from datetime import datetime, timedelta
+from app.models.transaction_rollup import TransactionRollup
+from app.models.types import cents, cents_to_float
+from app.services.cache_service import cached
+from app.services.transaction_service import get_user_totals, get_recent_transactions
+from app.services.rollup_service import year_month
+
+@cached("dashboard_stats")
+def get_dashboard_stats(db: Session, user_id: int) -> Dict[str, Any]:
+    """Estatísticas do dashboard: receitas, despesas, saldo e transações recentes"""
+    totals = get_user_totals(db, user_id)
+    recent_transactions = get_recent_transactions(db, user_id, limit=5)
+    
+    stats = {
+        "totalIncome": totals["income"],
+        "totalExpense": totals["expense"],
+        "balance": totals["balance"],
+        "transactionCount": totals["count"],
+        "recentTransactions": [
+            {
+                "id": t["id"],
+                "amount": float(t["amount"]),
+                "type": t["type"],
+                "description": t["description"],
+                "date": t["date"].isoformat() if t["date"] else None,
+                "category_id": t["category_id"],
+                "category": t["category"]
+            }
+            for t in recent_transactions
+        ]
+    }
+    
+    return stats
+
+@cached("chart_data")
+def get_chart_data(db: Session, user_id: int) -> List[Dict[str, Any]]:
+    """Receitas e despesas mensais dos últimos 12 meses (lidas dos rollups)"""
+    first_month = year_month(datetime.now() - timedelta(days=365))
+    
+    monthly_totals = (
+        db.query(
+            TransactionRollup.year_month.label('month'),
+            TransactionRollup.type,
+            cents(func.sum(TransactionRollup.total)).label('total')
+        )
+        .filter(
+            TransactionRollup.user_id == user_id,
+            TransactionRollup.year_month >= first_month
+        )
+        .group_by(TransactionRollup.year_month, TransactionRollup.type)
+        .order_by(TransactionRollup.year_month)
+        .all()
+    )
+    
+    income_dict = {row.month: cents_to_float(row.total) for row in monthly_totals if row.type == "income"}
+    expense_dict = {row.month: cents_to_float(row.total) for row in monthly_totals if row.type == "expense"}
+    
+    return [
+        {
+            "month": month,
+            "income": income_dict.get(month, 0.0),
+            "expense": expense_dict.get(month, 0.0)
+        }
+        for month in sorted(set(income_dict.keys()) | set(expense_dict.keys()))
+    ]
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List
+
+EXPORT_FIELDS = ["id", "date", "description", "amount", "type", "category_id", "category", "notes"]
+# Linhas agrupadas por pedaço enviado ao cliente
+ROWS_PER_CHUNK = 500
+
+def _json_default(value: Any):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class CsvEncoder:
+    media_type = "text/csv; charset=utf-8"
+
+    def header(self) -> str:
+        return ",".join(EXPORT_FIELDS) + "\r\n"
+
+    def encode(self, rows: List[Dict[str, Any]]) -> str:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+        for row in rows:
+            if row.get("date"):
+                row["date"] = row["date"].isoformat()
+            writer.writerow(row)
+        return buffer.getvalue()
+
+class NdjsonEncoder:
+    media_type = "application/x-ndjson"
+
+    def header(self) -> str:
+        return ""
+
+    def encode(self, rows: List[Dict[str, Any]]) -> str:
+        return "".join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + "\n" for row in rows
+        )
+
+ENCODERS = {
+    "csv": CsvEncoder,
+    "ndjson": NdjsonEncoder,
+}
+
+async def encode_stream(rows: AsyncIterable[Dict[str, Any]], encoder) -> AsyncIterator[str]:
+    """Serializa as linhas em pedaços de ROWS_PER_CHUNK linhas.
+
+    O próximo pedaço só é lido do banco depois que o anterior foi enviado,
+    então um cliente lento não faz o servidor acumular a exportação em memória.
+    """
+    header = encoder.header()
+    if header:
+        yield header
+
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= ROWS_PER_CHUNK:
+            yield encoder.encode(batch)
+            batch = []
+    if batch:
+        yield encoder.encode(batch)
@@ -0,0 +1,175 @@
+"""
+Cálculo do progresso das metas em lote.
+
+Em vez de uma ou mais consultas SUM por meta, o progresso de todas as
+metas ativas do usuário sai de duas consultas agrupadas (metas x
+transações e metas x investimentos, unidas por período e categoria).
+O resultado é gravado com um único UPDATE em lote, só para as metas
+cujo valor mudou.
+"""
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, or_, select, update
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime
+from decimal import Decimal
+from app.models.goal import Goal
+from app.models.transaction import Transaction
+from app.models.investment import Investment
+
+TRANSACTION_GOAL_TYPES = ("expense_limit", "savings_target")
+INVESTMENT_GOAL_TYPES = ("investment_goal",)
+
+CENTS = Decimal("0.01")
+
+# (início, fim, categorias) de um conjunto de linhas alteradas; categorias None = qualquer uma
+ChangeWindow = Tuple[datetime, datetime, Optional[Set[int]]]
+
+
+def _money(value) -> Decimal:
+    return Decimal(value or 0).quantize(CENTS)
+
+
+def _active_goals_filter(user_id: int, goal_ids: Optional[Iterable[int]]):
+    criteria = [Goal.user_id == user_id, Goal.is_active == True]
+    if goal_ids is not None:
+        criteria.append(Goal.id.in_(list(goal_ids)))
+    return and_(*criteria)
+
+
+def _progress_rows(db: Session, user_id: int, goal_ids: Optional[Iterable[int]]):
+    """Duas consultas agrupadas: (id, valor gravado, valor calculado) de cada meta"""
+    goals_filter = _active_goals_filter(user_id, goal_ids)
+    is_expense = Transaction.type == "expense"
+    matches_category = or_(Goal.category_id.is_(None), Transaction.category_id == Goal.category_id)
+
+    # Metas de tipo desconhecido também entram aqui (e ficam com progresso zero)
+    transaction_totals = db.execute(
+        select(
+            Goal.id,
+            Goal.goal_type,
+            Goal.current_amount,
+            func.sum(case((and_(is_expense, matches_category), Transaction.amount), else_=0)).label("expense_matching"),
+            func.sum(case((is_expense, Transaction.amount), else_=0)).label("expense_all"),
+            func.sum(case((Transaction.type == "income", Transaction.amount), else_=0)).label("income")
+        )
+        .select_from(Goal)
+        .outerjoin(Transaction, and_(
+            Transaction.user_id == Goal.user_id,
+            Transaction.date >= Goal.start_date,
+            Transaction.date <= Goal.end_date,
+            Goal.goal_type.in_(TRANSACTION_GOAL_TYPES)
+        ))
+        .where(goals_filter, Goal.goal_type.not_in(INVESTMENT_GOAL_TYPES))
+        .group_by(Goal.id, Goal.goal_type, Goal.current_amount)
+    ).all()
+
+    investment_totals = db.execute(
+        select(Goal.id, Goal.current_amount, func.sum(Investment.amount_invested).label("invested"))
+        .select_from(Goal)
+        .outerjoin(Investment, and_(
+            Investment.user_id == Goal.user_id,
+            Investment.purchase_date >= Goal.start_date,
+            Investment.purchase_date <= Goal.end_date
+        ))
+        .where(goals_filter, Goal.goal_type.in_(INVESTMENT_GOAL_TYPES))
+        .group_by(Goal.id, Goal.current_amount)
+    ).all()
+
+    for row in transaction_totals:
+        if row.goal_type == "expense_limit":
+            amount = _money(row.expense_matching)
+        elif row.goal_type == "savings_target":
+            # Meta de economia: receitas menos todas as despesas do período
+            amount = _money(row.income) - _money(row.expense_all)
+        else:
+            amount = Decimal(0).quantize(CENTS)
+        yield row.id, row.current_amount, amount
+    for row in investment_totals:
+        yield row.id, row.current_amount, _money(row.invested)
+
+
+def compute_goal_progress(
+    db: Session,
+    user_id: int,
+    goal_ids: Optional[Iterable[int]] = None
+) -> Dict[int, Decimal]:
+    """Calcula o current_amount das metas ativas (ou só de goal_ids) sem gravar"""
+    if goal_ids is not None:
+        goal_ids = list(goal_ids)
+        if not goal_ids:
+            return {}
+    return {goal_id: amount for goal_id, _, amount in _progress_rows(db, user_id, goal_ids)}
+
+
+def apply_goal_progress(
+    db: Session,
+    user_id: int,
+    goal_ids: Optional[Iterable[int]] = None,
+    commit: bool = True
+) -> int:
+    """Recalcula o progresso e grava só as metas alteradas; retorna quantas mudaram"""
+    if goal_ids is not None:
+        goal_ids = list(goal_ids)
+        if not goal_ids:
+            return 0
+
+    changes = [
+        {"id": goal_id, "current_amount": amount}
+        for goal_id, current_amount, amount in _progress_rows(db, user_id, goal_ids)
+        if current_amount is None or _money(current_amount) != amount
+    ]
+    if not changes:
+        return 0
+
+    db.execute(update(Goal), changes)
+    # O UPDATE em lote não sincroniza objetos já carregados na sessão
+    changed_ids = {change["id"] for change in changes}
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, Goal) and obj.id in changed_ids:
+            db.expire(obj, ["current_amount", "updated_at"])
+    if commit:
+        db.commit()
+    return len(changes)
+
+
+def affected_goal_ids(
+    db: Session,
+    user_id: int,
+    goal_types: Iterable[str],
+    windows: Iterable[ChangeWindow]
+) -> List[int]:
+    """Metas ativas dos tipos informados cujo período (e categoria) cruza alguma janela"""
+    conditions = []
+    for start, end, category_ids in windows:
+        condition = and_(Goal.start_date <= end, Goal.end_date >= start)
+        if category_ids is not None:
+            # Só metas de limite de gastos são filtradas por categoria
+            condition = and_(condition, or_(
+                Goal.goal_type != "expense_limit",
+                Goal.category_id.is_(None),
+                Goal.category_id.in_(list(category_ids))
+            ))
+        conditions.append(condition)
+    if not conditions:
+        return []
+
+    return list(db.scalars(
+        select(Goal.id).where(
+            _active_goals_filter(user_id, None),
+            Goal.goal_type.in_(list(goal_types)),
+            or_(*conditions)
+        )
+    ))
+
+
+def refresh_goals_for_transactions(db: Session, user_id: int, windows: Iterable[ChangeWindow]) -> int:
+    """Recalcula (sem commit) as metas afetadas por transações alteradas"""
+    goal_ids = affected_goal_ids(db, user_id, TRANSACTION_GOAL_TYPES, windows)
+    return apply_goal_progress(db, user_id, goal_ids, commit=False)
+
+
+def refresh_goals_for_investments(db: Session, user_id: int, windows: Iterable[ChangeWindow]) -> int:
+    """Recalcula (sem commit) as metas afetadas por investimentos alterados"""
+    goal_ids = affected_goal_ids(db, user_id, INVESTMENT_GOAL_TYPES, windows)
+    return apply_goal_progress(db, user_id, goal_ids, commit=False)
@@ -1,16 +1,26 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, func, extract
+from sqlalchemy import and_, desc
 from typing import List, Optional
 from datetime import datetime, timedelta
 from app.models.goal import Goal
-from app.models.transaction import Transaction
 from app.schemas.goal import GoalCreate, GoalUpdate
+from app.services.cache_service import bump_user_version, cached
+from app.services.goal_progress_service import apply_goal_progress
 
-def get_goals_by_user(db: Session, user_id: int, is_active: bool = None) -> List[Goal]:
+def get_goals_by_user(
+    db: Session,
+    user_id: int,
+    is_active: bool = None,
+    skip: int = 0,
+    limit: Optional[int] = None
+) -> List[Goal]:
     query = db.query(Goal).filter(Goal.user_id == user_id)
     if is_active is not None:
         query = query.filter(Goal.is_active == is_active)
-    return query.order_by(desc(Goal.created_at)).all()
+    query = query.order_by(desc(Goal.created_at)).offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
 
 def get_goal_by_id(db: Session, goal_id: int, user_id: int) -> Optional[Goal]:
     return db.query(Goal).filter(
@@ -20,7 +30,11 @@ def get_goal_by_id(db: Session, goal_id: int, user_id: int) -> Optional[Goal]:
 def create_goal(db: Session, goal: GoalCreate, user_id: int) -> Goal:
     db_goal = Goal(**goal.dict(), user_id=user_id)
     db.add(db_goal)
+    db.flush()
+    # O progresso é mantido na escrita: calcular já o valor inicial
+    apply_goal_progress(db, user_id, [db_goal.id], commit=False)
     db.commit()
+    bump_user_version(user_id)
     db.refresh(db_goal)
     return db_goal
 
@@ -32,8 +46,11 @@ def update_goal(db: Session, goal_id: int, goal_update: GoalUpdate, user_id: int
     update_data = goal_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_goal, field, value)
+    db.flush()
+    apply_goal_progress(db, user_id, [db_goal.id], commit=False)
     
     db.commit()
+    bump_user_version(user_id)
     db.refresh(db_goal)
     return db_goal
 
@@ -44,75 +61,20 @@ def delete_goal(db: Session, goal_id: int, user_id: int) -> bool:
     
     db.delete(db_goal)
     db.commit()
+    bump_user_version(user_id)
     return True
 
-def update_goal_progress(db: Session, user_id: int):
-    """Atualiza o progresso de todas as metas baseado nas transações"""
-    
-    goals = get_goals_by_user(db, user_id, is_active=True)
-    
-    for goal in goals:
-        current_amount = 0
-        
-        if goal.goal_type == "expense_limit":
-            # Para meta de limite de gastos, somar despesas no período
-            query = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "expense",
-                    Transaction.date >= goal.start_date,
-                    Transaction.date <= goal.end_date
-                )
-            )
-            
-            # Se tem categoria específica, filtrar por ela
-            if goal.category_id:
-                query = query.filter(Transaction.category_id == goal.category_id)
-            
-            current_amount = query.scalar() or 0
-            
-        elif goal.goal_type == "savings_target":
-            # Para meta de economia, somar receitas menos despesas no período
-            income = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "income",
-                    Transaction.date >= goal.start_date,
-                    Transaction.date <= goal.end_date
-                )
-            ).scalar() or 0
-            
-            expenses = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.type == "expense",
-                    Transaction.date >= goal.start_date,
-                    Transaction.date <= goal.end_date
-                )
-            ).scalar() or 0
-            
-            current_amount = income - expenses
-            
-        elif goal.goal_type == "investment_goal":
-            # Para meta de investimento, somar investimentos no período
-            from app.models.investment import Investment
-            current_amount = db.query(func.sum(Investment.amount_invested)).filter(
-                and_(
-                    Investment.user_id == user_id,
-                    Investment.purchase_date >= goal.start_date,
-                    Investment.purchase_date <= goal.end_date
-                )
-            ).scalar() or 0
-        
-        # Atualizar o progresso da meta
-        goal.current_amount = current_amount
-        db.commit()
+def update_goal_progress(db: Session, user_id: int) -> int:
+    """Recalcula o progresso de todas as metas ativas (consultas agrupadas + UPDATE em lote).
+
+    O progresso já é mantido nas escritas de transações, investimentos e
+    metas; isto serve para reconciliação (migrações e scripts).
+    """
+    return apply_goal_progress(db, user_id)
 
+@cached("goals_summary")
 def get_goals_summary(db: Session, user_id: int) -> dict:
-    """Obtém resumo das metas do usuário"""
-    
-    # Atualizar progresso antes de calcular resumo
-    update_goal_progress(db, user_id)
+    """Obtém resumo das metas do usuário (somente leitura)"""
     
     goals = get_goals_by_user(db, user_id, is_active=True)
     
@@ -142,11 +104,20 @@ def get_goals_summary(db: Session, user_id: int) -> dict:
     next_week = datetime.now() + timedelta(days=7)
     expiring_soon = [g for g in goals if g.end_date <= next_week and g.current_amount < g.target_amount]
     
+    total_target_amount = sum(float(g.target_amount) for g in goals)
+    total_current_amount = sum(float(g.current_amount or 0) for g in goals)
+    
     return {
         "total_goals": total_goals,
+        "active_goals": total_goals,
         "completed_goals": completed_goals,
         "in_progress_goals": in_progress_goals,
         "completion_rate": (completed_goals / total_goals * 100) if total_goals > 0 else 0,
         "goals_by_type": goals_by_type,
-        "expiring_soon": len(expiring_soon)
+        "expiring_soon": len(expiring_soon),
+        "total_target_amount": total_target_amount,
+        "total_current_amount": total_current_amount,
+        "overall_progress_percentage": (
+            min(total_current_amount / total_target_amount * 100, 100.0) if total_target_amount > 0 else 0.0
+        )
     }
\ No newline at end of file
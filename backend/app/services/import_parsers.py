@@ -0,0 +1,195 @@
+"""
+Parsers incrementais para importação de transações.
+
+Cada parser recebe o corpo da requisição em pedaços (``feed``) e devolve
+as linhas completas encontradas até o momento como tuplas
+``(numero_da_linha, dados, erro)``; ``close`` devolve o que sobrou no
+buffer. Assim o corpo nunca precisa ser carregado inteiro em memória.
+"""
+
+import codecs
+import csv
+import json
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+CSV_FIELDS = ("description", "amount", "type", "date", "notes", "category_id")
+
+
+class _TextParser:
+    """Base: decodifica UTF-8 incrementalmente e entrega linhas completas"""
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._pending = ""
+
+    def feed(self, chunk: bytes) -> List[ParsedRow]:
+        self._pending += self._decoder.decode(chunk)
+        *lines, self._pending = self._pending.split("\n")
+        return self._parse_lines(lines)
+
+    def close(self) -> List[ParsedRow]:
+        self._pending += self._decoder.decode(b"", final=True)
+        lines, self._pending = [self._pending], ""
+        return self._parse_lines(lines) + self._finish()
+
+    def _parse_lines(self, lines: List[str]) -> List[ParsedRow]:
+        raise NotImplementedError
+
+    def _finish(self) -> List[ParsedRow]:
+        return []
+
+
+class CsvRowParser(_TextParser):
+    """CSV com cabeçalho (description, amount, type, date, notes, category_id)"""
+
+    def __init__(self):
+        super().__init__()
+        self._header: Optional[List[str]] = None
+        self._record = ""
+        self._row_number = 0
+
+    def _parse_lines(self, lines: List[str]) -> List[ParsedRow]:
+        rows = []
+        for line in lines:
+            self._record = f"{self._record}\n{line}" if self._record else line
+            # Campos entre aspas podem conter quebras de linha
+            if self._record.count('"') % 2:
+                continue
+
+            record, self._record = self._record.rstrip("\r\n"), ""
+            if not record.strip():
+                continue
+
+            values = next(csv.reader([record]))
+            if self._header is None:
+                self._header = [value.strip().lower() for value in values]
+                missing = {"description", "amount", "type", "date"} - set(self._header)
+                if missing:
+                    raise ValueError(f"CSV header is missing columns: {', '.join(sorted(missing))}")
+                continue
+
+            self._row_number += 1
+            if len(values) != len(self._header):
+                rows.append((self._row_number, None, "Wrong number of columns"))
+                continue
+            data = {
+                field: value for field, value in zip(self._header, values)
+                if field in CSV_FIELDS and value != ""
+            }
+            rows.append((self._row_number, data, None))
+        return rows
+
+    def _finish(self) -> List[ParsedRow]:
+        if self._record:
+            self._row_number += 1
+            self._record = ""
+            return [(self._row_number, None, "Unterminated quoted field")]
+        return []
+
+
+class NdjsonRowParser(_TextParser):
+    """Um objeto JSON por linha"""
+
+    def __init__(self):
+        super().__init__()
+        self._row_number = 0
+
+    def _parse_lines(self, lines: List[str]) -> List[ParsedRow]:
+        rows = []
+        for line in lines:
+            if not line.strip():
+                continue
+            self._row_number += 1
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                rows.append((self._row_number, None, f"Invalid JSON: {e}"))
+                continue
+            if not isinstance(data, dict):
+                rows.append((self._row_number, None, "Each line must be a JSON object"))
+                continue
+            rows.append((self._row_number, data, None))
+        return rows
+
+
+class OfxRowParser(_TextParser):
+    """Extratos OFX (SGML ou XML): um <STMTTRN> por transação"""
+
+    _TAG = re.compile(r"<([A-Z0-9.]+)>([^<\r\n]*)")
+
+    def __init__(self):
+        super().__init__()
+        self._block: Optional[List[str]] = None
+        self._row_number = 0
+
+    def _parse_lines(self, lines: List[str]) -> List[ParsedRow]:
+        rows = []
+        # Algumas exportações OFX colocam vários elementos na mesma linha
+        text = "\n".join(lines).replace("<", "\n<")
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            upper = line.upper()
+            if upper.startswith("<STMTTRN>"):
+                self._block = []
+            elif upper.startswith("</STMTTRN>"):
+                if self._block is not None:
+                    self._row_number += 1
+                    rows.append(self._parse_block(self._block))
+                self._block = None
+            elif self._block is not None:
+                self._block.append(line)
+        return rows
+
+    def _parse_block(self, block: List[str]) -> ParsedRow:
+        fields = {}
+        for line in block:
+            match = self._TAG.match(line.upper())
+            if match:
+                fields[match.group(1)] = line[match.end(1) + 1:].strip()
+
+        try:
+            amount = Decimal(fields["TRNAMT"].replace(",", "."))
+            posted = fields["DTPOSTED"]
+            date = datetime.strptime(posted[:14].ljust(14, "0"), "%Y%m%d%H%M%S")
+        except KeyError as e:
+            return (self._row_number, None, f"Missing OFX field {e.args[0]}")
+        except (InvalidOperation, ValueError):
+            return (self._row_number, None, "Invalid TRNAMT or DTPOSTED")
+
+        name, memo = fields.get("NAME"), fields.get("MEMO")
+        data = {
+            "description": name or memo or fields.get("TRNTYPE", "OFX"),
+            "amount": abs(amount),
+            "type": "income" if amount > 0 else "expense",
+            "date": date,
+        }
+        if name and memo:
+            data["notes"] = memo
+        return (self._row_number, data, None)
+
+
+PARSERS = {
+    "csv": CsvRowParser,
+    "ndjson": NdjsonRowParser,
+    "ofx": OfxRowParser,
+}
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-ofx": "ofx",
+    "application/ofx": "ofx",
+}
+
+
+def get_parser(import_format: str):
+    return PARSERS[import_format]()
@@ -0,0 +1,129 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from typing import List, Optional, Dict, Any, Set, Tuple
+from datetime import datetime
+from decimal import Decimal
+from pydantic import ValidationError
+from app.models.transaction import Transaction
+from app.models.category import Category
+from app.schemas.transaction import TransactionCreate
+from app.services.import_parsers import ParsedRow
+from app.services.rollup_service import apply_rollup_delta, year_month
+from app.services.cache_service import bump_user_version
+from app.services.goal_progress_service import refresh_goals_for_transactions
+
+# Linhas por executemany; o commit acontece uma única vez no final
+BATCH_SIZE = 2000
+# Limite de erros detalhados na resposta (os demais são apenas contados)
+MAX_REPORTED_ERRORS = 1000
+
+class TransactionImporter:
+    """Importação em lote de transações dentro de uma única transação do banco.
+
+    As linhas chegam em pedaços (``add_rows``), são validadas e inseridas
+    com executemany a cada BATCH_SIZE linhas; ``finish`` atualiza os
+    rollups e o progresso das metas afetadas e faz o commit.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        user_id: int,
+        default_category_id: Optional[int] = None,
+        batch_size: int = BATCH_SIZE
+    ):
+        self.db = db
+        self.user_id = user_id
+        self.default_category_id = default_category_id
+        self.batch_size = batch_size
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._batch: List[Dict[str, Any]] = []
+        self._rollups: Dict[Tuple[str, str, int], List[Any]] = {}
+        # Janela de datas e categorias importadas, para achar as metas afetadas
+        self._first_date: Optional[datetime] = None
+        self._last_date: Optional[datetime] = None
+        self._imported_categories: Set[int] = set()
+        self._category_ids = {
+            category_id for (category_id,) in db.query(Category.id).filter(
+                Category.user_id == user_id
+            )
+        }
+
+    def _error(self, row_number: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "error": message})
+
+    def add_rows(self, rows: List[ParsedRow]) -> None:
+        for row_number, data, error in rows:
+            if error:
+                self._error(row_number, error)
+                continue
+
+            if self.default_category_id and not data.get("category_id"):
+                data["category_id"] = self.default_category_id
+            try:
+                transaction = TransactionCreate(**data)
+            except ValidationError as e:
+                self._error(row_number, "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                ))
+                continue
+
+            if transaction.type not in ("income", "expense"):
+                self._error(row_number, "type must be 'income' or 'expense'")
+                continue
+            if transaction.category_id not in self._category_ids:
+                self._error(row_number, f"Category {transaction.category_id} not found")
+                continue
+
+            self._batch.append({**transaction.dict(), "user_id": self.user_id})
+            key = (year_month(transaction.date), transaction.type, transaction.category_id)
+            totals = self._rollups.setdefault(key, [Decimal(0), 0])
+            totals[0] += transaction.amount
+            totals[1] += 1
+            if self._first_date is None or transaction.date < self._first_date:
+                self._first_date = transaction.date
+            if self._last_date is None or transaction.date > self._last_date:
+                self._last_date = transaction.date
+            self._imported_categories.add(transaction.category_id)
+
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._batch:
+            return
+        self.db.execute(insert(Transaction), self._batch)
+        self.inserted += len(self._batch)
+        self._batch = []
+
+    def finish(self) -> Dict[str, Any]:
+        """Insere o restante, atualiza rollups e metas e faz o commit"""
+        try:
+            self._flush()
+            for (month, transaction_type, category_id), (amount, count) in self._rollups.items():
+                apply_rollup_delta(
+                    self.db, self.user_id, month, transaction_type, category_id, amount, count
+                )
+            if self._first_date is not None:
+                refresh_goals_for_transactions(self.db, self.user_id, [
+                    (self._first_date, self._last_date, self._imported_categories)
+                ])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        if self.inserted:
+            bump_user_version(self.user_id)
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors
+        }
+
+    def abort(self) -> None:
+        self.db.rollback()
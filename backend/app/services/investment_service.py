@@ -4,6 +4,8 @@ from typing import List, Optional
 from datetime import datetime
 from app.models.investment import Investment
 from app.schemas.investment import InvestmentCreate, InvestmentUpdate
+from app.services.cache_service import bump_user_version, cached
+from app.services.goal_progress_service import refresh_goals_for_investments
 
 def get_investments_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Investment]:
     return db.query(Investment).filter(
@@ -15,10 +17,17 @@ def get_investment_by_id(db: Session, investment_id: int, user_id: int) -> Optio
         and_(Investment.id == investment_id, Investment.user_id == user_id)
     ).first()
 
+def _goal_window(investment: Investment):
+    """Janela (data, data, qualquer categoria) usada para achar as metas afetadas"""
+    return (investment.purchase_date, investment.purchase_date, None)
+
 def create_investment(db: Session, investment: InvestmentCreate, user_id: int) -> Investment:
     db_investment = Investment(**investment.dict(), user_id=user_id)
     db.add(db_investment)
+    db.flush()
+    refresh_goals_for_investments(db, user_id, [_goal_window(db_investment)])
     db.commit()
+    bump_user_version(user_id)
     db.refresh(db_investment)
     return db_investment
 
@@ -32,11 +41,15 @@ def update_investment(
     if not db_investment:
         return None
     
+    old_window = _goal_window(db_investment)
     update_data = investment_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_investment, field, value)
+    db.flush()
+    refresh_goals_for_investments(db, user_id, [old_window, _goal_window(db_investment)])
     
     db.commit()
+    bump_user_version(user_id)
     db.refresh(db_investment)
     return db_investment
 
@@ -45,10 +58,15 @@ def delete_investment(db: Session, investment_id: int, user_id: int) -> bool:
     if not db_investment:
         return False
     
+    window = _goal_window(db_investment)
     db.delete(db_investment)
+    db.flush()
+    refresh_goals_for_investments(db, user_id, [window])
     db.commit()
+    bump_user_version(user_id)
     return True
 
+@cached("investments_summary")
 def get_investments_summary(db: Session, user_id: int) -> dict:
     """Obtém resumo dos investimentos do usuário"""
     
@@ -0,0 +1,411 @@
+"""
+Métricas da aplicação no formato texto do Prometheus.
+
+- ``MetricsMiddleware`` (ASGI puro) mede, por método e template de rota
+  (``/api/v1/transactions/{transaction_id}``, nunca o path concreto;
+  requisições sem rota ficam em ``<unmatched>``),
+  contagem de requisições por status, histograma de latência, requisições
+  em andamento e número de comandos e tempo de SQL por requisição.
+- ``instrument_engine`` registra os hooks de ``query_tracker`` (comandos
+  e tempo de SQL por requisição, aviso de N+1) e mede a espera no
+  checkout do pool (inclui abrir uma conexão nova quando o pool cresce).
+- Na renderização entram também os acertos/falhas dos caches de
+  respostas e de autenticação e as conexões em uso de cada pool.
+
+Com vários workers do uvicorn cada processo tem os próprios contadores.
+Em modo multiprocesso (``METRICS_MULTIPROC_DIR``) cada worker grava um
+snapshot em ``<dir>/metrics_<pid>.json`` a cada ``METRICS_FLUSH_SECONDS``
+e o ``/metrics`` de qualquer worker soma os arquivos de todos: contadores
+e histogramas de workers encerrados continuam somando, gauges só de
+processos vivos. O diretório deve ser esvaziado a cada deploy.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services import query_tracker
+from config import settings
+
+Labels = Tuple[Tuple[str, str], ...]
+MetricKey = Tuple[str, Labels]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# nome -> (tipo, descrição, faixas do histograma)
+METRICS: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    "ruviopay_http_requests_total": (
+        "counter", "Requisições HTTP concluídas por rota e status", ()),
+    "ruviopay_http_request_duration_seconds": (
+        "histogram", "Latência das requisições HTTP por rota", LATENCY_BUCKETS),
+    "ruviopay_http_requests_in_progress": (
+        "gauge", "Requisições HTTP em andamento por rota", ()),
+    "ruviopay_db_queries_per_request": (
+        "histogram", "Comandos SQL executados por requisição", QUERY_BUCKETS),
+    "ruviopay_db_seconds_per_request": (
+        "histogram", "Tempo gasto em comandos SQL por requisição", LATENCY_BUCKETS),
+    "ruviopay_db_pool_checkout_seconds": (
+        "histogram", "Espera para obter uma conexão do pool", CHECKOUT_BUCKETS),
+    "ruviopay_db_pool_checked_out": (
+        "gauge", "Conexões do pool em uso", ()),
+    "ruviopay_cache_hits_total": (
+        "counter", "Acertos dos caches em memória", ()),
+    "ruviopay_cache_misses_total": (
+        "counter", "Falhas dos caches em memória", ()),
+    "ruviopay_cache_hit_ratio": (
+        "gauge", "Fração de acertos dos caches em memória", ()),
+}
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+class MetricsRegistry:
+    """Contadores, gauges e histogramas de um processo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[MetricKey, float] = {}
+        self.gauges: Dict[MetricKey, float] = {}
+        # [contagem por faixa..., +Inf, soma]
+        self.histograms: Dict[MetricKey, List[float]] = {}
+
+    def inc(self, name: str, labels: Labels, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + amount
+
+    def add_gauge(self, name: str, labels: Labels, amount: float) -> None:
+        with self._lock:
+            self.gauges[(name, labels)] = self.gauges.get((name, labels), 0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        buckets = METRICS[name][2]
+        with self._lock:
+            counts = self.histograms.get((name, labels))
+            if counts is None:
+                counts = self.histograms[(name, labels)] = [0] * (len(buckets) + 2)
+            # Faixa com limite >= value; depois da última fica em +Inf
+            counts[bisect_left(buckets, value)] += 1
+            counts[-1] += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "counters": [[name, labels, value] for (name, labels), value in self.counters.items()],
+                "gauges": [[name, labels, value] for (name, labels), value in self.gauges.items()],
+                "histograms": [[name, labels, list(counts)] for (name, labels), counts in self.histograms.items()],
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+
+registry = MetricsRegistry()
+
+
+# --- banco -------------------------------------------------------------------
+
+_instrumented_pools: Dict[str, Any] = {}
+
+
+def instrument_engine(engine, name: str) -> None:
+    """Conta os comandos SQL por requisição e mede a espera no checkout do pool.
+
+    O checkout é medido envolvendo ``_do_get`` da instância do pool; um
+    pool recriado por ``engine.dispose()`` só volta a ser medido na
+    próxima chamada (``create_app`` chama a cada app montado).
+    """
+    query_tracker.install(engine)
+
+    pool = engine.pool
+    if _instrumented_pools.get(name) is pool or not hasattr(pool, "_do_get"):
+        return
+    do_get = pool._do_get
+    labels = _labels(pool=name)
+
+    def timed_do_get():
+        started = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            registry.observe("ruviopay_db_pool_checkout_seconds", labels, time.perf_counter() - started)
+
+    pool._do_get = timed_do_get
+    _instrumented_pools[name] = pool
+
+
+def _collect_runtime() -> None:
+    """Valores lidos na hora: requisições em andamento, caches e conexões em uso"""
+    from app.services.auth_cache import token_cache, user_cache
+    from app.services.cache_service import response_cache
+
+    caches = {"response": response_cache.stats(), "auth_token": token_cache.stats(),
+              "auth_user": user_cache.stats()}
+    in_progress: Dict[Labels, int] = {}
+    for scope, templates in list(_active.values()):
+        labels = _labels(method=scope["method"], route=templates.resolve(scope))
+        in_progress[labels] = in_progress.get(labels, 0) + 1
+
+    with registry._lock:
+        for key in registry.gauges:
+            if key[0] == "ruviopay_http_requests_in_progress":
+                registry.gauges[key] = 0
+        for labels, count in in_progress.items():
+            registry.gauges[("ruviopay_http_requests_in_progress", labels)] = count
+        for cache, stats in caches.items():
+            labels = _labels(cache=cache)
+            registry.counters[("ruviopay_cache_hits_total", labels)] = stats["hits"]
+            registry.counters[("ruviopay_cache_misses_total", labels)] = stats["misses"]
+        for name, pool in _instrumented_pools.items():
+            checkedout = getattr(pool, "checkedout", None)
+            if callable(checkedout):
+                registry.gauges[("ruviopay_db_pool_checked_out", _labels(pool=name))] = checkedout()
+
+
+# --- middleware --------------------------------------------------------------
+
+class RouteTemplates:
+    """Template completo (prefixos incluídos) da rota que atendeu cada requisição.
+
+    O Router grava a rota escolhida em ``scope["route"]``. Em versões do
+    FastAPI que não achatam ``include_router`` essa rota só conhece o path
+    relativo ao próprio router; o prefixo vem do mapa montado percorrendo
+    os routers incluídos, refeito quando aparece uma rota desconhecida
+    (routers lazy carregados).
+    """
+
+    def __init__(self, router):
+        self.router = router
+        self._paths: Dict[int, str] = {}
+
+    def _collect(self, routes, prefix: str) -> None:
+        for route in routes:
+            context = getattr(route, "include_context", None)
+            if context is not None and hasattr(route, "original_router"):
+                self._collect(route.original_router.routes, prefix + context.prefix)
+            elif getattr(route, "path", None) is not None:
+                self._paths[id(route)] = prefix + route.path
+
+    def resolve(self, scope: Scope) -> str:
+        route = scope.get("route")
+        if route is None:
+            # Ainda não roteada (ou 404)
+            return "<unmatched>"
+        path = self._paths.get(id(route))
+        if path is None:
+            self._paths = {}
+            self._collect(self.router.routes, "")
+            path = self._paths.get(id(route))
+        return path or getattr(route, "path", "<unmatched>")
+
+
+# Requisições em andamento: id(scope) -> (scope, templates)
+_active: Dict[int, Tuple[Scope, RouteTemplates]] = {}
+
+
+class MetricsMiddleware:
+    """Latência, contagem, requisições em andamento e SQL por rota"""
+
+    def __init__(self, app: ASGIApp, router):
+        self.app = app
+        self.templates = RouteTemplates(router)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        queries = query_tracker.QueryStats()
+        token = query_tracker.activate(queries)
+        _active[id(scope)] = (scope, self.templates)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            query_tracker.deactivate(token)
+            _active.pop(id(scope), None)
+            method = scope["method"]
+            template = self.templates.resolve(scope)
+            route_labels = _labels(method=method, route=template)
+            registry.inc("ruviopay_http_requests_total",
+                         _labels(method=method, route=template, status=str(status)))
+            registry.observe("ruviopay_http_request_duration_seconds", route_labels, elapsed)
+            registry.observe("ruviopay_db_queries_per_request", route_labels, queries.count)
+            registry.observe("ruviopay_db_seconds_per_request", route_labels, queries.seconds)
+            queries.label = f"{method} {template}"
+            query_tracker.warn_repeated(queries)
+            if settings.METRICS_MULTIPROC_DIR:
+                multiprocess.maybe_flush()
+
+
+# --- multiprocesso -----------------------------------------------------------
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiprocessStore:
+    """Snapshots por worker em um diretório compartilhado"""
+
+    def __init__(self, flush_seconds: float):
+        self.flush_seconds = flush_seconds
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
+    @property
+    def directory(self) -> str:
+        return settings.METRICS_MULTIPROC_DIR
+
+    def flush(self) -> None:
+        if not self.directory:
+            return
+        _collect_runtime()
+        path = os.path.join(self.directory, f"metrics_{os.getpid()}.json")
+        temp = f"{path}.tmp"
+        with open(temp, "w") as f:
+            json.dump(registry.snapshot(), f)
+        os.replace(temp, path)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self) -> None:
+        if self._flusher is None:
+            self._start_flusher()
+        if time.monotonic() - self._last_flush < self.flush_seconds:
+            return
+        if self._lock.acquire(blocking=False):
+            try:
+                self.flush()
+            finally:
+                self._lock.release()
+
+    def _start_flusher(self) -> None:
+        """Worker ocioso também grava: thread periódica e um último snapshot na saída"""
+        with self._lock:
+            if self._flusher is not None:
+                return
+
+            def loop():
+                while True:
+                    time.sleep(self.flush_seconds)
+                    with self._lock:
+                        self.flush()
+
+            self._flusher = threading.Thread(target=loop, name="metrics-flush", daemon=True)
+            self._flusher.start()
+        atexit.register(self.flush)
+
+    def merged(self) -> Dict[str, Any]:
+        """Soma dos snapshots de todos os workers (gauges só de processos vivos)"""
+        with self._lock:
+            self.flush()
+        counters: Dict[MetricKey, float] = {}
+        gauges: Dict[MetricKey, float] = {}
+        histograms: Dict[MetricKey, List[float]] = {}
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith("metrics_") and filename.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            pid = int(filename[len("metrics_"):-len(".json")])
+            for name, labels, value in data["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            if _pid_alive(pid):
+                for name, labels, value in data["gauges"]:
+                    key = (name, tuple(map(tuple, labels)))
+                    gauges[key] = gauges.get(key, 0) + value
+            for name, labels, counts in data["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                total = histograms.setdefault(key, [0] * len(counts))
+                for i, count in enumerate(counts):
+                    total[i] += count
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+
+multiprocess = MultiprocessStore(settings.METRICS_FLUSH_SECONDS)
+
+
+# --- formato texto -----------------------------------------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_metrics() -> str:
+    """Todas as métricas no formato de exposição texto 0.0.4 do Prometheus"""
+    if settings.METRICS_MULTIPROC_DIR:
+        data = multiprocess.merged()
+    else:
+        _collect_runtime()
+        with registry._lock:
+            data = {"counters": dict(registry.counters), "gauges": dict(registry.gauges),
+                    "histograms": {k: list(v) for k, v in registry.histograms.items()}}
+
+    # Razão de acertos calculada sobre os totais já somados
+    for (name, labels), hits in list(data["counters"].items()):
+        if name == "ruviopay_cache_hits_total":
+            lookups = hits + data["counters"].get(("ruviopay_cache_misses_total", labels), 0)
+            data["gauges"][("ruviopay_cache_hit_ratio", labels)] = hits / lookups if lookups else 0.0
+
+    samples: Dict[str, List[str]] = {name: [] for name in METRICS}
+    for kind in ("counters", "gauges"):
+        for (name, labels), value in sorted(data[kind].items()):
+            samples[name].append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    for (name, labels), counts in sorted(data["histograms"].items()):
+        cumulative = 0
+        for bound, count in zip(METRICS[name][2] + (float("inf"),), counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else _format_value(bound)
+            samples[name].append(f"{name}_bucket{_format_labels(labels, (('le', le),))} {int(cumulative)}")
+        samples[name].append(f"{name}_sum{_format_labels(labels)} {_format_value(counts[-1])}")
+        samples[name].append(f"{name}_count{_format_labels(labels)} {int(cumulative)}")
+
+    lines = []
+    for name, (kind, description, _) in METRICS.items():
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples[name])
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,89 @@
+"""
+Hash e verificação de senhas (bcrypt) fora do event loop e do threadpool
+das requisições.
+
+O trabalho de bcrypt vai para um ThreadPoolExecutor próprio (o bcrypt
+libera o GIL). O número de tarefas em andamento mais as na fila é
+limitado: acima do limite, ``PasswordPoolSaturated`` é levantada e a API
+responde 503, em vez de deixar uma rajada de logins travar as leituras.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import settings
+
+
+class PasswordPoolSaturated(Exception):
+    """Fila de hashing cheia; o cliente deve tentar de novo mais tarde"""
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = 2, queue_size: int = 32, rounds: int = 12):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.rounds = rounds
+        self._context = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def context(self):
+        """CryptContext do passlib, criado no primeiro uso (passlib/bcrypt fora do import)"""
+        if self._context is None:
+            with self._lock:
+                if self._context is None:
+                    from passlib.context import CryptContext
+                    self._context = CryptContext(
+                        schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=self.rounds
+                    )
+        return self._context
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def _submit(self, func: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolSaturated()
+        with self._lock:
+            self._in_flight += 1
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(self.context.hash, password))
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """(senha confere, novo hash se o custo configurado mudou)"""
+        return await asyncio.wrap_future(
+            self._submit(self.context.verify_and_update, password, hashed_password)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    rounds=settings.BCRYPT_ROUNDS
+)
@@ -0,0 +1,149 @@
+"""
+Contagem de comandos SQL por requisição (ou por bloco de código) e
+detecção de N+1.
+
+Hooks ``before_cursor_execute``/``after_cursor_execute`` nos engines
+somam, no ``QueryStats`` ativo no contexto (ContextVar: vale para a
+requisição corrente, inclusive dentro do ``run_sync`` do AsyncSession),
+o número de comandos, o tempo gasto no banco e quantas vezes cada forma
+de comando apareceu. Forma = SQL com literais trocados por ``?`` e listas
+``IN (?, ?, ...)`` reduzidas a ``(?)``: a mesma consulta repetida com
+ids diferentes cai na mesma forma.
+
+Uma forma repetida mais de ``QUERY_REPEAT_WARN_THRESHOLD`` vezes numa
+requisição gera um warning (provável N+1: consulta dentro de laço ou
+relacionamento carregado item a item).
+
+Nos testes, ``track_queries(max_queries=...)`` fixa o orçamento de
+consultas de um service:
+
+    with track_queries("dashboard", max_queries=6):
+        dashboard_service.get_dashboard_stats(db, user_id)
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def statement_shape(statement: str) -> str:
+    """SQL normalizado: literais viram ``?`` e listas de ``?`` viram ``(?)``"""
+    shape = _SPACES.sub(" ", _LITERALS.sub("?", statement)).strip()
+    return _PLACEHOLDER_LISTS.sub("(?)", shape)
+
+
+class QueryStats:
+    """Comandos SQL, tempo no banco e repetições por forma de um escopo"""
+
+    __slots__ = ("label", "count", "seconds", "shapes", "parent")
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.parent: Optional["QueryStats"] = None
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Formas executadas mais de ``threshold`` vezes, da mais repetida para a menos"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def describe(self, limit: int = 10) -> str:
+        lines = [f"{n}x {shape}" for shape, n in self.shapes.most_common(limit)]
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    shape = statement_shape(statement)
+    # Escopos aninhados (ex.: teste dentro de uma requisição) somam nos de fora
+    while stats is not None:
+        stats.count += 1
+        stats.shapes[shape] += 1
+        stats = stats.parent
+    if context is not None:
+        context._query_tracker_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_tracker_started", None)
+    if stats is None or started is None:
+        return
+    elapsed = time.perf_counter() - started
+    while stats is not None:
+        stats.seconds += elapsed
+        stats = stats.parent
+
+
+def install(engine) -> None:
+    """Registra os hooks no engine (idempotente; engines assíncronos: ``.sync_engine``)"""
+    from sqlalchemy import event
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def install_app_engines() -> None:
+    from app.database import async_engine, engine
+
+    install(engine)
+    install(async_engine.sync_engine)
+
+
+def activate(stats: QueryStats) -> Token:
+    """Torna ``stats`` o escopo corrente; devolve o token para ``deactivate``"""
+    stats.parent = _current.get()
+    return _current.set(stats)
+
+
+def deactivate(token: Token) -> None:
+    _current.reset(token)
+
+
+def warn_repeated(stats: QueryStats, threshold: Optional[int] = None) -> None:
+    """Warning para cada forma repetida acima do limite (provável N+1)"""
+    if threshold is None:
+        threshold = settings.QUERY_REPEAT_WARN_THRESHOLD
+    if not threshold:
+        return
+    for shape, n in stats.repeated(threshold):
+        logger.warning("Possible N+1 in %s: statement executed %d times: %s",
+                       stats.label or "<unnamed>", n, shape)
+
+
+@contextmanager
+def track_queries(label: str = "", max_queries: Optional[int] = None) -> Iterator[QueryStats]:
+    """Conta os comandos SQL do bloco; com ``max_queries`` falha (AssertionError) acima do orçamento"""
+    install_app_engines()
+    stats = QueryStats(label)
+    token = activate(stats)
+    try:
+        yield stats
+    finally:
+        deactivate(token)
+    warn_repeated(stats)
+    if max_queries is not None and stats.count > max_queries:
+        raise AssertionError(
+            f"{label or 'bloco'}: {stats.count} comandos SQL, orçamento {max_queries}\n{stats.describe()}"
+        )
@@ -0,0 +1,158 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, delete
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+from decimal import Decimal
+from app.models.transaction import Transaction
+from app.models.transaction_rollup import TransactionRollup
+
+def year_month(date: datetime) -> str:
+    """Chave 'YYYY-MM' usada pela tabela de rollups"""
+    return date.strftime("%Y-%m")
+
+def year_month_expr(db: Session, column):
+    """Expressão SQL equivalente a year_month() para o dialeto em uso"""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+# INSERT ... ON CONFLICT DO UPDATE nos dialetos suportados
+_UPSERT_INSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+def apply_rollup_delta(
+    db: Session,
+    user_id: int,
+    month: str,
+    transaction_type: str,
+    category_id: int,
+    amount: Decimal,
+    count: int
+) -> None:
+    """Soma amount/count ao rollup da chave informada (sem commit)"""
+    upsert = _UPSERT_INSERTS[db.get_bind().dialect.name](TransactionRollup).values(
+        user_id=user_id,
+        year_month=month,
+        type=transaction_type,
+        category_id=category_id,
+        total=Decimal(amount),
+        count=count
+    )
+    remaining = db.execute(upsert.on_conflict_do_update(
+        index_elements=[
+            TransactionRollup.user_id, TransactionRollup.year_month,
+            TransactionRollup.type, TransactionRollup.category_id
+        ],
+        set_={
+            "total": TransactionRollup.total + upsert.excluded.total,
+            "count": TransactionRollup.count + upsert.excluded.count
+        }
+    ).returning(TransactionRollup.count)).scalar_one()
+
+    # Remover chaves que ficaram vazias para não acumular linhas mortas
+    if remaining <= 0:
+        db.execute(
+            delete(TransactionRollup).where(
+                TransactionRollup.user_id == user_id,
+                TransactionRollup.year_month == month,
+                TransactionRollup.type == transaction_type,
+                TransactionRollup.category_id == category_id
+            ).execution_options(synchronize_session=False)
+        )
+
+def add_transaction_to_rollups(db: Session, transaction: Transaction, sign: int = 1) -> None:
+    """Aplica (sign=1) ou remove (sign=-1) uma transação dos rollups"""
+    apply_rollup_delta(
+        db,
+        transaction.user_id,
+        year_month(transaction.date),
+        transaction.type,
+        transaction.category_id,
+        Decimal(transaction.amount) * sign,
+        sign
+    )
+
+def move_transaction_in_rollups(
+    db: Session,
+    transaction: Transaction,
+    old_month: str,
+    old_type: str,
+    old_category_id: int,
+    old_amount: Decimal
+) -> None:
+    """Troca nos rollups a versão antiga de uma transação alterada pela atual"""
+    month = year_month(transaction.date)
+    if (month, transaction.type, transaction.category_id) == (old_month, old_type, old_category_id):
+        # Mesma chave: um único upsert com a diferença de valor
+        apply_rollup_delta(
+            db, transaction.user_id, month, transaction.type, transaction.category_id,
+            Decimal(transaction.amount) - Decimal(old_amount), 0
+        )
+        return
+    apply_rollup_delta(db, transaction.user_id, old_month, old_type, old_category_id, -Decimal(old_amount), -1)
+    add_transaction_to_rollups(db, transaction)
+
+def _aggregate_transactions_query(db: Session, user_id: Optional[int] = None):
+    month = year_month_expr(db, Transaction.date)
+    query = select(
+        Transaction.user_id,
+        month.label("year_month"),
+        Transaction.type,
+        Transaction.category_id,
+        func.sum(Transaction.amount).label("total"),
+        func.count(Transaction.id).label("count")
+    )
+    if user_id is not None:
+        query = query.where(Transaction.user_id == user_id)
+    return query.group_by(
+        Transaction.user_id, month, Transaction.type, Transaction.category_id
+    )
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """Reconstrói os rollups a partir da tabela de transações"""
+    cleanup = delete(TransactionRollup)
+    if user_id is not None:
+        cleanup = cleanup.where(TransactionRollup.user_id == user_id)
+    db.execute(cleanup)
+
+    result = db.execute(
+        insert(TransactionRollup).from_select(
+            ["user_id", "year_month", "type", "category_id", "total", "count"],
+            _aggregate_transactions_query(db, user_id)
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+def check_rollups_consistency(db: Session, user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Compara os rollups com as transações e retorna as divergências"""
+    expected = {
+        (row.user_id, row.year_month, row.type, row.category_id): (Decimal(row.total or 0), row.count)
+        for row in db.execute(_aggregate_transactions_query(db, user_id))
+    }
+
+    query = db.query(TransactionRollup)
+    if user_id is not None:
+        query = query.filter(TransactionRollup.user_id == user_id)
+    stored = {
+        (r.user_id, r.year_month, r.type, r.category_id): (Decimal(r.total or 0), r.count)
+        for r in query.all()
+    }
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored), key=lambda k: tuple(str(p) for p in k)):
+        expected_total, expected_count = expected.get(key, (Decimal(0), 0))
+        stored_total, stored_count = stored.get(key, (Decimal(0), 0))
+        if expected_total != stored_total or expected_count != stored_count:
+            mismatches.append({
+                "user_id": key[0],
+                "year_month": key[1],
+                "type": key[2],
+                "category_id": key[3],
+                "expected_total": float(expected_total),
+                "expected_count": expected_count,
+                "stored_total": float(stored_total),
+                "stored_count": stored_count
+            })
+    return mismatches
@@ -0,0 +1,105 @@
+"""
+Índice de busca textual das transações (SQLite FTS5).
+
+A tabela virtual ``transactions_fts`` indexa ``description`` e ``notes``
+usando a própria tabela de transações como conteúdo (external content);
+triggers a mantêm sincronizada em INSERT, UPDATE e DELETE, inclusive nas
+importações em lote. Em outros bancos a busca cai para ILIKE.
+"""
+
+import re
+from typing import List, Optional
+from sqlalchemy import and_, column, or_, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.models.transaction import Transaction
+
+FTS_TABLE = "transactions_fts"
+
+transactions_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+_CREATE_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description, notes,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF description, notes ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, notes)
+        VALUES ('delete', old.id, old.description, old.notes);
+        INSERT INTO {FTS_TABLE}(rowid, description, notes)
+        VALUES (new.id, new.description, new.notes);
+    END
+    """,
+)
+
+
+def fts_enabled(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+
+def create_search_index(conn: Connection) -> None:
+    """Cria a tabela FTS e os triggers (se ainda não existirem) e popula o índice"""
+    if not fts_enabled(conn):
+        return
+    for statement in _CREATE_STATEMENTS:
+        conn.execute(text(statement))
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def rebuild_search_index(db: Session) -> bool:
+    """Reconstrói o índice a partir da tabela de transações; False se não houver FTS"""
+    if not fts_enabled(db.get_bind()):
+        return False
+    create_search_index(db.connection())
+    db.commit()
+    return True
+
+
+def search_terms(q: str) -> List[str]:
+    """Palavras da busca, sem a sintaxe de consulta do FTS5"""
+    return re.findall(r"\w+", q)
+
+
+def match_expression(q: str) -> Optional[str]:
+    """Converte a busca do usuário em consulta FTS5: todos os termos, por prefixo"""
+    terms = search_terms(q)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_filter(db: Session, q: str):
+    """(condição WHERE, ordenação por relevância) da busca para o dialeto em uso"""
+    if fts_enabled(db.get_bind()):
+        return (
+            and_(
+                transactions_fts.c.rowid == Transaction.id,
+                text(f"{FTS_TABLE} MATCH :fts_query").bindparams(fts_query=match_expression(q))
+            ),
+            transactions_fts.c.rank
+        )
+
+    # Sem FTS: cada termo precisa aparecer na descrição ou nas observações
+    return (
+        and_(*(
+            or_(Transaction.description.ilike(f"%{term}%"), Transaction.notes.ilike(f"%{term}%"))
+            for term in search_terms(q)
+        )),
+        None
+    )
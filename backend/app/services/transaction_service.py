@@ -1,58 +1,256 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, func, extract
-from typing import List, Optional, Dict, Any
+from sqlalchemy import and_, desc, func, extract, case, literal, tuple_, select
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from datetime import datetime, timedelta
+from decimal import Decimal
+import base64
+import json
 from app.models.transaction import Transaction
 from app.models.category import Category
+from app.models.transaction_rollup import TransactionRollup
+from app.models.types import cents, cents_to_float
 from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services.rollup_service import add_transaction_to_rollups, move_transaction_in_rollups, year_month
+from app.services.cache_service import bump_user_version, cached
+from app.services.goal_progress_service import refresh_goals_for_transactions
+from app.services.search_service import search_filter, search_terms
 
-def get_transactions_by_user(
-    db: Session, 
-    user_id: int, 
-    skip: int = 0, 
-    limit: int = 100,
+# Colunas aceitas para ordenação da listagem de transações
+SORT_COLUMNS = {
+    "date": Transaction.date,
+    "amount": Transaction.amount,
+    "description": Transaction.description,
+}
+
+def _transaction_to_dict(transaction: Transaction, category_name: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": transaction.id,
+        "description": transaction.description,
+        "amount": transaction.amount,
+        "type": transaction.type,
+        "date": transaction.date,
+        "notes": transaction.notes,
+        "category_id": transaction.category_id,
+        "user_id": transaction.user_id,
+        "created_at": transaction.created_at,
+        "updated_at": transaction.updated_at,
+        "category": category_name or "Sem categoria"
+    }
+
+def _transaction_filters(
+    user_id: int,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     transaction_type: Optional[str] = None,
     category_id: Optional[int] = None
-) -> List[Dict[str, Any]]:
-    query = db.query(
+) -> list:
+    filters = [Transaction.user_id == user_id]
+    if start_date:
+        filters.append(Transaction.date >= start_date)
+    if end_date:
+        filters.append(Transaction.date <= end_date)
+    if transaction_type:
+        filters.append(Transaction.type == transaction_type)
+    if category_id:
+        filters.append(Transaction.category_id == category_id)
+    return filters
+
+def _filtered_transactions_query(
+    db: Session,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category_id: Optional[int] = None
+):
+    return db.query(
         Transaction,
         Category.name.label('category_name')
     ).outerjoin(
         Category, Transaction.category_id == Category.id
-    ).filter(Transaction.user_id == user_id)
+    ).filter(*_transaction_filters(
+        user_id, start_date, end_date, transaction_type, category_id
+    ))
+
+def _sort_clauses(sort_by: str, order: str):
+    if sort_by not in SORT_COLUMNS:
+        raise ValueError(f"Invalid sort field: {sort_by}")
+    if order not in ("asc", "desc"):
+        raise ValueError(f"Invalid sort order: {order}")
     
-    if start_date:
-        query = query.filter(Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(Transaction.date <= end_date)
-    if transaction_type:
-        query = query.filter(Transaction.type == transaction_type)
-    if category_id:
-        query = query.filter(Transaction.category_id == category_id)
+    column = SORT_COLUMNS[sort_by]
+    if order == "desc":
+        return column, [column.desc(), Transaction.id.desc()]
+    return column, [column.asc(), Transaction.id.asc()]
+
+def encode_cursor(sort_by: str, order: str, value: Any, transaction_id: int) -> str:
+    """Gera um cursor opaco a partir da última linha de uma página"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    payload = json.dumps([sort_by, order, value, transaction_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> Tuple[Any, int]:
+    """Decodifica um cursor, validando que foi gerado para a mesma ordenação"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, transaction_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    
+    if cursor_sort != sort_by or cursor_order != order:
+        raise ValueError("Cursor does not match the requested sort order")
+    
+    if sort_by == "date":
+        value = datetime.fromisoformat(value)
+    elif sort_by == "amount":
+        value = Decimal(value)
+    return value, int(transaction_id)
+
+def get_transactions_by_user(
+    db: Session, 
+    user_id: int, 
+    skip: int = 0, 
+    limit: int = 100,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category_id: Optional[int] = None,
+    sort_by: str = "date",
+    order: str = "desc"
+) -> List[Dict[str, Any]]:
+    query = _filtered_transactions_query(
+        db, user_id, start_date, end_date, transaction_type, category_id
+    )
+    _, order_by = _sort_clauses(sort_by, order)
     
-    results = query.order_by(desc(Transaction.date)).offset(skip).limit(limit).all()
+    results = query.order_by(*order_by).offset(skip).limit(limit).all()
     
     # Transformar resultados para incluir o nome da categoria
-    transactions = []
-    for transaction, category_name in results:
-        transaction_dict = {
-            "id": transaction.id,
-            "description": transaction.description,
-            "amount": transaction.amount,
-            "type": transaction.type,
-            "date": transaction.date,
-            "notes": transaction.notes,
-            "category_id": transaction.category_id,
-            "user_id": transaction.user_id,
-            "created_at": transaction.created_at,
-            "updated_at": transaction.updated_at,
-            "category": category_name or "Sem categoria"
-        }
-        transactions.append(transaction_dict)
+    return [
+        _transaction_to_dict(transaction, category_name)
+        for transaction, category_name in results
+    ]
+
+def get_transactions_page(
+    db: Session,
+    user_id: int,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category_id: Optional[int] = None,
+    sort_by: str = "date",
+    order: str = "desc"
+) -> Dict[str, Any]:
+    """Listagem paginada por cursor (keyset): continua a partir de (valor, id)"""
+    query = _filtered_transactions_query(
+        db, user_id, start_date, end_date, transaction_type, category_id
+    )
+    column, order_by = _sort_clauses(sort_by, order)
+    
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by, order)
+        # Valor ligado com o tipo da coluna: amount é Money (centavos no banco)
+        boundary = tuple_(literal(value, type_=column.type), last_id)
+        if order == "desc":
+            query = query.filter(tuple_(column, Transaction.id) < boundary)
+        else:
+            query = query.filter(tuple_(column, Transaction.id) > boundary)
+    
+    # Buscar uma linha a mais para saber se existe próxima página
+    results = query.order_by(*order_by).limit(limit + 1).all()
+    has_more = len(results) > limit
+    results = results[:limit]
+    
+    next_cursor = None
+    if has_more:
+        last = results[-1][0]
+        next_cursor = encode_cursor(sort_by, order, getattr(last, sort_by), last.id)
+    
+    return {
+        "items": [
+            _transaction_to_dict(transaction, category_name)
+            for transaction, category_name in results
+        ],
+        "next_cursor": next_cursor
+    }
+
+def search_transactions(
+    db: Session,
+    user_id: int,
+    q: str,
+    skip: int = 0,
+    limit: int = 100,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Busca textual (por prefixo) em descrição e observações, por relevância"""
+    if not search_terms(q):
+        return []
+
+    condition, rank = search_filter(db, q)
+    query = _filtered_transactions_query(
+        db, user_id, start_date, end_date, transaction_type, category_id
+    ).filter(condition)
+    order_by = [Transaction.date.desc(), Transaction.id.desc()]
+    if rank is not None:
+        order_by.insert(0, rank)
+
+    results = query.order_by(*order_by).offset(skip).limit(limit).all()
+    return [
+        _transaction_to_dict(transaction, category_name)
+        for transaction, category_name in results
+    ]
+
+def export_transactions_query(
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category_id: Optional[int] = None
+):
+    """Consulta por colunas usada na exportação (sem carregar entidades ORM)"""
+    return select(
+        Transaction.id,
+        Transaction.date,
+        Transaction.description,
+        Transaction.amount,
+        Transaction.type,
+        Transaction.category_id,
+        func.coalesce(Category.name, "Sem categoria").label("category"),
+        Transaction.notes
+    ).outerjoin(
+        Category, Transaction.category_id == Category.id
+    ).where(*_transaction_filters(
+        user_id, start_date, end_date, transaction_type, category_id
+    )).order_by(
+        desc(Transaction.date), desc(Transaction.id)
+    )
+
+def iter_transactions_for_export(
+    db: Session,
+    user_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category_id: Optional[int] = None,
+    batch_size: int = 1000
+) -> Iterator[Dict[str, Any]]:
+    """Percorre as transações com cursor no servidor (memória constante)"""
+    query = export_transactions_query(
+        user_id, start_date, end_date, transaction_type, category_id
+    ).execution_options(yield_per=batch_size)
     
-    return transactions
+    for row in db.execute(query):
+        yield row._asdict()
 
 def get_transaction_by_id(db: Session, transaction_id: int, user_id: int) -> Optional[Dict[str, Any]]:
     result = db.query(
@@ -82,10 +280,18 @@ def get_transaction_by_id(db: Session, transaction_id: int, user_id: int) -> Opt
         "category": category_name or "Sem categoria"
     }
 
+def _goal_window(transaction: Transaction):
+    """Janela (data, data, {categoria}) usada para achar as metas afetadas"""
+    return (transaction.date, transaction.date, {transaction.category_id})
+
 def create_transaction(db: Session, transaction: TransactionCreate, user_id: int) -> Dict[str, Any]:
     db_transaction = Transaction(**transaction.dict(), user_id=user_id)
     db.add(db_transaction)
+    add_transaction_to_rollups(db, db_transaction)
+    db.flush()
+    refresh_goals_for_transactions(db, user_id, [_goal_window(db_transaction)])
     db.commit()
+    bump_user_version(user_id)
     db.refresh(db_transaction)
     
     # Buscar o nome da categoria
@@ -121,10 +327,21 @@ def update_transaction(
         return None
     
     update_data = transaction_update.dict(exclude_unset=True)
+    
+    # Versão antiga, para trocá-la pela nova nos rollups
+    old_window = _goal_window(db_transaction)
+    old_rollup = (
+        year_month(db_transaction.date), db_transaction.type,
+        db_transaction.category_id, db_transaction.amount
+    )
     for field, value in update_data.items():
         setattr(db_transaction, field, value)
+    move_transaction_in_rollups(db, db_transaction, *old_rollup)
+    db.flush()
+    refresh_goals_for_transactions(db, user_id, [old_window, _goal_window(db_transaction)])
     
     db.commit()
+    bump_user_version(user_id)
     db.refresh(db_transaction)
     
     # Buscar o nome da categoria
@@ -154,74 +371,85 @@ def delete_transaction(db: Session, transaction_id: int, user_id: int) -> bool:
     if not db_transaction:
         return False
     
+    add_transaction_to_rollups(db, db_transaction, sign=-1)
+    window = _goal_window(db_transaction)
     db.delete(db_transaction)
+    db.flush()
+    refresh_goals_for_transactions(db, user_id, [window])
     db.commit()
+    bump_user_version(user_id)
     return True
 
+def get_user_totals(db: Session, user_id: int) -> Dict[str, Any]:
+    """Receitas, despesas, saldo e quantidade de transações em uma única consulta"""
+    # Somas em centavos inteiros, convertidas para float só na resposta
+    income, expense, count = db.query(
+        cents(func.sum(case((Transaction.type == "income", Transaction.amount), else_=0))),
+        cents(func.sum(case((Transaction.type == "expense", Transaction.amount), else_=0))),
+        func.count(Transaction.id)
+    ).filter(Transaction.user_id == user_id).one()
+    
+    income = income or 0
+    expense = expense or 0
+    return {
+        "income": cents_to_float(income),
+        "expense": cents_to_float(expense),
+        "balance": cents_to_float(income - expense),
+        "count": count or 0
+    }
+
+@cached("balance")
 def get_user_balance(db: Session, user_id: int) -> Dict[str, float]:
     """Calcula o saldo total do usuário"""
-    income = db.query(func.sum(Transaction.amount)).filter(
-        and_(Transaction.user_id == user_id, Transaction.type == "income")
-    ).scalar() or 0
-    
-    expense = db.query(func.sum(Transaction.amount)).filter(
-        and_(Transaction.user_id == user_id, Transaction.type == "expense")
-    ).scalar() or 0
-    
+    totals = get_user_totals(db, user_id)
     return {
-        "income": float(income),
-        "expense": float(expense),
-        "balance": float(income - expense)
+        "income": totals["income"],
+        "expense": totals["expense"],
+        "balance": totals["balance"]
     }
 
+@cached("monthly_summary")
 def get_monthly_summary(db: Session, user_id: int, year: int, month: int) -> Dict[str, Any]:
-    """Resumo mensal das transações"""
-    start_date = datetime(year, month, 1)
-    if month == 12:
-        end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end_date = datetime(year, month + 1, 1) - timedelta(days=1)
+    """Resumo mensal das transações (lido da tabela de rollups)"""
+    year_month = f"{year:04d}-{month:02d}"
     
     # Total de receitas e despesas do mês
-    income = db.query(func.sum(Transaction.amount)).filter(
-        and_(
-            Transaction.user_id == user_id,
-            Transaction.type == "income",
-            Transaction.date >= start_date,
-            Transaction.date <= end_date
-        )
-    ).scalar() or 0
-    
-    expense = db.query(func.sum(Transaction.amount)).filter(
-        and_(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.date >= start_date,
-            Transaction.date <= end_date
-        )
-    ).scalar() or 0
+    totals = dict(
+        db.query(
+            TransactionRollup.type,
+            cents(func.sum(TransactionRollup.total))
+        ).filter(
+            and_(
+                TransactionRollup.user_id == user_id,
+                TransactionRollup.year_month == year_month
+            )
+        ).group_by(TransactionRollup.type).all()
+    )
+    income = totals.get("income") or 0
+    expense = totals.get("expense") or 0
     
     # Gastos por categoria
     expenses_by_category = db.query(
         Category.name,
-        func.sum(Transaction.amount).label("total")
-    ).join(Transaction).filter(
+        cents(func.sum(TransactionRollup.total)).label("total")
+    ).join(
+        TransactionRollup, TransactionRollup.category_id == Category.id
+    ).filter(
         and_(
-            Transaction.user_id == user_id,
-            Transaction.type == "expense",
-            Transaction.date >= start_date,
-            Transaction.date <= end_date
+            TransactionRollup.user_id == user_id,
+            TransactionRollup.type == "expense",
+            TransactionRollup.year_month == year_month
         )
     ).group_by(Category.name).all()
     
     return {
         "month": month,
         "year": year,
-        "income": float(income),
-        "expense": float(expense),
-        "balance": float(income - expense),
+        "income": cents_to_float(income),
+        "expense": cents_to_float(expense),
+        "balance": cents_to_float(income - expense),
         "expenses_by_category": [
-            {"category": cat.name, "amount": float(cat.total)}
+            {"category": cat.name, "amount": cents_to_float(cat.total)}
             for cat in expenses_by_category
         ]
     }
@@ -238,21 +466,7 @@ def get_recent_transactions(db: Session, user_id: int, limit: int = 5) -> List[D
     ).order_by(desc(Transaction.date)).limit(limit).all()
     
     # Transformar resultados para incluir o nome da categoria
-    transactions = []
-    for transaction, category_name in results:
-        transaction_dict = {
-            "id": transaction.id,
-            "description": transaction.description,
-            "amount": transaction.amount,
-            "type": transaction.type,
-            "date": transaction.date,
-            "notes": transaction.notes,
-            "category_id": transaction.category_id,
-            "user_id": transaction.user_id,
-            "created_at": transaction.created_at,
-            "updated_at": transaction.updated_at,
-            "category": category_name or "Sem categoria"
-        }
-        transactions.append(transaction_dict)
-    
-    return transactions
\ No newline at end of file
+    return [
+        _transaction_to_dict(transaction, category_name)
+        for transaction, category_name in results
+    ]
@@ -1,15 +1,16 @@
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
+from app.services.auth_cache import invalidate_user
+from app.services.password_service import password_hasher
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_hasher.context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.context.verify(plain_password, hashed_password)
 
 def get_user_by_id(db: Session, user_id: int):
     return db.query(User).filter(User.id == user_id).first()
@@ -20,8 +21,9 @@ def get_user_by_username(db: Session, username: str):
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: str = None):
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -38,6 +40,8 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate):
     if not db_user:
         return None
     
+    # Invalidar pelas chaves antigas (username/e-mail podem mudar)
+    invalidate_user(db_user)
     update_data = user_update.dict(exclude_unset=True)
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
@@ -47,10 +51,43 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate):
     
     db.commit()
     db.refresh(db_user)
+    invalidate_user(db_user)
+    return db_user
+
+def deactivate_user(db: Session, user_id: int):
+    db_user = get_user_by_id(db, user_id)
+    if not db_user:
+        return None
+    
+    db_user.is_active = False
+    db.commit()
+    db.refresh(db_user)
+    # Tokens já emitidos deixam de valer pelo cache e o usuário é relido do banco
+    invalidate_user(db_user)
     return db_user
 
 def authenticate_user(db: Session, username: str, password: str):
     user = get_user_by_username(db, username)
     if not user or not verify_password(password, user.hashed_password):
         return False
+    return user
+
+async def create_user_async(db: Session, user: UserCreate):
+    """create_user com o bcrypt no pool de hashing (PasswordPoolSaturated se cheio)"""
+    hashed_password = await password_hasher.hash(user.password)
+    return await run_in_threadpool(create_user, db, user, hashed_password)
+
+async def authenticate_user_async(db: Session, username: str, password: str):
+    """authenticate_user com o bcrypt no pool; regrava o hash se o custo mudou"""
+    user = await run_in_threadpool(get_user_by_username, db, username)
+    if not user:
+        return False
+    
+    valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not valid:
+        return False
+    if new_hash:
+        user.hashed_password = new_hash
+        await run_in_threadpool(db.commit)
+        invalidate_user(user)
     return user
\ No newline at end of file
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark lado a lado: endpoints síncronos (Session + threadpool) vs.
+assíncronos (AsyncSession no event loop).
+
+Popula um banco SQLite temporário, monta um app com as mesmas rotas de
+leitura usando o caminho síncrono antigo e dispara requisições
+concorrentes contra os dois apps em processo (httpx + ASGITransport).
+
+Uso (a partir de backend/):
+    python benchmarks/bench_async_vs_sync.py --rows 20000 --requests 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+_db_dir = tempfile.mkdtemp(prefix="ruviopay-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_db_dir) / 'bench.db'}"
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database import Base, SessionLocal, engine, get_db  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+from app.models import Category, Transaction, User  # noqa: E402
+from app.services import transaction_service  # noqa: E402
+from app.services.rollup_service import rebuild_rollups  # noqa: E402
+
+USER_ID = 1
+PATHS = [
+    "/api/v1/transactions/?limit=50",
+    "/api/v1/transactions/recent",
+    "/api/v1/transactions/balance",
+    "/api/v1/transactions/summary/2025/6",
+]
+
+
+def seed(rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    db = SessionLocal()
+    db.add(User(id=USER_ID, username="bench", email="bench@ruviopay.com",
+                full_name="Bench", hashed_password="x"))
+    db.add_all([
+        Category(id=1, name="Salário", type="income", user_id=USER_ID),
+        Category(id=2, name="Alimentação", type="expense", user_id=USER_ID),
+    ])
+    db.commit()
+    start = datetime(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        is_income = i % 10 == 0
+        batch.append({
+            "description": f"Transação {i}",
+            "amount": 10 + i % 500,
+            "type": "income" if is_income else "expense",
+            "date": start + timedelta(minutes=37 * i),
+            "category_id": 1 if is_income else 2,
+            "user_id": USER_ID,
+        })
+        if len(batch) >= 5000:
+            db.execute(insert(Transaction), batch)
+            batch = []
+    if batch:
+        db.execute(insert(Transaction), batch)
+    db.commit()
+    rebuild_rollups(db)
+    db.close()
+
+
+def build_sync_app() -> FastAPI:
+    """Mesmas rotas de leitura, no caminho síncrono (def + Session + threadpool)"""
+    app = FastAPI()
+
+    @app.get("/api/v1/transactions/")
+    def list_transactions(limit: int = 100, db: Session = Depends(get_db)):
+        return transaction_service.get_transactions_by_user(db, USER_ID, 0, limit)
+
+    @app.get("/api/v1/transactions/recent")
+    def recent(db: Session = Depends(get_db)):
+        return transaction_service.get_recent_transactions(db, USER_ID)
+
+    @app.get("/api/v1/transactions/balance")
+    def balance(db: Session = Depends(get_db)):
+        return transaction_service.get_user_balance(db, USER_ID)
+
+    @app.get("/api/v1/transactions/summary/{year}/{month}")
+    def summary(year: int, month: int, db: Session = Depends(get_db)):
+        return transaction_service.get_monthly_summary(db, USER_ID, year, month)
+
+    return app
+
+
+async def run(app, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(PATHS[i % len(PATHS)])
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"Populando {args.rows} transações em {_db_dir}...")
+    seed(args.rows)
+
+    from main import app as async_app
+
+    results = {
+        "sync": asyncio.run(run(build_sync_app(), args.requests, args.concurrency)),
+        "async": asyncio.run(run(async_app, args.requests, args.concurrency)),
+    }
+
+    print(f"\n{'caminho':<8} {'req/s':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'erros':>7}")
+    for name, r in results.items():
+        print(f"{name:<8} {r['rps']:>10.1f} {r['p50_ms']:>10.2f} {r['p95_ms']:>10.2f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks dos services e endpoints sobre uma base grande.
+
+Para cada tamanho em ``--sizes`` um processo novo popula um banco SQLite
+temporário com ``generate_data.py`` (um usuário com N transações, metas e
+investimentos, sempre com o mesmo seed) e mede, uma chamada por vez:
+
+- cada função de service de leitura, com uma Session síncrona;
+- cada endpoint de leitura, pelo app ASGI em processo (httpx).
+
+O relatório traz p50/p95/p99 e o número de consultas SQL por chamada. O
+resultado vai para ``--output`` em JSON; com ``--baseline`` cada medida
+(``--metric``, p50 por padrão: é a mais estável entre execuções) é
+comparada com a de uma execução anterior e o script termina com código 1
+se alguma piorar mais que ``--tolerance``.
+
+O cache de respostas fica desligado (custo real das consultas); use
+``--cache`` para medir com ele.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_endpoints.py --sizes 10000,100000 --output bench.json
+    python benchmarks/bench_endpoints.py --sizes 10000 --baseline bench.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+USER_ID = 1
+SUMMARY_MONTH = (2025, 6)
+
+ENDPOINTS = [
+    ("transactions.list", "/api/v1/transactions/?limit=50"),
+    ("transactions.list_deep_offset", "/api/v1/transactions/?limit=50&skip=5000"),
+    ("transactions.page", "/api/v1/transactions/?limit=50&cursor="),
+    ("transactions.recent", "/api/v1/transactions/recent"),
+    ("transactions.search", "/api/v1/transactions/search?q=mercado&limit=50"),
+    ("transactions.balance", "/api/v1/transactions/balance"),
+    ("transactions.monthly_summary", "/api/v1/transactions/summary/{}/{}".format(*SUMMARY_MONTH)),
+    ("categories.stats", "/api/v1/categories/stats"),
+    ("dashboard.stats", "/api/v1/dashboard/stats"),
+    ("dashboard.chart_data", "/api/v1/dashboard/chart-data"),
+    ("goals.list", "/api/v1/goals/"),
+    ("goals.summary", "/api/v1/goals/summary"),
+    ("investments.list", "/api/v1/investments/"),
+    ("investments.summary", "/api/v1/investments/summary"),
+]
+
+
+def percentile(sorted_values, p: float) -> float:
+    """Percentil por posição (nearest-rank) de uma lista já ordenada"""
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies, queries) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "calls": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "queries": round(sum(queries) / len(queries), 2),
+    }
+
+
+# --- processo filho: um tamanho de base -------------------------------------
+
+def seed(rows: int) -> None:
+    """Um usuário com ``rows`` transações, metas e investimentos (generate_data.py, seed fixo)"""
+    from app.database import engine
+    from generate_data import generate_dataset
+
+    generate_dataset(engine, users=1, transactions_per_user=rows, seed=42)
+
+
+def service_calls():
+    from app.services import (
+        category_service, dashboard_service, goal_service, investment_service, transaction_service,
+    )
+    year, month = SUMMARY_MONTH
+    return [
+        ("transaction_service.get_transactions_by_user",
+         lambda db: transaction_service.get_transactions_by_user(db, USER_ID, 0, 50)),
+        ("transaction_service.get_transactions_page",
+         lambda db: transaction_service.get_transactions_page(db, USER_ID, 50)),
+        ("transaction_service.get_recent_transactions",
+         lambda db: transaction_service.get_recent_transactions(db, USER_ID)),
+        ("transaction_service.search_transactions",
+         lambda db: transaction_service.search_transactions(db, USER_ID, "mercado", 0, 50)),
+        ("transaction_service.get_user_balance",
+         lambda db: transaction_service.get_user_balance(db, USER_ID)),
+        ("transaction_service.get_monthly_summary",
+         lambda db: transaction_service.get_monthly_summary(db, USER_ID, year, month)),
+        ("category_service.get_categories_by_user",
+         lambda db: category_service.get_categories_by_user(db, USER_ID)),
+        ("category_service.get_category_stats",
+         lambda db: category_service.get_category_stats(db, USER_ID)),
+        ("dashboard_service.get_dashboard_stats",
+         lambda db: dashboard_service.get_dashboard_stats(db, USER_ID)),
+        ("dashboard_service.get_chart_data",
+         lambda db: dashboard_service.get_chart_data(db, USER_ID)),
+        ("goal_service.get_goals_by_user",
+         lambda db: goal_service.get_goals_by_user(db, USER_ID)),
+        ("goal_service.get_goals_summary",
+         lambda db: goal_service.get_goals_summary(db, USER_ID)),
+        ("investment_service.get_investments_by_user",
+         lambda db: investment_service.get_investments_by_user(db, USER_ID)),
+        ("investment_service.get_investments_summary",
+         lambda db: investment_service.get_investments_summary(db, USER_ID)),
+    ]
+
+
+def measure_services(calls: int, warmup: int) -> dict:
+    from app.database import SessionLocal
+    from app.services.query_tracker import track_queries
+
+    results = {}
+    for name, call in service_calls():
+        latencies, queries = [], []
+        for i in range(warmup + calls):
+            db = SessionLocal()
+            with track_queries(name) as stats:
+                started = time.perf_counter()
+                call(db)
+                elapsed = time.perf_counter() - started
+            db.close()
+            if i >= warmup:
+                latencies.append(elapsed)
+                queries.append(stats.count)
+        results[name] = summarize(latencies, queries)
+    return results
+
+
+async def measure_endpoints(calls: int, warmup: int) -> dict:
+    import httpx
+    from app.services.query_tracker import track_queries
+    from main import create_app
+
+    app = create_app()
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path in ENDPOINTS:
+            latencies, queries = [], []
+            for i in range(warmup + calls):
+                with track_queries(name) as stats:
+                    started = time.perf_counter()
+                    response = await client.get(path)
+                    elapsed = time.perf_counter() - started
+                if response.status_code != 200:
+                    raise RuntimeError(f"{path}: HTTP {response.status_code} {response.text[:200]}")
+                if i >= warmup:
+                    latencies.append(elapsed)
+                    queries.append(stats.count)
+            results[name] = summarize(latencies, queries)
+    return results
+
+
+def run_size(rows: int, calls: int, warmup: int, cache: bool) -> dict:
+    import asyncio
+
+    db_dir = tempfile.mkdtemp(prefix="ruviopay-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(db_dir) / 'bench.db'}"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from config import settings
+    settings.CACHE_ENABLED = cache
+
+    started = time.perf_counter()
+    seed(rows)
+    seed_seconds = time.perf_counter() - started
+
+    return {
+        "seed_seconds": round(seed_seconds, 2),
+        "services": measure_services(calls, warmup),
+        "endpoints": asyncio.run(measure_endpoints(calls, warmup)),
+    }
+
+
+# --- processo principal -----------------------------------------------------
+
+def print_report(results: dict) -> None:
+    for size, data in results.items():
+        print(f"\n=== {int(size):,} transações (seed: {data['seed_seconds']} s) ===")
+        print(f"{'':<56} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8}")
+        for group in ("services", "endpoints"):
+            for name, r in data[group].items():
+                label = f"{group[:-1]} {name}"
+                print(f"{label:<56} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['queries']:>8}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float, metric: str = "p50_ms") -> list:
+    """Lista de regressões de ``metric`` acima da tolerância em relação ao baseline"""
+    regressions = []
+    print(f"\n=== comparação com o baseline ({metric}, tolerância {tolerance:.0%}) ===")
+    for size, data in results.items():
+        base_size = baseline.get("results", {}).get(size)
+        if base_size is None:
+            continue
+        for group in ("services", "endpoints"):
+            for name, r in data[group].items():
+                base = base_size.get(group, {}).get(name)
+                if base is None or not base[metric]:
+                    continue
+                ratio = r[metric] / base[metric]
+                flag = ""
+                if ratio > 1 + tolerance:
+                    flag = "  ❌"
+                    regressions.append(f"{size} {group} {name}: {metric} {base[metric]} -> {r[metric]}")
+                if r["queries"] > base["queries"]:
+                    flag += f"  (queries {base['queries']} -> {r['queries']})"
+                print(f"{size:>8} {group[:-1]:<8} {name:<44} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="quantidades de transações, separadas por vírgula")
+    parser.add_argument("--calls", type=int, default=100, help="chamadas medidas por service/endpoint")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--cache", action="store_true", help="mantém o cache de respostas ligado")
+    parser.add_argument("--output", default="bench_endpoints.json")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--metric", choices=("p50_ms", "p95_ms", "p99_ms"), default="p50_ms",
+                        help="medida comparada com o baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="piora máxima aceita em relação ao baseline (0.25 = 25%%)")
+    parser.add_argument("--size-worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.size_worker:
+        result = run_size(args.size_worker, args.calls, args.warmup, args.cache)
+        print(json.dumps(result))
+        return 0
+
+    results = {}
+    for size in [int(s) for s in args.sizes.split(",")]:
+        print(f"Medindo {size:,} transações...", flush=True)
+        command = [sys.executable, __file__, "--size-worker", str(size),
+                   "--calls", str(args.calls), "--warmup", str(args.warmup)]
+        if args.cache:
+            command.append("--cache")
+        output = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+        if output.returncode != 0:
+            print(output.stderr[-2000:])
+            return 1
+        results[str(size)] = json.loads(output.stdout.strip().splitlines()[-1])
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "calls": args.calls,
+            "cache": args.cache,
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print_report(results)
+    print(f"\nResultados gravados em {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()),
+                              args.tolerance, args.metric)
+        for regression in regressions:
+            print(f"❌ Regressão: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark da serialização de listas de transações.
+
+Compara, para páginas de 1k e 10k linhas no formato devolvido pelo
+transaction_service:
+
+- "atual": rota com response_model=List[TransactionResponse] devolvendo
+  os dicts (validação pydantic de cada item + JSONResponse);
+- "rápido": mesma rota devolvendo FastJSONResponse (orjson, sem nova
+  validação).
+
+As requisições rodam em processo (httpx + ASGITransport) e o script
+confere que os dois caminhos produzem o mesmo JSON.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_json_serialization.py --repeat 20
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.api.responses import FastJSONResponse  # noqa: E402
+from app.schemas.transaction import TransactionResponse  # noqa: E402
+
+SIZES = (1000, 10000)
+
+
+def make_rows(count: int) -> List[dict]:
+    """Linhas com as mesmas chaves de transaction_service._transaction_to_dict"""
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "id": i,
+            "description": f"Transação {i}",
+            "amount": Decimal(10 + i % 500).scaleb(-1),
+            "type": "income" if i % 10 == 0 else "expense",
+            "date": start + timedelta(minutes=37 * i),
+            "notes": None if i % 3 else "observação",
+            "category_id": 1 + i % 4,
+            "user_id": 1,
+            "created_at": start,
+            "updated_at": None,
+            "category": "Alimentação"
+        }
+        for i in range(count)
+    ]
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    payloads = {size: make_rows(size) for size in SIZES}
+
+    @app.get("/current/{size}", response_model=List[TransactionResponse])
+    async def current(size: int):
+        return payloads[size]
+
+    @app.get("/fast/{size}", response_model=List[TransactionResponse])
+    async def fast(size: int):
+        return FastJSONResponse(payloads[size])
+
+    return app
+
+
+async def run(repeat: int) -> dict:
+    transport = httpx.ASGITransport(app=build_app())
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in SIZES:
+            current = await client.get(f"/current/{size}")
+            fast = await client.get(f"/fast/{size}")
+            assert json.loads(current.content) == json.loads(fast.content), "saídas diferentes"
+
+            for path in ("current", "fast"):
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = await client.get(f"/{path}/{size}")
+                    timings.append(time.perf_counter() - started)
+                    response.raise_for_status()
+                results[(path, size)] = (statistics.median(timings) * 1000, len(response.content))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.repeat))
+
+    print(f"\n{'linhas':>7} {'atual (ms)':>11} {'rápido (ms)':>12} {'ganho':>7} {'bytes':>10}")
+    for size in SIZES:
+        current_ms, size_bytes = results[("current", size)]
+        fast_ms, _ = results[("fast", size)]
+        print(f"{size:>7} {current_ms:>11.2f} {fast_ms:>12.2f} {current_ms / fast_ms:>6.1f}x {size_bytes:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latência das leituras durante uma rajada de logins.
+
+Compara o login antigo (``def`` + bcrypt dentro do threadpool das
+requisições) com o login atual (bcrypt no pool limitado de
+``password_service``). Em cada rodada, ``--logins`` logins concorrentes
+disputam o servidor com ``--reads`` leituras de saldo; o que importa é o
+p95 das leituras e quantos logins foram recusados com 503.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_login_storm.py --logins 200 --reads 400 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+_db_dir = tempfile.mkdtemp(prefix="ruviopay-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_db_dir) / 'bench.db'}"
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException  # noqa: E402
+from fastapi.security import OAuth2PasswordRequestForm  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.api.endpoints import auth  # noqa: E402
+from app.database import Base, SessionLocal, engine, get_db  # noqa: E402
+from app.models import User  # noqa: E402
+from app.services import transaction_service  # noqa: E402
+from app.services.password_service import PasswordPoolSaturated, password_hasher  # noqa: E402
+from app.services.user_service import authenticate_user  # noqa: E402
+from main import password_pool_saturated_handler  # noqa: E402
+
+USER_ID = 1
+USERNAME = "bench"
+PASSWORD = "senha-de-bench"
+
+
+def seed() -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    db.add(User(id=USER_ID, username=USERNAME, email="bench@ruviopay.com",
+                full_name="Bench", hashed_password=password_hasher.context.hash(PASSWORD)))
+    db.commit()
+    db.close()
+
+
+def add_read_route(app: FastAPI) -> None:
+    @app.get("/api/v1/transactions/balance")
+    def balance(db: Session = Depends(get_db)):
+        return transaction_service.get_user_balance(db, USER_ID)
+
+
+def build_threadpool_app() -> FastAPI:
+    """Login antigo: bcrypt síncrono ocupando o threadpool das requisições"""
+    app = FastAPI()
+
+    @app.post("/api/v1/auth/login")
+    def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+        if not authenticate_user(db, form_data.username, form_data.password):
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    add_read_route(app)
+    return app
+
+
+def build_pool_app() -> FastAPI:
+    """Login atual: endpoint async, bcrypt no pool de hashing"""
+    app = FastAPI()
+    app.add_exception_handler(PasswordPoolSaturated, password_pool_saturated_handler)
+    app.include_router(auth.router, prefix="/api/v1")
+    add_read_route(app)
+    return app
+
+
+async def run(app, logins: int, reads: int, concurrency: int) -> dict:
+    read_latencies = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def login():
+            async with semaphore:
+                response = await client.post(
+                    "/api/v1/auth/login", data={"username": USERNAME, "password": PASSWORD}
+                )
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def read(i: int):
+            # Leituras espaçadas ao longo da rajada, fora do semáforo dos logins
+            await asyncio.sleep(i * 0.005)
+            started = time.perf_counter()
+            response = await client.get("/api/v1/transactions/balance")
+            read_latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)), *(read(i) for i in range(reads)))
+        elapsed = time.perf_counter() - started
+
+    read_latencies.sort()
+    return {
+        "elapsed_s": elapsed,
+        "read_p50_ms": statistics.median(read_latencies) * 1000,
+        "read_p95_ms": read_latencies[int(len(read_latencies) * 0.95) - 1] * 1000,
+        "logins_ok": statuses.get(200, 0),
+        "logins_503": statuses.get(503, 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    seed()
+    results = {
+        "threadpool": asyncio.run(run(build_threadpool_app(), args.logins, args.reads, args.concurrency)),
+        "pool": asyncio.run(run(build_pool_app(), args.logins, args.reads, args.concurrency)),
+    }
+
+    print(f"\n{'login':<11} {'tempo (s)':>10} {'leit. p50':>10} {'leit. p95':>10} {'200':>6} {'503':>6}")
+    for name, r in results.items():
+        print(f"{name:<11} {r['elapsed_s']:>10.2f} {r['read_p50_ms']:>10.2f} {r['read_p95_ms']:>10.2f} "
+              f"{r['logins_ok']:>6} {r['logins_503']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark antes/depois do main_simple_fixed.py.
+
+"antes": cada requisição abre e fecha sua própria conexão sqlite3
+(sem WAL nem pragmas) e o handler roda direto no event loop, como os
+endpoints ``async def`` originais. "depois": o app atual, com pool de
+conexões reaproveitadas e handlers síncronos em threads limitadas a
+DB_WORKERS (``db_endpoint``). As requisições são disparadas em processo (httpx +
+ASGITransport) contra um banco temporário populado.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_simple_fixed_pool.py --rows 5000 --requests 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+_db_dir = tempfile.mkdtemp(prefix="ruviopay-bench-")
+DATABASE = str(Path(_db_dir) / "bench.db")
+os.environ["RUVIPAY_SIMPLE_DB"] = DATABASE
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+PATHS = [
+    "/api/v1/transactions/1",
+    "/api/v1/dashboard/stats",
+    "/api/v1/categories",
+    "/api/v1/investments",
+    "/api/v1/goals",
+]
+
+
+def create_categories_table() -> None:
+    # init_db() do app espera a tabela de categorias já existente
+    conn = sqlite3.connect(DATABASE)
+    conn.execute("""
+        CREATE TABLE categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL,
+            color TEXT,
+            is_default INTEGER DEFAULT 0,
+            created_at TEXT
+        )
+    """)
+    conn.commit()
+    conn.close()
+
+
+def seed(rows: int) -> None:
+    categories = ["Alimentação", "Lazer", "Transporte", "Saúde", "Salário"]
+    conn = sqlite3.connect(DATABASE)
+    conn.executemany(
+        "INSERT INTO transactions (description, amount, type, category, date) VALUES (?, ?, ?, ?, ?)",
+        (
+            (f"Transação {i}", 10 + i % 500, "income" if i % 10 == 0 else "expense",
+             categories[i % len(categories)], f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}")
+            for i in range(rows)
+        )
+    )
+    conn.executemany(
+        "INSERT INTO investments (name, type, initial_amount, current_amount, purchase_date) VALUES (?, ?, ?, ?, ?)",
+        ((f"Investimento {i}", "Ações", 1000, 1100, "2024-01-01") for i in range(50))
+    )
+    conn.executemany(
+        "INSERT INTO goals (title, goal_type, target_amount, current_amount, period_type, start_date, end_date) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((f"Meta {i}", "economia", 5000, 100 * i, "anual", "2024-01-01", "2024-12-31") for i in range(20))
+    )
+    conn.commit()
+    conn.close()
+
+
+def build_before_app(module) -> FastAPI:
+    """Mesmas rotas, executadas no event loop como os antigos ``async def``"""
+    app = FastAPI()
+
+    def on_event_loop(endpoint):
+        # A função síncrona original, sem o db_endpoint
+        endpoint = endpoint.__wrapped__
+
+        @functools.wraps(endpoint)
+        async def handler(*args, **kwargs):
+            return endpoint(*args, **kwargs)
+        return handler
+
+    for path, endpoint in (
+        ("/api/v1/transactions/{transaction_id}", module.get_transaction),
+        ("/api/v1/dashboard/stats", module.get_dashboard_stats),
+        ("/api/v1/categories", module.get_categories),
+        ("/api/v1/investments", module.get_investments),
+        ("/api/v1/goals", module.get_goals),
+    ):
+        app.add_api_route(path, on_event_loop(endpoint), methods=["GET"])
+    return app
+
+
+async def run(app, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(PATHS[i % len(PATHS)])
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    create_categories_table()
+    import main_simple_fixed  # cria as tabelas e as categorias padrão
+
+    print(f"Populando {args.rows} transações em {_db_dir}...")
+    seed(args.rows)
+
+    pooled_get_connection = main_simple_fixed.get_connection
+    main_simple_fixed.get_connection = lambda: sqlite3.connect(DATABASE)
+    try:
+        before = asyncio.run(run(build_before_app(main_simple_fixed), args.requests, args.concurrency))
+    finally:
+        main_simple_fixed.get_connection = pooled_get_connection
+    after = asyncio.run(run(main_simple_fixed.app, args.requests, args.concurrency))
+
+    print(f"\n{'caminho':<8} {'req/s':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'erros':>7}")
+    for name, r in (("antes", before), ("depois", after)):
+        print(f"{name:<8} {r['rps']:>10.1f} {r['p50_ms']:>10.2f} {r['p95_ms']:>10.2f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
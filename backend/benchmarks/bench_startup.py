@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark de cold start: tempo de import (``python -X importtime``) e
+tempo até a primeira resposta, com routers carregados na startup e com
+``LAZY_ROUTERS``.
+
+Cada medida roda em um processo novo, ``--runs`` vezes; vale o menor
+tempo (ruído da máquina só soma). O script termina com código 1 se
+algum tempo passar do orçamento
+(``--max-import-ms`` / ``--max-first-response-ms``), para ser usado como
+verificação de regressão.
+
+Uso (a partir de backend/):
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+_db_dir = tempfile.mkdtemp(prefix="ruviopay-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_db_dir) / 'bench.db'}"
+
+# Processo filho: sobe o app (lifespan incluído), faz uma requisição e
+# imprime o instante em que a resposta chegou
+FIRST_RESPONSE_SCRIPT = """
+import asyncio, sys, time, httpx
+from main import app
+
+async def main():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get(sys.argv[1])
+    assert response.status_code == 200, response.text
+    print(time.time())
+
+asyncio.run(main())
+"""
+
+
+def _env(lazy: bool) -> dict:
+    env = dict(os.environ)
+    env["LAZY_ROUTERS"] = "true" if lazy else "false"
+    return env
+
+
+def import_time_ms(lazy: bool) -> float:
+    """Tempo cumulativo de ``import main`` segundo ``-X importtime``"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=_env(lazy), capture_output=True, text=True, check=True
+    )
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if line.startswith("import time:") and line.rsplit("|", 1)[-1] == " main":
+            return int(line.split("|")[1]) / 1000
+    raise RuntimeError("linha de 'main' não encontrada na saída de -X importtime")
+
+
+def first_response_ms(lazy: bool, path: str) -> float:
+    """Do início do processo até a primeira resposta de ``path``"""
+    started = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", FIRST_RESPONSE_SCRIPT, path],
+        cwd=BACKEND_DIR, env=_env(lazy), capture_output=True, text=True, check=True
+    )
+    return (float(result.stdout.strip().splitlines()[-1]) - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/api/v1/transactions/balance",
+                        help="rota da primeira requisição")
+    parser.add_argument("--max-import-ms", type=float, default=1200)
+    parser.add_argument("--max-first-response-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    # Schema criado antes: a startup medida é a de um banco já migrado
+    from app.database import engine
+    from app.migrations import ensure_schema
+    ensure_schema(engine)
+
+    failures = []
+    print(f"\n{'routers':<8} {'import (ms)':>12} {'1ª resposta (ms)':>17}")
+    for lazy in (False, True):
+        imports = min(import_time_ms(lazy) for _ in range(args.runs))
+        first = min(first_response_ms(lazy, args.path) for _ in range(args.runs))
+        name = "lazy" if lazy else "eager"
+        print(f"{name:<8} {imports:>12.1f} {first:>17.1f}")
+        if imports > args.max_import_ms:
+            failures.append(f"{name}: import {imports:.1f} ms > {args.max_import_ms:.0f} ms")
+        if first > args.max_first_response_ms:
+            failures.append(f"{name}: primeira resposta {first:.1f} ms > {args.max_first_response_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"❌ Orçamento excedido: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
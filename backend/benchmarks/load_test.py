@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Teste de carga por cenários: polling do dashboard, paginação da lista de
+transações e escritas concorrentes, com cliente HTTP assíncrono (httpx).
+
+Dois alvos:
+
+- em processo (padrão): um banco SQLite temporário é populado com
+  ``generate_data.py`` e o app de ``main.py`` é exercitado via
+  ``ASGITransport``, lifespan incluído;
+- servidor real: ``--url http://127.0.0.1:8000`` contra um uvicorn já no
+  ar (popule antes com ``python generate_data.py``). Com ``--server-log``
+  as ocorrências de "database is locked" no log do servidor durante a
+  execução também são contadas.
+
+A carga é de malha aberta quando ``--rps`` é dado: as requisições saem na
+taxa alvo (subindo linearmente durante ``--ramp-up``) independente das
+respostas, com no máximo ``--concurrency`` em voo; requisições que não
+conseguem sair no horário contam como atrasadas. Sem ``--rps`` a malha é
+fechada: ``--concurrency`` usuários virtuais, que entram ao longo do
+ramp-up, fazem uma requisição atrás da outra.
+
+O relatório traz vazão, percentis de latência e histograma por operação,
+taxa de erros por status/exceção e quantas falhas foram "database is
+locked". ``--output`` grava tudo em JSON (com a linha do tempo por
+segundo).
+
+Uso (a partir de backend/):
+    python benchmarks/load_test.py --scenario mixed --rps 200 --duration 30 --ramp-up 10
+    python benchmarks/load_test.py --scenario dashboard --concurrency 32 --duration 20
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --rps 100 --server-log uvicorn.log
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+API = "/api/v1"
+LOCKED_MESSAGE = "database is locked"
+SEARCH_TERMS = ["mercado", "uber", "farmacia", "restaurante", "salario", "aluguel", "ifood"]
+# Limites superiores (ms) das faixas do histograma
+HISTOGRAM_BUCKETS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, math.inf]
+
+
+class LoadState:
+    """Estado compartilhado pelas operações: categorias e transações criadas no teste"""
+
+    def __init__(self, expense_category_ids):
+        self.expense_category_ids = expense_category_ids
+        self.created_ids = []
+
+
+# --- operações ---------------------------------------------------------------
+
+async def list_page(client, state, rng):
+    return await client.get(f"{API}/transactions/?limit=50&skip={rng.randrange(0, 40) * 50}")
+
+
+async def cursor_pages(client, state, rng):
+    """Primeira página por cursor e, se houver, a seguinte"""
+    response = await client.get(f"{API}/transactions/?limit=50&cursor=")
+    next_cursor = response.status_code == 200 and response.json().get("next_cursor")
+    if next_cursor:
+        response = await client.get(f"{API}/transactions/?limit=50&cursor={next_cursor}")
+    return response
+
+
+async def search(client, state, rng):
+    return await client.get(f"{API}/transactions/search?q={rng.choice(SEARCH_TERMS)}&limit=50")
+
+
+async def balance(client, state, rng):
+    return await client.get(f"{API}/transactions/balance")
+
+
+async def recent(client, state, rng):
+    return await client.get(f"{API}/transactions/recent")
+
+
+async def monthly_summary(client, state, rng):
+    now = datetime.now()
+    months_ago = rng.randrange(0, 12)
+    year, month = divmod(now.year * 12 + now.month - 1 - months_ago, 12)
+    return await client.get(f"{API}/transactions/summary/{year}/{month + 1}")
+
+
+async def dashboard_stats(client, state, rng):
+    return await client.get(f"{API}/dashboard/stats")
+
+
+async def chart_data(client, state, rng):
+    return await client.get(f"{API}/dashboard/chart-data")
+
+
+async def category_stats(client, state, rng):
+    return await client.get(f"{API}/categories/stats")
+
+
+async def goals_summary(client, state, rng):
+    return await client.get(f"{API}/goals/summary")
+
+
+async def create_transaction(client, state, rng):
+    response = await client.post(f"{API}/transactions/", json={
+        "description": f"Carga {rng.choice(SEARCH_TERMS)}",
+        "amount": f"{rng.uniform(5, 300):.2f}",
+        "type": "expense",
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "category_id": rng.choice(state.expense_category_ids),
+    })
+    if response.status_code == 200:
+        state.created_ids.append(response.json()["id"])
+    return response
+
+
+async def update_transaction(client, state, rng):
+    if not state.created_ids:
+        return await create_transaction(client, state, rng)
+    # Fora da lista enquanto é atualizada: um delete concorrente não a pega
+    transaction_id = state.created_ids.pop(rng.randrange(len(state.created_ids)))
+    try:
+        return await client.put(f"{API}/transactions/{transaction_id}",
+                                json={"amount": f"{rng.uniform(5, 300):.2f}"})
+    finally:
+        state.created_ids.append(transaction_id)
+
+
+async def delete_transaction(client, state, rng):
+    if not state.created_ids:
+        return await create_transaction(client, state, rng)
+    transaction_id = state.created_ids.pop(rng.randrange(len(state.created_ids)))
+    return await client.delete(f"{API}/transactions/{transaction_id}")
+
+
+# Cenário: fração de escritas e pesos relativos das operações
+SCENARIOS = {
+    "dashboard": {
+        "write_ratio": 0.0,
+        "reads": [(dashboard_stats, 4), (chart_data, 2), (balance, 2), (recent, 2), (goals_summary, 1)],
+        "writes": [],
+    },
+    "browse": {
+        "write_ratio": 0.05,
+        "reads": [(list_page, 4), (cursor_pages, 3), (search, 2), (monthly_summary, 1), (category_stats, 1)],
+        "writes": [(create_transaction, 1)],
+    },
+    "mixed": {
+        "write_ratio": 0.2,
+        "reads": [(dashboard_stats, 3), (chart_data, 1), (balance, 2), (list_page, 2), (cursor_pages, 2),
+                  (search, 1), (monthly_summary, 1), (category_stats, 1)],
+        "writes": [(create_transaction, 5), (update_transaction, 3), (delete_transaction, 2)],
+    },
+    "write_heavy": {
+        "write_ratio": 0.5,
+        "reads": [(dashboard_stats, 2), (balance, 1), (list_page, 1)],
+        "writes": [(create_transaction, 5), (update_transaction, 3), (delete_transaction, 2)],
+    },
+}
+
+
+class Mix:
+    """Sorteia a próxima operação do cenário"""
+
+    def __init__(self, scenario: dict, write_ratio: float):
+        self.write_ratio = write_ratio if scenario["writes"] else 0.0
+        self.reads, self.read_weights = zip(*scenario["reads"])
+        self.writes, self.write_weights = zip(*scenario["writes"]) if scenario["writes"] else ((), ())
+
+    def pick(self, rng):
+        if self.write_ratio and rng.random() < self.write_ratio:
+            return rng.choices(self.writes, self.write_weights)[0]
+        return rng.choices(self.reads, self.read_weights)[0]
+
+
+# --- coleta ------------------------------------------------------------------
+
+class Recorder:
+    """Latências, status e erros por operação, mais a linha do tempo por segundo"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(Counter)
+        self.locked = 0
+        self.late = 0
+        self.timeline = defaultdict(Counter)
+
+    def record(self, operation: str, elapsed: float, outcome: str, locked: bool = False):
+        self.latencies[operation].append(elapsed)
+        self.outcomes[operation][outcome] += 1
+        if locked:
+            self.locked += 1
+        second = int(time.perf_counter() - self.started)
+        self.timeline[second]["requests"] += 1
+        if outcome != "200":
+            self.timeline[second]["errors"] += 1
+
+
+async def execute(operation, client, state, rng, recorder: Recorder):
+    started = time.perf_counter()
+    try:
+        response = await operation(client, state, rng)
+    except Exception as e:
+        # Em processo as exceções do app chegam aqui (ASGITransport as repassa)
+        recorder.record(operation.__name__, time.perf_counter() - started,
+                        type(e).__name__, locked=LOCKED_MESSAGE in str(e))
+        return
+    locked = response.status_code >= 500 and LOCKED_MESSAGE in response.text
+    recorder.record(operation.__name__, time.perf_counter() - started,
+                    str(response.status_code), locked=locked)
+
+
+async def open_loop(client, state, mix, rng, recorder, rps, duration, ramp_up, concurrency):
+    """Requisições na taxa alvo, subindo linearmente durante o ramp-up"""
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def one(operation):
+        try:
+            await execute(operation, client, state, rng, recorder)
+        finally:
+            slots.release()
+
+    started = time.perf_counter()
+    next_at = 0.0
+    while next_at < duration:
+        delay = started + next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await slots.acquire()
+        if time.perf_counter() - started - next_at > 0.05:
+            recorder.late += 1
+        task = asyncio.create_task(one(mix.pick(rng)))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        rate = rps * min(1.0, max(next_at, 0.001) / ramp_up) if ramp_up else rps
+        next_at += 1 / max(rate, 1.0)
+    await asyncio.gather(*tasks)
+
+
+async def closed_loop(client, state, mix, rng, recorder, duration, ramp_up, concurrency):
+    """Usuários virtuais em sequência contínua, entrando ao longo do ramp-up"""
+    deadline = time.perf_counter() + duration
+
+    async def user(index: int):
+        await asyncio.sleep(ramp_up * index / concurrency)
+        while time.perf_counter() < deadline:
+            await execute(mix.pick(rng), client, state, rng, recorder)
+
+    await asyncio.gather(*(user(i) for i in range(concurrency)))
+
+
+# --- alvo --------------------------------------------------------------------
+
+def prepare_in_process(rows: int):
+    """Banco temporário populado e o app montado por ``create_app``"""
+    db_dir = tempfile.mkdtemp(prefix="ruviopay-load-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{Path(db_dir) / 'load.db'}"
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    from app.database import engine
+    from generate_data import generate_dataset
+    generate_dataset(engine, users=1, transactions_per_user=rows, seed=42)
+
+    from main import create_app
+    return create_app()
+
+
+async def run(args) -> dict:
+    import httpx
+
+    scenario = SCENARIOS[args.scenario]
+    write_ratio = scenario["write_ratio"] if args.write_ratio is None else args.write_ratio
+    mix = Mix(scenario, write_ratio)
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.timeout)
+
+    if args.url:
+        app = None
+        client = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout)
+    else:
+        print(f"Populando {args.rows:,} transações...", flush=True)
+        app = prepare_in_process(args.rows)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load",
+                                   timeout=timeout)
+
+    log_offset = Path(args.server_log).stat().st_size if args.server_log else 0
+
+    async with client:
+        if app is not None:
+            lifespan = app.router.lifespan_context(app)
+            await lifespan.__aenter__()
+        try:
+            categories = (await client.get(f"{API}/categories/?category_type=expense")).json()
+            state = LoadState([c["id"] for c in categories])
+            if mix.write_ratio and not state.expense_category_ids:
+                raise SystemExit("Nenhuma categoria de despesa: popule o banco com generate_data.py")
+
+            recorder = Recorder()
+            mode = f"{args.rps} req/s alvo" if args.rps else f"{args.concurrency} usuários"
+            print(f"Cenário {args.scenario} ({mix.write_ratio:.0%} escritas), {mode}, "
+                  f"{args.duration}s (ramp-up {args.ramp_up}s)...", flush=True)
+            if args.rps:
+                await open_loop(client, state, mix, rng, recorder, args.rps, args.duration,
+                                args.ramp_up, args.concurrency)
+            else:
+                await closed_loop(client, state, mix, rng, recorder, args.duration,
+                                  args.ramp_up, args.concurrency)
+            elapsed = time.perf_counter() - recorder.started
+        finally:
+            if app is not None:
+                await lifespan.__aexit__(None, None, None)
+
+    if args.server_log:
+        with open(args.server_log, errors="replace") as log:
+            log.seek(log_offset)
+            recorder.locked = max(recorder.locked, log.read().count(LOCKED_MESSAGE))
+
+    return build_report(args, mix, recorder, elapsed)
+
+
+# --- relatório ---------------------------------------------------------------
+
+def percentile(sorted_values, p: float) -> float:
+    """Percentil por posição (nearest-rank) de uma lista já ordenada"""
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def histogram(latencies) -> list:
+    counts = [0] * len(HISTOGRAM_BUCKETS)
+    for value in latencies:
+        ms = value * 1000
+        counts[next(i for i, bound in enumerate(HISTOGRAM_BUCKETS) if ms <= bound)] += 1
+    return counts
+
+
+def summarize(latencies, outcomes: Counter, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    requests = len(latencies)
+    errors = requests - outcomes.get("200", 0)
+    return {
+        "requests": requests,
+        "rps": round(requests / elapsed, 1),
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+        "outcomes": dict(outcomes),
+        "histogram": histogram(latencies),
+    }
+
+
+def build_report(args, mix: Mix, recorder: Recorder, elapsed: float) -> dict:
+    all_latencies = [v for values in recorder.latencies.values() for v in values]
+    all_outcomes = sum(recorder.outcomes.values(), Counter())
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "target": args.url or f"in-process ({args.rows} transações)",
+            "scenario": args.scenario,
+            "write_ratio": mix.write_ratio,
+            "rps_target": args.rps,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "ramp_up": args.ramp_up,
+            "elapsed": round(elapsed, 2),
+            "histogram_buckets_ms": [b if b != math.inf else "+Inf" for b in HISTOGRAM_BUCKETS],
+        },
+        "total": summarize(all_latencies, all_outcomes, elapsed) if all_latencies else {},
+        "database_locked": recorder.locked,
+        "late_requests": recorder.late,
+        "operations": {
+            name: summarize(values, recorder.outcomes[name], elapsed)
+            for name, values in sorted(recorder.latencies.items())
+        },
+        "timeline": [dict(recorder.timeline[s], second=s) for s in sorted(recorder.timeline)],
+    }
+
+
+def print_report(report: dict) -> None:
+    total = report["total"]
+    if not total:
+        print("Nenhuma requisição concluída")
+        return
+    print(f"\n{'operação':<22} {'req':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'erros':>7}")
+    rows = list(report["operations"].items()) + [("TOTAL", total)]
+    for name, r in rows:
+        print(f"{name:<22} {r['requests']:>7} {r['rps']:>8.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+              f"{r['p99_ms']:>8.2f} {r['max_ms']:>8.2f} {r['error_rate']:>7.2%}")
+
+    print("\nHistograma de latência (todas as operações)")
+    widest = max(total["histogram"]) or 1
+    lower = 0
+    for bound, count in zip(HISTOGRAM_BUCKETS, total["histogram"]):
+        label = f"{lower:g}-{bound:g} ms" if bound != math.inf else f"> {lower:g} ms"
+        print(f"{label:>14} {count:>7} {'█' * round(40 * count / widest)}")
+        lower = bound
+
+    failures = {k: v for k, v in total["outcomes"].items() if k != "200"}
+    print(f"\nErros: {failures or 'nenhum'}")
+    print(f"'{LOCKED_MESSAGE}': {report['database_locked']}")
+    if report["meta"]["rps_target"]:
+        print(f"Requisições atrasadas (limite de concorrência): {report['late_requests']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="mixed")
+    parser.add_argument("--write-ratio", type=float, help="fração de escritas (padrão: a do cenário)")
+    parser.add_argument("--rps", type=float, default=0, help="taxa alvo; 0 = malha fechada")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="máximo em voo (malha aberta) ou usuários virtuais (malha fechada)")
+    parser.add_argument("--duration", type=float, default=30, help="segundos de carga, ramp-up incluído")
+    parser.add_argument("--ramp-up", type=float, default=5)
+    parser.add_argument("--timeout", type=float, default=30, help="timeout por requisição (s)")
+    parser.add_argument("--url", help="servidor real; sem ele o app roda em processo")
+    parser.add_argument("--server-log", help="log do uvicorn onde contar 'database is locked'")
+    parser.add_argument("--rows", type=int, default=50000, help="transações do banco em processo")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="grava o relatório em JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nRelatório gravado em {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
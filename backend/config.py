@@ -15,6 +15,8 @@ class Settings(BaseSettings):
     PROJECT_DESCRIPTION: str = "Sistema de Gestão Financeira Pessoal"
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
+    # Importa cada router só no primeiro acesso ao prefixo (workers/serverless)
+    LAZY_ROUTERS: bool = False
     
     # CORS Settings
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -29,11 +31,61 @@ class Settings(BaseSettings):
         "DATABASE_URL", 
         "sqlite:///./ruviopay.db"
     )
+    # Opcional: URL do driver assíncrono (derivada de DATABASE_URL se vazia)
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
     
+    # SQLite Settings - aplicadas a cada nova conexão
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536  # por conexão
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_FOREIGN_KEYS: bool = True
+    
+    # Connection Pool Settings
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+
+    # Response Cache Settings - por processo
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 5000
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_TTL_SECONDS: float = 300
+    CACHE_STALE_GRACE_SECONDS: float = 30
+    # Versões dos dados por usuário compartilhadas pelos workers do uvicorn.
+    # Com mais de um worker e sem diretório, o cache fica desligado: uma
+    # escrita num worker não invalidaria as respostas em cache dos outros.
+    CACHE_VERSION_DIR: str = os.getenv("CACHE_VERSION_DIR", "")
+    # Número de workers (a mesma variável que o uvicorn usa para --workers)
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+
     # JWT Settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "ruviopay-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+
+    # Password Hashing Settings - bcrypt em pool próprio
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+
+    # Auth Cache Settings - tokens verificados e usuários, por processo
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_SIZE: int = 5000
+    AUTH_USER_CACHE_TTL_SECONDS: float = 60
+    
+    # Metrics Settings - /metrics no formato do Prometheus
+    METRICS_ENABLED: bool = True
+    # Diretório compartilhado pelos workers do uvicorn (vazio = só o processo atual)
+    METRICS_MULTIPROC_DIR: str = os.getenv("METRICS_MULTIPROC_DIR", "")
+    METRICS_FLUSH_SECONDS: float = 5
+    # Warning de provável N+1 quando o mesmo comando SQL se repete mais que
+    # isso numa requisição (0 desliga; medido pelo middleware de métricas)
+    QUERY_REPEAT_WARN_THRESHOLD: int = 10
     
     # Server Settings
     HOST: str = "0.0.0.0"
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Gerador de dados sintéticos para testes de carga e de capacidade.
+
+Cria N usuários com as categorias padrão, salário mensal (com 13º e
+reajuste anual), freelas ocasionais, contas recorrentes, despesas
+variáveis com sazonalidade (dezembro, Black Friday, férias, fins de
+semana), metas e investimentos.
+
+A geração é determinística: o mesmo ``--seed`` (e os mesmos parâmetros)
+produz o mesmo banco, o que torna os benchmarks reproduzíveis. Cada
+usuário tem seu próprio gerador aleatório derivado do seed.
+
+A carga usa ``executemany`` direto no driver, com valores já em
+centavos e datas já formatadas. No SQLite, os pragmas de carga ficam
+ligados durante a inserção (synchronous=OFF, cache grande, sem checagem
+de chaves estrangeiras). Os índices e os triggers de busca das
+transações são removidos antes e recriados no fim, junto com o índice
+FTS, os rollups mensais e o progresso das metas.
+
+Uso:
+    python generate_data.py --users 100 --transactions-per-user 10000 --seed 42
+    python generate_data.py --database /tmp/carga.db --users 10 --transactions-per-user 100000
+
+Todos os usuários gerados têm a senha ``senha123``.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from calendar import monthrange
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PASSWORD = "senha123"
+BATCH_SIZE = 50000
+
+# (nome, tipo, ícone, cor) - mesmas categorias de create_default_categories
+CATEGORIES = [
+    ("Salário", "income", "💼", "#10B981"),
+    ("Freelance", "income", "💻", "#059669"),
+    ("Investimentos", "income", "📈", "#047857"),
+    ("Outros", "income", "💰", "#065F46"),
+    ("Alimentação", "expense", "🍕", "#EF4444"),
+    ("Transporte", "expense", "🚗", "#DC2626"),
+    ("Moradia", "expense", "🏠", "#B91C1C"),
+    ("Saúde", "expense", "🏥", "#991B1B"),
+    ("Educação", "expense", "📚", "#7F1D1D"),
+    ("Lazer", "expense", "🎮", "#6B1D1D"),
+    ("Compras", "expense", "🛒", "#5B1D1D"),
+]
+
+# Despesas variáveis: categoria -> (peso, valor típico em reais, dispersão, descrições)
+VARIABLE_EXPENSES = {
+    "Alimentação": (38, 45, 0.7, [
+        "Supermercado Pão de Açúcar", "Carrefour", "Assaí Atacadista", "Padaria", "Feira",
+        "iFood", "Restaurante", "Lanchonete", "Hortifruti", "Açougue",
+    ]),
+    "Transporte": (22, 28, 0.6, [
+        "Uber", "99", "Posto Ipiranga", "Posto Shell", "Estacionamento", "Metrô", "Ônibus", "Pedágio",
+    ]),
+    "Saúde": (6, 80, 0.8, ["Drogasil", "Droga Raia", "Consulta médica", "Exame laboratorial", "Dentista"]),
+    "Educação": (3, 90, 0.8, ["Livraria", "Curso online", "Material escolar", "Udemy"]),
+    "Lazer": (14, 70, 0.8, ["Cinema", "Bar", "Show", "Steam", "Viagem", "Teatro", "Parque"]),
+    "Compras": (17, 120, 0.9, [
+        "Amazon", "Mercado Livre", "Magazine Luiza", "Renner", "Americanas", "Shopee", "Leroy Merlin",
+    ]),
+}
+
+# Contas recorrentes: (descrição, categoria, dia do mês, valor típico, probabilidade de o usuário ter)
+RECURRING_BILLS = [
+    ("Aluguel", "Moradia", 10, 1800, 0.55),
+    ("Condomínio", "Moradia", 10, 480, 0.5),
+    ("Energia elétrica", "Moradia", 15, 190, 1.0),
+    ("Água e esgoto", "Moradia", 18, 90, 0.9),
+    ("Internet", "Moradia", 20, 110, 0.95),
+    ("Celular", "Moradia", 22, 60, 0.9),
+    ("Plano de saúde", "Saúde", 5, 450, 0.45),
+    ("Academia", "Saúde", 8, 99, 0.35),
+    ("Streaming", "Lazer", 12, 55, 0.8),
+    ("Mensalidade escolar", "Educação", 10, 950, 0.25),
+]
+
+# Sazonalidade das despesas variáveis por mês e dia da semana (segunda = 0)
+MONTH_WEIGHTS = {1: 1.1, 2: 0.95, 3: 0.95, 4: 0.95, 5: 1.0, 6: 1.0,
+                 7: 1.1, 8: 0.95, 9: 0.95, 10: 1.0, 11: 1.15, 12: 1.4}
+WEEKDAY_WEIGHTS = (0.85, 0.85, 0.9, 0.95, 1.2, 1.35, 1.1)
+# Compras concentradas em novembro (Black Friday) e dezembro (Natal)
+SHOPPING_MONTH_BOOST = {11: 1.8, 12: 2.2}
+
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Henrique",
+               "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael",
+               "Sofia", "Thiago", "Vitória", "Lucas"]
+LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Costa", "Rodrigues",
+              "Almeida", "Nascimento", "Carvalho", "Ribeiro", "Gomes", "Martins"]
+INVESTMENT_TYPES = [("stocks", "Ações"), ("funds", "Fundo imobiliário"), ("crypto", "Bitcoin"),
+                    ("fixed_income", "Tesouro Selic"), ("fixed_income", "CDB"), ("real_estate", "Imóvel")]
+
+# Horários de 07:00 a 22:59, no formato de DateTime do SQLAlchemy/SQLite
+TIMES = [f" {h:02d}:{m:02d}:00.000000" for h in range(7, 23) for m in range(60)]
+MIDNIGHT = " 00:00:00.000000"
+
+
+def cents(reais: float) -> int:
+    return max(1, int(round(reais * 100)))
+
+
+def month_starts(end: date, months: int) -> List[date]:
+    first = date(end.year, end.month, 1)
+    result = []
+    for _ in range(months):
+        result.append(first)
+        first = (first - timedelta(days=1)).replace(day=1)
+    return result[::-1]
+
+
+def business_day(day: date) -> date:
+    """Primeiro dia útil a partir de ``day`` (sem feriados)"""
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return day
+
+
+class UserData:
+    """Linhas geradas para um usuário (valores em centavos, datas em texto)"""
+
+    def __init__(self):
+        self.transactions: List[Tuple] = []
+        self.goals: List[Tuple] = []
+        self.investments: List[Tuple] = []
+
+
+def generate_user(
+    rng: random.Random,
+    user_id: int,
+    category_ids: Dict[str, int],
+    transactions: int,
+    months: Sequence[date],
+    end: date,
+) -> UserData:
+    data = UserData()
+    tx = data.transactions
+    start = months[0]
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    day_text = [d.isoformat() for d in days]
+
+    # Receitas: salário no 5º dia útil, reajuste em março, 13º em novembro/dezembro
+    salary = rng.lognormvariate(8.3, 0.5)
+    for month in months:
+        if month.month == 3:
+            salary *= 1 + rng.uniform(0.03, 0.08)
+        payday = business_day(month.replace(day=5))
+        if payday <= end:
+            tx.append(("Salário", cents(salary), "income", payday.isoformat() + " 09:00:00.000000",
+                       user_id, category_ids["Salário"]))
+        if month.month in (11, 12):
+            bonus_day = month.replace(day=30 if month.month == 11 else 20)
+            if bonus_day <= end:
+                tx.append((f"13º salário - {'1ª' if month.month == 11 else '2ª'} parcela", cents(salary / 2),
+                           "income", bonus_day.isoformat() + " 09:00:00.000000", user_id, category_ids["Salário"]))
+        if rng.random() < 0.35:
+            day = month + timedelta(days=rng.randrange(monthrange(month.year, month.month)[1]))
+            if day <= end:
+                tx.append(("Projeto freelance", cents(salary * rng.uniform(0.1, 0.6)), "income",
+                           day.isoformat() + rng.choice(TIMES), user_id, category_ids["Freelance"]))
+
+    # Contas recorrentes do usuário, com variação pequena de valor
+    bills = [bill for bill in RECURRING_BILLS if rng.random() < bill[4]]
+    for description, category, day_of_month, typical, _ in bills:
+        base = typical * rng.uniform(0.7, 1.4)
+        for month in months:
+            due = month.replace(day=min(day_of_month, monthrange(month.year, month.month)[1]))
+            if due > end:
+                continue
+            amount = base * rng.uniform(0.95, 1.05)
+            if description == "Energia elétrica" and month.month in (12, 1, 2):
+                amount *= 1.3  # ar-condicionado no verão
+            tx.append((description, cents(amount), "expense", due.isoformat() + MIDNIGHT,
+                       user_id, category_ids[category]))
+
+    # Investimentos e dividendos trimestrais
+    for i in range(rng.randint(2, 12)):
+        kind, name = rng.choice(INVESTMENT_TYPES)
+        invested = rng.lognormvariate(8.0, 0.9)
+        bought = rng.choice(days)
+        data.investments.append((
+            f"{name} {i + 1}", kind, cents(invested), cents(invested * rng.uniform(0.8, 1.45)),
+            bought.isoformat() + MIDNIGHT, user_id,
+        ))
+    if data.investments:
+        for month in months[2::3]:
+            tx.append(("Dividendos", cents(salary * rng.uniform(0.01, 0.05)), "income",
+                       month.replace(day=15).isoformat() + " 10:00:00.000000", user_id, category_ids["Investimentos"]))
+
+    if len(tx) > transactions:
+        del tx[transactions:]
+
+    # Despesas variáveis: completam o total pedido, distribuídas pelos dias
+    remaining = transactions - len(tx)
+    if remaining > 0:
+        names = list(VARIABLE_EXPENSES)
+        # Perfil do usuário: pesos das categorias variam até ±50%
+        profile = [VARIABLE_EXPENSES[n][0] * rng.uniform(0.5, 1.5) for n in names]
+        chosen_days = sorted(rng.choices(
+            range(len(days)),
+            cum_weights=list(accumulate(MONTH_WEIGHTS[d.month] * WEEKDAY_WEIGHTS[d.weekday()] for d in days)),
+            k=remaining
+        ))
+        chosen_categories = rng.choices(range(len(names)), weights=profile, k=remaining)
+        specs = [(category_ids[n],) + VARIABLE_EXPENSES[n][1:] for n in names]
+        shopping = names.index("Compras")
+        amounts = []
+        for day_index, category_index in zip(chosen_days, chosen_categories):
+            amount = specs[category_index][1] * rng.lognormvariate(0, specs[category_index][2])
+            if category_index == shopping:
+                amount *= SHOPPING_MONTH_BOOST.get(days[day_index].month, 1)
+            amounts.append(amount)
+
+        # Gasto variável proporcional ao que sobra da renda depois das contas:
+        # com muitas linhas por usuário os valores de cada compra encolhem,
+        # mas saldos e metas continuam plausíveis
+        income = sum(row[1] for row in tx if row[2] == "income") / 100
+        fixed = sum(row[1] for row in tx if row[2] == "expense") / 100
+        budget = max(income - fixed, income * 0.2) * rng.uniform(0.65, 0.95)
+        scale = min(10.0, max(0.01, budget / sum(amounts)))
+
+        for day_index, category_index, amount in zip(chosen_days, chosen_categories, amounts):
+            category_id, _, _, merchants = specs[category_index]
+            tx.append((rng.choice(merchants), cents(amount * scale), "expense",
+                       day_text[day_index] + rng.choice(TIMES), user_id, category_id))
+
+    # Metas do período corrente
+    month_start = date(end.year, end.month, 1)
+    month_end = month_start.replace(day=monthrange(end.year, end.month)[1])
+    year_start, year_end = date(end.year, 1, 1), date(end.year, 12, 31)
+    goals = [
+        ("Limite de alimentação", "expense_limit", cents(rng.uniform(800, 2500)), "monthly",
+         month_start, month_end, category_ids["Alimentação"]),
+        ("Limite de lazer", "expense_limit", cents(rng.uniform(300, 1200)), "monthly",
+         month_start, month_end, category_ids["Lazer"]),
+        ("Reserva de emergência", "savings_target", cents(salary * rng.uniform(3, 8)), "yearly",
+         year_start, year_end, None),
+        ("Aportes do ano", "investment_goal", cents(salary * rng.uniform(1, 4)), "yearly",
+         year_start, year_end, None),
+    ]
+    for title, kind, target, period, start_day, end_day, category_id in goals[:rng.randint(2, len(goals))]:
+        data.goals.append((title, kind, target, 0, period, start_day.isoformat() + MIDNIGHT,
+                           end_day.isoformat() + " 23:59:59.000000", 1, user_id, category_id))
+    return data
+
+
+class Loader:
+    """Inserções em lote pelo driver, com pragmas de carga no SQLite"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.is_sqlite = engine.dialect.name == "sqlite"
+        self.placeholder = "?" if engine.dialect.paramstyle == "qmark" else "%s"
+        self.raw = engine.raw_connection()
+        self.cursor = self.raw.cursor()
+        if self.is_sqlite:
+            for pragma in ("synchronous=OFF", "cache_size=-262144", "temp_store=MEMORY", "foreign_keys=OFF"):
+                self.cursor.execute(f"PRAGMA {pragma}")
+
+    def scalar(self, sql: str):
+        self.cursor.execute(sql)
+        return self.cursor.fetchone()[0]
+
+    def insert(self, table: str, columns: Sequence[str], rows: Sequence[Tuple]) -> None:
+        values = ", ".join([self.placeholder] * len(columns))
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({values})"
+        for i in range(0, len(rows), BATCH_SIZE):
+            self.cursor.executemany(sql, rows[i:i + BATCH_SIZE])
+
+    def execute(self, sql: str) -> None:
+        self.cursor.execute(sql)
+
+    def commit(self) -> None:
+        self.raw.commit()
+
+    def close(self) -> None:
+        self.raw.commit()
+        self.cursor.close()
+        # A conexão com os pragmas de carga não volta para o pool
+        self.raw.invalidate()
+
+
+TRANSACTION_COLUMNS = ("description", "amount", "type", "date", "user_id", "category_id")
+GOAL_COLUMNS = ("title", "goal_type", "target_amount", "current_amount", "period_type",
+                "start_date", "end_date", "is_active", "user_id", "category_id")
+INVESTMENT_COLUMNS = ("name", "type", "amount_invested", "current_value", "purchase_date", "user_id")
+
+
+def generate_dataset(
+    engine,
+    users: int,
+    transactions_per_user: int,
+    months: int = 36,
+    seed: int = 42,
+    end: Optional[date] = None,
+    progress: bool = False,
+) -> Dict[str, int]:
+    """Gera os dados e retorna as contagens por tabela"""
+    from sqlalchemy.orm import Session
+
+    from app.migrations import ensure_schema
+    from app.models import Transaction
+    from app.services.goal_progress_service import apply_goal_progress
+    from app.services.password_service import password_hasher
+    from app.services.rollup_service import rebuild_rollups
+    from app.services.search_service import FTS_TABLE, create_search_index
+
+    ensure_schema(engine)
+    end = end or date(2025, 12, 31)
+    month_list = month_starts(end, months)
+    hashed_password = password_hasher.context.hash(PASSWORD)
+    counts = {"users": 0, "categories": 0, "transactions": 0, "goals": 0, "investments": 0}
+
+    loader = Loader(engine)
+    try:
+        first_user = (loader.scalar("SELECT MAX(id) FROM users") or 0) + 1
+        first_category = (loader.scalar("SELECT MAX(id) FROM categories") or 0) + 1
+
+        # Índices e triggers de busca recriados uma vez no fim, não a cada linha
+        for index in Transaction.__table__.indexes:
+            loader.execute(f"DROP INDEX IF EXISTS {index.name}")
+        if loader.is_sqlite:
+            for suffix in ("ai", "ad", "au"):
+                loader.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+
+        names_rng = random.Random(seed)
+        for n in range(users):
+            user_id = first_user + n
+            rng = random.Random(f"{seed}:{n}")
+            first, last = names_rng.choice(FIRST_NAMES), names_rng.choice(LAST_NAMES)
+            loader.insert("users", ("id", "username", "email", "full_name", "hashed_password", "is_active"), [
+                (user_id, f"user{user_id:06d}", f"user{user_id:06d}@ruviopay.com", f"{first} {last}",
+                 hashed_password, 1)
+            ])
+            category_ids = {}
+            category_rows = []
+            for name, kind, icon, color in CATEGORIES:
+                category_ids[name] = first_category + counts["categories"]
+                category_rows.append((category_ids[name], name, kind, icon, color, 1, user_id))
+                counts["categories"] += 1
+            loader.insert("categories", ("id", "name", "type", "icon", "color", "is_active", "user_id"),
+                          category_rows)
+
+            data = generate_user(rng, user_id, category_ids, transactions_per_user, month_list, end)
+            loader.insert("transactions", TRANSACTION_COLUMNS, data.transactions)
+            loader.insert("goals", GOAL_COLUMNS, data.goals)
+            loader.insert("investments", INVESTMENT_COLUMNS, data.investments)
+            loader.commit()
+
+            counts["users"] += 1
+            counts["transactions"] += len(data.transactions)
+            counts["goals"] += len(data.goals)
+            counts["investments"] += len(data.investments)
+            if progress and (n + 1) % max(1, users // 10) == 0:
+                print(f"   {n + 1}/{users} usuários, {counts['transactions']:,} transações", flush=True)
+    finally:
+        loader.close()
+        # Mesmo se a carga falhar no meio, o banco não fica sem índices nem busca
+        if progress:
+            print("   Recriando índices, busca, rollups e metas...", flush=True)
+        with engine.begin() as conn:
+            for index in Transaction.__table__.indexes:
+                index.create(bind=conn, checkfirst=True)
+            create_search_index(conn)
+            if loader.is_sqlite:
+                conn.exec_driver_sql("ANALYZE")
+
+    with Session(engine) as db:
+        rebuild_rollups(db)
+        for user_id in range(first_user, first_user + users):
+            apply_goal_progress(db, user_id)
+        db.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos realistas para testes de carga")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--transactions-per-user", type=int, default=10000)
+    parser.add_argument("--months", type=int, default=36, help="meses de histórico até --end-date")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date(2025, 12, 31))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", help="arquivo SQLite de destino (padrão: DATABASE_URL)")
+    args = parser.parse_args()
+
+    if args.database:
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(args.database).resolve()}"
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from app.database import engine
+
+    total = args.users * args.transactions_per_user
+    print(f"🚀 Gerando {args.users} usuários x {args.transactions_per_user:,} transações (seed {args.seed})...")
+    started = time.perf_counter()
+    try:
+        counts = generate_dataset(engine, args.users, args.transactions_per_user, args.months,
+                                  args.seed, args.end_date, progress=True)
+    except Exception as e:
+        print(f"❌ Erro ao gerar dados: {e}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {counts['users']} usuários, {counts['categories']} categorias, "
+          f"{counts['transactions']:,} transações, {counts['goals']} metas, "
+          f"{counts['investments']} investimentos em {elapsed:.1f} s "
+          f"({total / elapsed * 60:,.0f} transações/min)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,9 @@ RuViPay API - Sistema de Gestão Financeira Pessoal
 FastAPI backend com PostgreSQL
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import sys
 from pathlib import Path
 
@@ -13,63 +13,101 @@ from pathlib import Path
 backend_dir = Path(__file__).parent
 sys.path.append(str(backend_dir))
 
-from app.api.router import api_router
-from app.database import engine, Base
+from app.api.router import include_api_routers
+from app.api.responses import FastJSONResponse
+from app.database import async_engine, engine
+from app.migrations import ensure_schema
+from app.services.metrics_service import MetricsMiddleware, instrument_engine, render_metrics
+from app.services.password_service import PasswordPoolSaturated
 from config import settings
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    description=settings.PROJECT_DESCRIPTION,
-    version=settings.VERSION,
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Configurar CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.BACKEND_CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Criar tabelas do banco de dados
-@app.on_event("startup")
-async def startup_event():
-    """Inicializar banco de dados na startup"""
-    try:
-        Base.metadata.create_all(bind=engine)
-        print("✅ Database tables created successfully!")
-    except Exception as e:
-        print(f"❌ Error creating database tables: {e}")
-
-# Incluir rotas da API
-app.include_router(api_router, prefix=settings.API_V1_STR)
-
-@app.get("/")
-async def root():
-    """Endpoint raiz da API"""
-    return JSONResponse(content={
-        "message": f"🚀 {settings.PROJECT_NAME} está funcionando!",
-        "version": settings.VERSION,
-        "docs": "/docs",
-        "status": "running",
-        "endpoints": {
-            "docs": f"http://localhost:{settings.PORT}/docs",
-            "health": f"http://localhost:{settings.PORT}/health"
-        }
-    })
-
-@app.get("/health")
-async def health_check():
-    """Health check endpoint"""
-    return JSONResponse(content={"status": "healthy", "message": "API is running"})
-
-@app.get(f"{settings.API_V1_STR}/test")
-async def test_endpoint():
-    """Endpoint de teste"""
-    return {"message": "Backend conectado com sucesso!", "timestamp": "2024-01-01"}
+
+async def password_pool_saturated_handler(request: Request, exc: PasswordPoolSaturated):
+    """Rajada de logins/cadastros acima da capacidade do pool de bcrypt"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication service busy, try again shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
+def create_app(lazy_routers: bool = None) -> FastAPI:
+    """Monta o app; com lazy_routers os módulos de endpoints são importados no primeiro acesso"""
+    if lazy_routers is None:
+        lazy_routers = settings.LAZY_ROUTERS
+
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        description=settings.PROJECT_DESCRIPTION,
+        version=settings.VERSION,
+        docs_url="/docs",
+        redoc_url="/redoc",
+        default_response_class=FastJSONResponse
+    )
+
+    # Configurar CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.BACKEND_CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Por fora do CORS: mede também as respostas de preflight
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine, "sync")
+        instrument_engine(async_engine.sync_engine, "async")
+        app.add_middleware(MetricsMiddleware, router=app.router)
+
+    app.add_exception_handler(PasswordPoolSaturated, password_pool_saturated_handler)
+
+    # Criar tabelas do banco de dados
+    @app.on_event("startup")
+    async def startup_event():
+        """Inicializar banco de dados na startup (uma consulta se o schema está em dia)"""
+        try:
+            for name in ensure_schema(engine):
+                print(f"✅ Migration applied: {name}")
+        except Exception as e:
+            print(f"❌ Error creating database tables: {e}")
+
+    @app.get("/")
+    async def root():
+        """Endpoint raiz da API"""
+        return JSONResponse(content={
+            "message": f"🚀 {settings.PROJECT_NAME} está funcionando!",
+            "version": settings.VERSION,
+            "docs": "/docs",
+            "status": "running",
+            "endpoints": {
+                "docs": f"http://localhost:{settings.PORT}/docs",
+                "health": f"http://localhost:{settings.PORT}/health"
+            }
+        })
+
+    @app.get("/health")
+    async def health_check():
+        """Health check endpoint"""
+        return JSONResponse(content={"status": "healthy", "message": "API is running"})
+
+    if settings.METRICS_ENABLED:
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics():
+            """Métricas no formato texto do Prometheus"""
+            return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+    @app.get(f"{settings.API_V1_STR}/test")
+    async def test_endpoint():
+        """Endpoint de teste"""
+        return {"message": "Backend conectado com sucesso!", "timestamp": "2024-01-01"}
+
+    # Incluir rotas da API (depois de /api/v1/test, que não pertence a nenhum router)
+    include_api_routers(app, settings.API_V1_STR, lazy=lazy_routers)
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
@@ -8,13 +8,26 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+from contextlib import asynccontextmanager
+from queue import Empty, Full, Queue
+import functools
 import sqlite3
 import os
+import re
+
+import anyio
+import anyio.to_thread
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    _pool.close_all()
 
 app = FastAPI(
     title="RuViPay API",
     description="API para sistema de gestão financeira pessoal",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -123,11 +136,106 @@ class GoalResponse(BaseModel):
     progress_percentage: float
 
 # Banco de dados SQLite
-DATABASE = "ruviopay.db"
+DATABASE = os.getenv("RUVIPAY_SIMPLE_DB", "ruviopay.db")
+
+# Threads que executam os endpoints (e, portanto, conexões simultâneas)
+DB_WORKERS = int(os.getenv("RUVIPAY_DB_WORKERS", "8"))
+# Comandos preparados mantidos em cache por conexão (padrão do sqlite3: 128)
+CACHED_STATEMENTS = 512
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+class PooledConnection:
+    """Conexão emprestada do pool; ``close()`` a devolve em vez de fechá-la"""
+
+    def __init__(self, pool: "ConnectionPool", conn: sqlite3.Connection):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+class ConnectionPool:
+    """Pool pequeno de conexões sqlite3 reaproveitadas entre requisições.
+
+    Cada conexão é aberta uma vez, com WAL, pragmas e cache de comandos
+    preparados. Se o pool estiver vazio uma conexão nova é aberta; se
+    estiver cheio na devolução, a conexão excedente é fechada.
+    """
+
+    def __init__(self, database: str, size: int):
+        self.database = database
+        self._idle: Queue = Queue(maxsize=size)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.database,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+            timeout=5.0
+        )
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        try:
+            conn = self._idle.get_nowait()
+        except Empty:
+            conn = self._connect()
+        return PooledConnection(self, conn)
+
+    def release(self, conn: sqlite3.Connection):
+        # Descartar o que ficou sem commit e o row_factory de quem usou antes
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = None
+        try:
+            self._idle.put_nowait(conn)
+        except Full:
+            conn.close()
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                return
+
+_pool = ConnectionPool(DATABASE, DB_WORKERS)
+
+# Limitador só dos endpoints com acesso ao banco; o threadpool global do
+# anyio (outros endpoints síncronos, dependências, run_in_threadpool) fica
+# com o limite padrão
+_db_limiter = anyio.CapacityLimiter(DB_WORKERS)
+
+def db_endpoint(func):
+    """Roda o endpoint síncrono numa thread, no máximo DB_WORKERS ao mesmo tempo"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await anyio.to_thread.run_sync(
+            functools.partial(func, *args, **kwargs), limiter=_db_limiter
+        )
+    return wrapper
+
+def get_connection() -> PooledConnection:
+    """Conexão do pool; chamar ``close()`` ao terminar para devolvê-la"""
+    return _pool.acquire()
 
 def init_db():
     """Inicializar banco de dados"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Criar tabela de transações
@@ -143,6 +251,42 @@ def init_db():
     )
     ''')
     
+    # Estatísticas por categoria (JOIN por nome e período) sem ler a tabela
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_transactions_category_date
+    ON transactions (category, date, amount)
+    ''')
+    
+    # Busca textual (FTS5) sobre descrição e categoria, mantida por triggers
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts'")
+    fts_exists = cursor.fetchone() is not None
+    cursor.execute('''
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, category,
+        content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''')
+    cursor.executescript('''
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description, category)
+        VALUES (new.id, new.description, new.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, category)
+        VALUES ('delete', old.id, old.description, old.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description, category ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, category)
+        VALUES ('delete', old.id, old.description, old.category);
+        INSERT INTO transactions_fts(rowid, description, category)
+        VALUES (new.id, new.description, new.category);
+    END;
+    ''')
+    if not fts_exists:
+        # Banco existente: indexar as transações já gravadas
+        cursor.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+    
     # Criar tabela de investimentos
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS investments (
@@ -231,9 +375,10 @@ async def test_endpoint():
 
 # Endpoints de Transações
 @app.get("/api/v1/transactions")
-async def get_transactions():
+@db_endpoint
+def get_transactions():
     """Buscar todas as transações"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM transactions ORDER BY date DESC")
     rows = cursor.fetchall()
@@ -254,37 +399,44 @@ async def get_transactions():
     return {"status": "success", "data": transactions}
 
 @app.get("/api/v1/transactions/search")
-async def search_transactions(q: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, category: Optional[str] = None, type: Optional[str] = None):
+@db_endpoint
+def search_transactions(q: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, category: Optional[str] = None, type: Optional[str] = None):
     """Buscar transações com filtros"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Base query
-    query = "SELECT * FROM transactions WHERE 1=1"
+    query = "SELECT t.* FROM transactions t"
     params = []
+    order_by = " ORDER BY t.date DESC"
     
-    # Adicionar filtros
-    if q:
-        query += " AND (description LIKE ? OR category LIKE ?)"
-        params.extend([f"%{q}%", f"%{q}%"])
+    # Busca textual por prefixo no índice FTS5, ordenada por relevância
+    terms = re.findall(r"\w+", q or "")
+    if terms:
+        query += " JOIN transactions_fts ON transactions_fts.rowid = t.id WHERE transactions_fts MATCH ?"
+        params.append(" ".join(f'"{term}"*' for term in terms))
+        order_by = " ORDER BY transactions_fts.rank, t.date DESC"
+    else:
+        query += " WHERE 1=1"
     
+    # Adicionar filtros
     if start_date:
-        query += " AND date >= ?"
+        query += " AND t.date >= ?"
         params.append(start_date)
     
     if end_date:
-        query += " AND date <= ?"
+        query += " AND t.date <= ?"
         params.append(end_date)
     
     if category:
-        query += " AND category = ?"
+        query += " AND t.category = ?"
         params.append(category)
     
     if type:
-        query += " AND type = ?"
+        query += " AND t.type = ?"
         params.append(type)
     
-    query += " ORDER BY date DESC"
+    query += order_by
     
     cursor.execute(query, params)
     rows = cursor.fetchall()
@@ -305,9 +457,10 @@ async def search_transactions(q: Optional[str] = None, start_date: Optional[str]
     return {"status": "success", "data": transactions}
 
 @app.get("/api/v1/transactions/{transaction_id}")
-async def get_transaction(transaction_id: int):
+@db_endpoint
+def get_transaction(transaction_id: int):
     """Buscar uma transação específica"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM transactions WHERE id = ?", (transaction_id,))
     row = cursor.fetchone()
@@ -330,9 +483,10 @@ async def get_transaction(transaction_id: int):
     }
 
 @app.post("/api/v1/transactions")
-async def create_transaction(transaction: TransactionCreate):
+@db_endpoint
+def create_transaction(transaction: TransactionCreate):
     """Criar uma nova transação"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute(
@@ -358,9 +512,10 @@ async def create_transaction(transaction: TransactionCreate):
     }
 
 @app.put("/api/v1/transactions/{transaction_id}")
-async def update_transaction(transaction_id: int, transaction: TransactionUpdate):
+@db_endpoint
+def update_transaction(transaction_id: int, transaction: TransactionUpdate):
     """Atualizar uma transação (aceita atualizações parciais)"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Buscar transação atual
@@ -404,9 +559,10 @@ async def update_transaction(transaction_id: int, transaction: TransactionUpdate
     }
 
 @app.delete("/api/v1/transactions/{transaction_id}")
-async def delete_transaction(transaction_id: int):
+@db_endpoint
+def delete_transaction(transaction_id: int):
     """Deletar uma transação"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
@@ -422,9 +578,10 @@ async def delete_transaction(transaction_id: int):
 
 # Endpoints de Dashboard
 @app.get("/api/v1/dashboard/stats")
-async def get_dashboard_stats():
+@db_endpoint
+def get_dashboard_stats():
     """Estatísticas do dashboard"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Calcular estatísticas
@@ -466,26 +623,33 @@ async def get_dashboard_stats():
     }
 
 @app.get("/api/v1/categories")
-async def get_categories():
-    """Buscar categorias com estatísticas reais"""
-    conn = sqlite3.connect(DATABASE)
+@db_endpoint
+def get_categories(start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """Buscar categorias com estatísticas reais (opcionalmente por período)"""
+    conn = get_connection()
     cursor = conn.cursor()
     
-    # Buscar todas as categorias
-    cursor.execute("SELECT id, name, type, color FROM categories ORDER BY type, name")
-    categories_data = cursor.fetchall()
+    # Filtros de data no ON para manter categorias sem transações no período
+    join_filters = ""
+    params = []
+    if start_date:
+        join_filters += " AND t.date >= ?"
+        params.append(start_date)
+    if end_date:
+        join_filters += " AND t.date <= ?"
+        params.append(end_date)
+    
+    # Estatísticas de todas as categorias em uma única consulta
+    cursor.execute(f"""
+        SELECT c.id, c.name, c.type, c.color, COUNT(t.id), COALESCE(SUM(t.amount), 0)
+        FROM categories c
+        LEFT JOIN transactions t ON t.category = c.name{join_filters}
+        GROUP BY c.id, c.name, c.type, c.color
+        ORDER BY c.type, c.name
+    """, params)
     
     categories = []
-    for cat_data in categories_data:
-        cat_id, name, type_, color = cat_data
-        
-        # Calcular estatísticas reais para cada categoria
-        cursor.execute(
-            "SELECT COUNT(*), COALESCE(SUM(amount), 0) FROM transactions WHERE category = ?",
-            (name,)
-        )
-        count, total = cursor.fetchone()
-        
+    for cat_id, name, type_, color, count, total in cursor.fetchall():
         categories.append({
             "id": str(cat_id),
             "name": name,
@@ -499,7 +663,8 @@ async def get_categories():
     return {"status": "success", "data": categories}
 
 @app.post("/api/v1/categories")
-async def create_category(request: dict):
+@db_endpoint
+def create_category(request: dict):
     """Criar nova categoria"""
     try:
         name = request.get("name")
@@ -512,7 +677,7 @@ async def create_category(request: dict):
         if type_ not in ["income", "expense"]:
             return {"status": "error", "message": "Tipo deve ser 'income' ou 'expense'"}
         
-        conn = sqlite3.connect(DATABASE)
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Verificar se categoria já existe
@@ -537,10 +702,11 @@ async def create_category(request: dict):
         return {"status": "error", "message": "Erro interno do servidor"}
 
 @app.delete("/api/v1/categories/{category_id}")
-async def delete_category(category_id: int):
+@db_endpoint
+def delete_category(category_id: int):
     """Excluir categoria (apenas categorias não-padrão)"""
     try:
-        conn = sqlite3.connect(DATABASE)
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Verificar se é categoria padrão (não pode excluir as 4 fixas)
@@ -570,9 +736,10 @@ async def delete_category(category_id: int):
 
 # Endpoints de Investimentos
 @app.get("/api/v1/investments")
-async def get_investments():
+@db_endpoint
+def get_investments():
     """Buscar todos os investimentos"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM investments ORDER BY purchase_date DESC")
     rows = cursor.fetchall()
@@ -599,9 +766,10 @@ async def get_investments():
     return {"status": "success", "data": investments}
 
 @app.post("/api/v1/investments")
-async def create_investment(investment: InvestmentCreate):
+@db_endpoint
+def create_investment(investment: InvestmentCreate):
     """Criar novo investimento"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute(
@@ -630,9 +798,10 @@ async def create_investment(investment: InvestmentCreate):
     }
 
 @app.get("/api/v1/investments/{investment_id}")
-async def get_investment(investment_id: int):
+@db_endpoint
+def get_investment(investment_id: int):
     """Buscar investimento por ID"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM investments WHERE id = ?", (investment_id,))
     row = cursor.fetchone()
@@ -661,9 +830,10 @@ async def get_investment(investment_id: int):
     }
 
 @app.put("/api/v1/investments/{investment_id}")
-async def update_investment(investment_id: int, investment: InvestmentUpdate):
+@db_endpoint
+def update_investment(investment_id: int, investment: InvestmentUpdate):
     """Atualizar um investimento"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Verificar se investimento existe
@@ -711,9 +881,10 @@ async def update_investment(investment_id: int, investment: InvestmentUpdate):
     return {"status": "success", "message": "Investimento atualizado com sucesso"}
 
 @app.delete("/api/v1/investments/{investment_id}")
-async def delete_investment(investment_id: int):
+@db_endpoint
+def delete_investment(investment_id: int):
     """Deletar um investimento"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("DELETE FROM investments WHERE id = ?", (investment_id,))
@@ -728,9 +899,10 @@ async def delete_investment(investment_id: int):
     return {"status": "success", "message": "Investimento deletado com sucesso"}
 
 @app.get("/api/v1/investments/stats")
-async def get_investment_stats():
+@db_endpoint
+def get_investment_stats():
     """Estatísticas dos investimentos"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Total investido
@@ -780,9 +952,10 @@ async def get_investment_stats():
 # ======================
 
 @app.get("/api/v1/goals")
-async def get_goals():
+@db_endpoint
+def get_goals():
     """Buscar todas as metas"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM goals ORDER BY start_date DESC")
     rows = cursor.fetchall()
@@ -808,9 +981,10 @@ async def get_goals():
     return {"status": "success", "data": goals}
 
 @app.post("/api/v1/goals")
-async def create_goal(goal: GoalCreate):
+@db_endpoint
+def create_goal(goal: GoalCreate):
     """Criar nova meta"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -856,9 +1030,10 @@ async def create_goal(goal: GoalCreate):
         }
 
 @app.get("/api/v1/goals/{goal_id}")
-async def get_goal(goal_id: str):
+@db_endpoint
+def get_goal(goal_id: str):
     """Buscar meta por ID"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM goals WHERE id = ?", (goal_id,))
     row = cursor.fetchone()
@@ -886,9 +1061,10 @@ async def get_goal(goal_id: str):
     }
 
 @app.put("/api/v1/goals/{goal_id}")
-async def update_goal(goal_id: str, goal: GoalUpdate):
+@db_endpoint
+def update_goal(goal_id: str, goal: GoalUpdate):
     """Atualizar meta"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Verificar se a meta existe
@@ -965,9 +1141,10 @@ async def update_goal(goal_id: str, goal: GoalUpdate):
         }
 
 @app.delete("/api/v1/goals/{goal_id}")
-async def delete_goal(goal_id: str):
+@db_endpoint
+def delete_goal(goal_id: str):
     """Deletar meta"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Verificar se a meta existe
@@ -984,9 +1161,10 @@ async def delete_goal(goal_id: str):
     return {"status": "success", "message": "Meta deletada com sucesso"}
 
 @app.get("/api/v1/goals/stats")
-async def get_goals_stats():
+@db_endpoint
+def get_goals_stats():
     """Estatísticas das metas"""
-    conn = sqlite3.connect(DATABASE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Total de metas ativas
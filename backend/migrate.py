@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Script para aplicar as migrações pendentes do banco de dados
+(por exemplo, criar os índices compostos em bancos já existentes).
+
+Com ``--rebuild TABELA`` a tabela é recriada com o schema dos modelos,
+copiando os dados em lotes; se interrompida, a cópia continua de onde
+parou na próxima execução.
+
+Uso:
+    python migrate.py
+    python migrate.py --rebuild investments --batch-size 5000
+"""
+
+import argparse
+import sys
+
+from app.database import Base, engine
+from app.migrations import ensure_schema, rebuild_table_online
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplica as migrações do banco de dados")
+    parser.add_argument("--rebuild", metavar="TABELA", help="recria a tabela copiando os dados em lotes")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--max-batches", type=int, default=None,
+                        help="para depois de N lotes (a cópia continua na próxima execução)")
+    args = parser.parse_args()
+
+    try:
+        if args.rebuild:
+            table = Base.metadata.tables.get(args.rebuild)
+            if table is None:
+                print(f"❌ Tabela desconhecida: {args.rebuild}")
+                return 1
+            if rebuild_table_online(engine, table, batch_size=args.batch_size, max_batches=args.max_batches):
+                print(f"✅ Tabela '{args.rebuild}' recriada")
+            else:
+                print(f"⏸️ Cópia de '{args.rebuild}' interrompida; execute de novo para continuar")
+            return 0
+        applied = ensure_schema(engine)
+    except Exception as e:
+        print(f"❌ Erro ao aplicar migrações: {e}")
+        return 1
+
+    if not applied:
+        print("ℹ️ Banco de dados já está atualizado!")
+    for name in applied:
+        print(f"✅ Migração aplicada: {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Script para reconstruir e verificar a tabela de rollups mensais.
+
+Uso:
+    python rebuild_rollups.py             # reconstrói todos os rollups
+    python rebuild_rollups.py --check     # apenas verifica a consistência
+    python rebuild_rollups.py --user 1    # limita a um usuário
+"""
+
+import argparse
+import sys
+
+from app.database import SessionLocal, engine, Base
+from app.services.rollup_service import rebuild_rollups, check_rollups_consistency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rollups mensais de transações")
+    parser.add_argument("--check", action="store_true", help="Apenas verificar a consistência")
+    parser.add_argument("--user", type=int, default=None, help="ID do usuário")
+    args = parser.parse_args()
+
+    # Garantir que a tabela de rollups exista em bancos antigos
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        if args.check:
+            mismatches = check_rollups_consistency(db, args.user)
+            if not mismatches:
+                print("✅ Rollups consistentes com as transações!")
+                return 0
+
+            print(f"❌ {len(mismatches)} divergência(s) encontrada(s):")
+            for m in mismatches:
+                print(
+                    f"   usuário {m['user_id']} {m['year_month']} {m['type']} "
+                    f"categoria {m['category_id']}: esperado {m['expected_total']:.2f} "
+                    f"({m['expected_count']}), armazenado {m['stored_total']:.2f} "
+                    f"({m['stored_count']})"
+                )
+            print("💡 Execute sem --check para reconstruir.")
+            return 1
+
+        rows = rebuild_rollups(db, args.user)
+        print(f"✅ Rollups reconstruídos com sucesso! ({rows} linhas)")
+        return 0
+    except Exception as e:
+        print(f"❌ Erro ao processar rollups: {e}")
+        db.rollback()
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
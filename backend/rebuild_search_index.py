@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Script para (re)construir o índice de busca textual das transações.
+
+Cria a tabela FTS5 e os triggers, se ainda não existirem, e repopula o
+índice a partir da tabela de transações.
+
+Uso:
+    python rebuild_search_index.py
+"""
+
+import sys
+
+from app.database import SessionLocal
+from app.services.search_service import rebuild_search_index
+
+
+def main():
+    db = SessionLocal()
+    try:
+        if not rebuild_search_index(db):
+            print("ℹ️  Banco sem suporte a FTS5; a busca usa ILIKE e não precisa de índice.")
+            return 0
+        print("✅ Índice de busca reconstruído com sucesso!")
+        return 0
+    except Exception as e:
+        print(f"❌ Erro ao reconstruir o índice de busca: {e}")
+        db.rollback()
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
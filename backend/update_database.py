@@ -1,85 +1,78 @@
 #!/usr/bin/env python3
 """
 Script para atualizar a estrutura do banco de dados existente.
-Adiciona a nova tabela de investimentos com a estrutura correta.
+
+Antes apagava e recriava a tabela de investimentos, perdendo os dados.
+Agora, se a tabela ``investments`` ainda tem o layout antigo
+(initial_amount/current_amount em reais, sem user_id), recria a tabela
+copiando os dados em lotes (ver ``rebuild_table_online``) e só então
+aplica as migrações, que pressupõem o layout atual. Os investimentos
+antigos ficam com o usuário ``--owner-id`` (padrão: o de menor id).
+
+Uso (a partir de backend/):
+    python update_database.py [--owner-id 1]
 """
 
-import sqlite3
-import os
-
-def update_database():
-    # Caminho do banco de dados
-    db_path = "ruviopay.db"
-    
-    # Conectar ao banco de dados
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+import argparse
+import sys
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.database import Base, engine as default_engine
+from app.migrations import ensure_schema, rebuild_table_online
+from app.models import Investment
+
+# Layout antigo -> colunas atuais (valores em centavos)
+LEGACY_INVESTMENT_COLUMNS = {
+    "amount_invested": "CAST(ROUND(initial_amount * 100) AS INTEGER)",
+    "current_value": "CAST(ROUND(current_amount * 100) AS INTEGER)",
+}
+
+
+def _default_owner(engine: Engine) -> int:
+    with engine.connect() as conn:
+        owner_id = conn.execute(text("SELECT MIN(id) FROM users")).scalar()
+    if owner_id is None:
+        raise ValueError(
+            "Nenhum usuário para receber os investimentos antigos: "
+            "crie um com create_default_user.py ou informe --owner-id"
+        )
+    return owner_id
+
+
+def update_database(engine: Engine = default_engine, owner_id: Optional[int] = None) -> None:
+    tables = set(inspect(engine).get_table_names())
+    if "investments" in tables:
+        columns = {c["name"] for c in inspect(engine).get_columns("investments")}
+        if "initial_amount" in columns:
+            print("Tabela 'investments' no layout antigo. Copiando dados para o novo layout...")
+            # Tabelas que faltam (ex.: users) antes da cópia; create_all não altera as existentes
+            Base.metadata.create_all(bind=engine)
+            column_map = dict(LEGACY_INVESTMENT_COLUMNS)
+            if "user_id" not in columns:
+                column_map["user_id"] = str(int(owner_id if owner_id is not None else _default_owner(engine)))
+            rebuild_table_online(engine, Investment.__table__, column_map=column_map)
+            print("Tabela 'investments' atualizada sem perda de dados!")
+
+    for name in ensure_schema(engine):
+        print(f"✅ Migração aplicada: {name}")
+
+    print("\nBanco de dados atualizado com sucesso!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--owner-id", type=int, help="usuário dos investimentos do layout antigo")
+    args = parser.parse_args()
     try:
-        # Verificar se a tabela investments existe
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='investments'")
-        table_exists = cursor.fetchone()
-        
-        if table_exists:
-            print("Tabela 'investments' existe. Removendo tabela antiga...")
-            cursor.execute("DROP TABLE investments")
-        
-        # Criar nova tabela de investimentos com a estrutura correta
-        cursor.execute("""
-            CREATE TABLE investments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name VARCHAR(100) NOT NULL,
-                type VARCHAR(50) NOT NULL,
-                initial_amount DECIMAL(10, 2) NOT NULL,
-                current_amount DECIMAL(10, 2) NOT NULL,
-                purchase_date DATE NOT NULL,
-                description TEXT,
-                status VARCHAR(20) DEFAULT 'active',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        print("Nova tabela 'investments' criada com sucesso!")
-        
-        print("Tabela de investimentos criada com sucesso! (sem dados de exemplo)")
-        
-        # Verificar se a tabela transactions existe, caso contrário criar
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='transactions'")
-        if not cursor.fetchone():
-            print("Criando tabela 'transactions'...")
-            cursor.execute("""
-                CREATE TABLE transactions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    description VARCHAR(200) NOT NULL,
-                    amount DECIMAL(10, 2) NOT NULL,
-                    type VARCHAR(10) NOT NULL CHECK (type IN ('income', 'expense')),
-                    category VARCHAR(50) NOT NULL,
-                    date DATE NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            print("Tabela 'transactions' criada com sucesso! (sem dados de exemplo)")
-        
-        # Commit das mudanças
-        conn.commit()
-        print("\nBanco de dados atualizado com sucesso!")
-        
-        # Mostrar estatísticas
-        cursor.execute("SELECT COUNT(*) FROM investments")
-        inv_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM transactions")
-        trans_count = cursor.fetchone()[0]
-        
-        print(f"Total de investimentos: {inv_count}")
-        print(f"Total de transações: {trans_count}")
-        
+        update_database(owner_id=args.owner_id)
     except Exception as e:
         print(f"Erro ao atualizar banco de dados: {e}")
-        conn.rollback()
-    finally:
-        conn.close()
+        return 1
+    return 0
+
 
 if __name__ == "__main__":
-    update_database()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Os testes usam um banco SQLite próprio; DATABASE_URL precisa ser definido
+# antes de importar app.database, que cria o engine na importação.
+_db_dir = tempfile.mkdtemp(prefix="ruviopay-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_db_dir) / 'test.db'}"
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.migrations import run_migrations  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def database():
+    """Banco com o schema completo e todas as migrações aplicadas"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    yield engine
+
+
+@pytest.fixture
+def db(database):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
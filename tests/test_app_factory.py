@@ -0,0 +1,25 @@
+"""
+Testes do app factory com routers carregados sob demanda.
+"""
+
+from fastapi.testclient import TestClient
+
+from app.api.router import LazyRouter
+from main import create_app
+
+
+def test_lazy_router_loads_on_first_request(database):
+    app = create_app(lazy_routers=True)
+    client = TestClient(app)
+    assert sum(isinstance(r, LazyRouter) for r in app.router.routes) == 6
+
+    assert client.get("/api/v1/categories/").status_code == 200
+    lazy = [r.prefix for r in app.router.routes if isinstance(r, LazyRouter)]
+    assert "/api/v1/categories" not in lazy and len(lazy) == 5
+    assert client.get("/api/v1/nao-existe").status_code == 404
+
+
+def test_openapi_lists_lazy_routes(database):
+    eager = TestClient(create_app(lazy_routers=False)).get("/openapi.json").json()
+    lazy = TestClient(create_app(lazy_routers=True)).get("/openapi.json").json()
+    assert sorted(lazy["paths"]) == sorted(eager["paths"])
@@ -0,0 +1,101 @@
+"""
+Testes dos caches de autenticação (tokens verificados e usuários).
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from jose import JWTError, jwt
+
+from app.models import User
+from app.schemas.user import UserUpdate
+from app.services import auth_cache, user_service
+
+SECRET = "test-secret"
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    auth_cache.token_cache.clear()
+    auth_cache.user_cache.clear()
+    yield
+
+
+def _token(sub: str, minutes: int = 5) -> str:
+    return jwt.encode({"sub": sub, "exp": datetime.utcnow() + timedelta(minutes=minutes)}, SECRET, algorithm="HS256")
+
+
+def test_verified_token_is_served_from_cache():
+    token = _token("ana")
+    before = auth_cache.token_cache.stats()["hits"]
+
+    assert auth_cache.decode_token(token, SECRET, "HS256")["sub"] == "ana"
+    assert auth_cache.decode_token(token, SECRET, "HS256")["sub"] == "ana"
+
+    assert auth_cache.token_cache.stats()["hits"] == before + 1
+
+
+def test_token_cached_under_one_key_is_rejected_under_another():
+    token = _token("ana")
+    assert auth_cache.decode_token(token, SECRET, "HS256")["sub"] == "ana"
+
+    with pytest.raises(JWTError):
+        auth_cache.decode_token(token, "other-secret", "HS256")
+
+
+def test_invalid_and_expired_tokens_are_not_cached():
+    with pytest.raises(JWTError):
+        auth_cache.decode_token(_token("ana"), "wrong-secret", "HS256")
+
+    auth_cache.token_cache.put("expired", {"sub": "ana", "exp": time.time() - 1})
+    assert auth_cache.token_cache.get("expired") is None
+
+
+def test_user_cache_avoids_reload_until_user_is_updated(db):
+    db.add(User(id=30, username="cache", email="cache@ruviopay.com",
+                full_name="Cache", hashed_password="x"))
+    db.commit()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return user_service.get_user_by_username(db, "cache")
+
+    first = auth_cache.get_cached_user("username", "cache", load)
+    second = auth_cache.get_cached_user("username", "cache", load)
+    assert len(loads) == 1
+    assert second.full_name == first.full_name == "Cache"
+
+    user_service.update_user(db, 30, UserUpdate(full_name="Renomeado"))
+    assert auth_cache.get_cached_user("username", "cache", load).full_name == "Renomeado"
+    assert len(loads) == 2
+
+    user_service.deactivate_user(db, 30)
+    assert auth_cache.get_cached_user("username", "cache", load).is_active is False
+    assert len(loads) == 3
+
+    db.delete(user_service.get_user_by_id(db, 30))
+    db.commit()
+
+
+def test_deactivated_user_is_rejected_even_with_a_cached_token(db):
+    from app.api.endpoints import auth
+
+    db.add(User(id=31, username="inativo", email="inativo@ruviopay.com",
+                full_name="Inativo", hashed_password="x"))
+    db.commit()
+    token = jwt.encode({"sub": "inativo", "exp": datetime.utcnow() + timedelta(minutes=5)},
+                       auth.SECRET_KEY, algorithm=auth.ALGORITHM)
+    try:
+        assert asyncio.run(auth.get_current_user(token, db)).username == "inativo"
+
+        user_service.deactivate_user(db, 31)
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(auth.get_current_user(token, db))
+        assert excinfo.value.status_code == 400
+    finally:
+        db.delete(user_service.get_user_by_id(db, 31))
+        db.commit()
@@ -0,0 +1,78 @@
+"""
+Testes das estatísticas por categoria: o caminho pelos rollups e o caminho
+pelas transações precisam dar o mesmo resultado no mesmo período.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models import Category, User
+from app.schemas.transaction import TransactionCreate
+from app.services import category_service, transaction_service
+
+USER_ID = 43
+
+# Transações nas bordas dos meses
+BOUNDARY_DATES = [
+    datetime(2023, 12, 31, 23, 59, 59, 999999),
+    datetime(2024, 1, 1),
+    datetime(2024, 1, 31, 23, 59, 58),
+    datetime(2024, 1, 31, 23, 59, 59, 500000),
+    datetime(2024, 2, 1),
+    datetime(2024, 2, 29, 23, 59, 59, 999999),
+    datetime(2024, 3, 1),
+]
+
+WHOLE_MONTH_RANGES = [
+    (datetime(2024, 1, 1), datetime(2024, 1, 31, 23, 59, 59, 999999)),
+    (datetime(2024, 1, 1), datetime(2024, 2, 1)),
+    (datetime(2024, 2, 1), datetime(2024, 3, 1)),
+    (None, datetime(2024, 2, 1)),
+    (datetime(2024, 2, 1), None),
+]
+
+
+@pytest.fixture(scope="module")
+def boundary_data(database):
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    db.add(User(id=USER_ID, username="stats", email="stats@ruviopay.com",
+                full_name="Stats", hashed_password="x"))
+    db.add(Category(id=430, name="Mercado", type="expense", user_id=USER_ID))
+    db.commit()
+    for i, date in enumerate(BOUNDARY_DATES):
+        transaction_service.create_transaction(db, TransactionCreate(
+            description=f"borda {i}", amount=Decimal(10 ** i), type="expense", date=date, category_id=430,
+        ), USER_ID)
+    db.close()
+
+
+def _stats(db, start_date, end_date):
+    # Sem o cache de respostas: cada chamada precisa ir ao banco
+    return category_service.get_category_stats.__wrapped__(db, USER_ID, start_date, end_date)
+
+
+@pytest.mark.parametrize("start_date,end_date", WHOLE_MONTH_RANGES)
+def test_rollup_and_transaction_paths_agree_on_month_boundaries(boundary_data, db, monkeypatch,
+                                                                start_date, end_date):
+    assert category_service._covers_whole_months(start_date, end_date)
+    from_rollups = _stats(db, start_date, end_date)
+
+    monkeypatch.setattr(category_service, "_covers_whole_months", lambda *args: False)
+    from_transactions = _stats(db, start_date, end_date)
+
+    assert from_rollups == from_transactions
+    assert from_rollups[0]["transaction_count"] > 0
+
+
+def test_end_before_last_microsecond_reads_transactions(boundary_data, db):
+    end_date = datetime(2024, 1, 31, 23, 59, 59)
+    assert not category_service._covers_whole_months(datetime(2024, 1, 1), end_date)
+
+    stats = _stats(db, datetime(2024, 1, 1), end_date)
+    # 23:59:59.5 fica de fora, como no filtro date <= end
+    assert stats[0]["transaction_count"] == 2
+    assert stats[0]["total_amount"] == 10 + 100
@@ -0,0 +1,90 @@
+"""
+Testes da exportação de transações em streaming (CSV e NDJSON).
+"""
+
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from app.models import Category, Transaction, User
+from app.services import export_service
+from app.services.async_services import stream_transactions_for_export
+from app.services.export_service import ENCODERS, EXPORT_FIELDS, encode_stream
+
+USER_ID = 45
+AMOUNTS = [Decimal("0.01"), Decimal("0.10"), Decimal("12.34"), Decimal("1999.99"), Decimal("100000.00")]
+
+
+@pytest.fixture(scope="module")
+def exported_user(database):
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    db.add(User(id=USER_ID, username="export", email="export@ruviopay.com",
+                full_name="Export", hashed_password="x"))
+    db.add_all([
+        Category(id=450, name="Mercado", type="expense", user_id=USER_ID),
+        Category(id=451, name="Salário", type="income", user_id=USER_ID),
+    ])
+    for i in range(25):
+        income = i % 5 == 0
+        db.add(Transaction(
+            description=f"Linha {i}, com vírgula e \"aspas\"", amount=AMOUNTS[i % len(AMOUNTS)],
+            type="income" if income else "expense", date=datetime(2024, 1 + i % 6, 10, 8, 30),
+            category_id=451 if income else 450, user_id=USER_ID, notes=None if i % 2 else "nota",
+        ))
+    db.commit()
+    db.close()
+
+
+def _export(export_format, **filters):
+    from app.database import AsyncSessionLocal, async_engine
+
+    async def collect():
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = stream_transactions_for_export(db, USER_ID, **filters)
+                return [chunk async for chunk in encode_stream(rows, ENCODERS[export_format]())]
+        finally:
+            # Conexões do aiosqlite ficam presas ao event loop deste asyncio.run
+            await async_engine.dispose()
+
+    return asyncio.run(collect())
+
+
+def test_csv_export_has_header_all_rows_and_exact_amounts(exported_user, monkeypatch):
+    monkeypatch.setattr(export_service, "ROWS_PER_CHUNK", 10)
+    chunks = _export("csv")
+    # Cabeçalho + pedaços de 10 linhas
+    assert len(chunks) == 1 + 3
+    assert chunks[0] == ",".join(EXPORT_FIELDS) + "\r\n"
+
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == 25
+    assert {row["amount"] for row in rows} == {str(amount) for amount in AMOUNTS}
+    # Mais recentes primeiro (data e id decrescentes)
+    assert rows[0]["description"] == 'Linha 23, com vírgula e "aspas"'
+    assert rows[0]["date"] == "2024-06-10T08:30:00"
+    assert [row["date"] for row in rows] == sorted((row["date"] for row in rows), reverse=True)
+
+
+def test_ndjson_export_applies_filters(exported_user):
+    lines = "".join(_export("ndjson", transaction_type="income")).splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert len(rows) == 5
+    assert {row["type"] for row in rows} == {"income"}
+    assert {row["category"] for row in rows} == {"Salário"}
+    # Decimal vira texto: sem arredondamento de float
+    assert rows[0]["amount"] == "0.01"
+
+    rows = [json.loads(line) for line in "".join(_export(
+        "ndjson", start_date=datetime(2024, 2, 1), end_date=datetime(2024, 3, 31), category_id=450,
+    )).splitlines()]
+    assert len(rows) == 7
+    assert all(row["date"].startswith(("2024-02", "2024-03")) for row in rows)
+    assert sorted(rows[0]) == sorted(EXPORT_FIELDS)
@@ -0,0 +1,71 @@
+"""
+Testes do gerador de dados sintéticos.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import generate_data
+from generate_data import generate_dataset
+
+
+def _snapshot(engine):
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT description, amount, type, date, user_id, category_id FROM transactions ORDER BY id"
+        )).all()
+
+
+def test_same_seed_generates_the_same_data(tmp_path):
+    engines = [create_engine(f"sqlite:///{tmp_path / f'{name}.db'}") for name in ("a", "b")]
+    for engine in engines:
+        counts = generate_dataset(engine, users=2, transactions_per_user=500, months=12, seed=3)
+        assert counts["transactions"] == 1000 and counts["users"] == 2
+
+    assert _snapshot(engines[0]) == _snapshot(engines[1])
+
+
+def _indexes_and_triggers(conn):
+    indexes = {row[0] for row in conn.execute(text(
+        "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='transactions'"
+    ))}
+    triggers = conn.execute(text("SELECT COUNT(*) FROM sqlite_master WHERE type='trigger'")).scalar()
+    return indexes, triggers
+
+
+def test_generated_database_is_indexed_and_searchable(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'gen.db'}")
+    generate_dataset(engine, users=1, transactions_per_user=300, months=6, seed=1)
+
+    with engine.connect() as conn:
+        indexes, triggers = _indexes_and_triggers(conn)
+        matches = conn.execute(text(
+            "SELECT COUNT(*) FROM transactions_fts WHERE transactions_fts MATCH 'salario'"
+        )).scalar()
+        rollup_total = conn.execute(text("SELECT SUM(count) FROM transaction_rollups")).scalar()
+
+    assert "ix_transactions_user_date" in indexes
+    assert triggers == 3
+    assert matches > 0
+    assert rollup_total == 300
+
+
+def test_failed_load_still_restores_indexes_and_search(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'falha.db'}")
+    generate_user = generate_data.generate_user
+
+    def fail_on_second_user(rng, user_id, *args):
+        if user_id > 1:
+            raise RuntimeError("falha na carga")
+        return generate_user(rng, user_id, *args)
+
+    monkeypatch.setattr(generate_data, "generate_user", fail_on_second_user)
+    with pytest.raises(RuntimeError):
+        generate_dataset(engine, users=2, transactions_per_user=100, months=6, seed=1)
+
+    with engine.connect() as conn:
+        indexes, triggers = _indexes_and_triggers(conn)
+        searchable = conn.execute(text("SELECT COUNT(*) FROM transactions_fts")).scalar()
+    assert "ix_transactions_user_date" in indexes
+    assert triggers == 3
+    assert searchable == 100
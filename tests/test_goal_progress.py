@@ -0,0 +1,132 @@
+"""
+Testes do progresso das metas mantido nas escritas de transações e
+investimentos: valores calculados e quais metas são recalculadas.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import text
+
+from app.models import Category, Goal, User
+from app.schemas.investment import InvestmentCreate, InvestmentUpdate
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services import goal_progress_service, investment_service, transaction_service
+
+USER_ID = 44
+FOOD, LEISURE, SALARY = 440, 441, 442
+
+
+@pytest.fixture
+def goals(db):
+    db.add(User(id=USER_ID, username="goals", email="goals@ruviopay.com",
+                full_name="Goals", hashed_password="x"))
+    db.add_all([
+        Category(id=FOOD, name="Alimentação", type="expense", user_id=USER_ID),
+        Category(id=LEISURE, name="Lazer", type="expense", user_id=USER_ID),
+        Category(id=SALARY, name="Salário", type="income", user_id=USER_ID),
+    ])
+    first_half = dict(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 6, 30, 23, 59, 59))
+    second_half = dict(start_date=datetime(2024, 7, 1), end_date=datetime(2024, 12, 31, 23, 59, 59))
+    rows = {
+        "food": Goal(goal_type="expense_limit", category_id=FOOD, **first_half),
+        "food_later": Goal(goal_type="expense_limit", category_id=FOOD, **second_half),
+        "all_expenses": Goal(goal_type="expense_limit", **first_half),
+        "savings": Goal(goal_type="savings_target", **first_half),
+        "investing": Goal(goal_type="investment_goal", start_date=datetime(2024, 1, 1),
+                          end_date=datetime(2024, 12, 31, 23, 59, 59)),
+    }
+    for name, goal in rows.items():
+        goal.title = name
+        goal.user_id = USER_ID
+        goal.target_amount = Decimal("5000")
+        goal.period_type = "custom"
+    db.add_all(rows.values())
+    db.commit()
+    yield {name: goal.id for name, goal in rows.items()}
+
+    # O banco dos testes é compartilhado: limpar o que foi commitado
+    db.rollback()
+    for table in ("goals", "investments", "transactions", "transaction_rollups", "categories", "users"):
+        column = "id" if table == "users" else "user_id"
+        db.execute(text(f"DELETE FROM {table} WHERE {column} = :user"), {"user": USER_ID})
+    db.commit()
+
+
+def _amounts(db, goals):
+    db.expire_all()
+    return {name: db.get(Goal, goal_id).current_amount for name, goal_id in goals.items()}
+
+
+@pytest.fixture
+def recalculated(monkeypatch):
+    """Ids das metas passadas para o recálculo em cada escrita"""
+    calls = []
+    apply = goal_progress_service.apply_goal_progress
+
+    def spy(db, user_id, goal_ids=None, commit=True):
+        calls.append(set(goal_ids or ()))
+        return apply(db, user_id, goal_ids, commit)
+
+    monkeypatch.setattr(goal_progress_service, "apply_goal_progress", spy)
+    return calls
+
+
+def _expense(amount, date, category_id, transaction_type="expense"):
+    return TransactionCreate(description="t", amount=Decimal(amount), type=transaction_type,
+                             date=date, category_id=category_id)
+
+
+def test_transaction_writes_update_matching_goals(db, goals, recalculated):
+    food = transaction_service.create_transaction(db, _expense("100", datetime(2024, 3, 10), FOOD), USER_ID)
+    assert recalculated[-1] == {goals["food"], goals["all_expenses"], goals["savings"]}
+    transaction_service.create_transaction(
+        db, _expense("1000", datetime(2024, 4, 1), SALARY, "income"), USER_ID
+    )
+    leisure = transaction_service.create_transaction(db, _expense("50", datetime(2024, 5, 1), LEISURE), USER_ID)
+    # Outra categoria: a meta de alimentação não é recalculada
+    assert recalculated[-1] == {goals["all_expenses"], goals["savings"]}
+    assert _amounts(db, goals) == {
+        "food": Decimal("100.00"), "food_later": Decimal("0.00"), "all_expenses": Decimal("150.00"),
+        "savings": Decimal("850.00"), "investing": Decimal("0.00"),
+    }
+
+    # Troca de categoria: sai da meta de alimentação
+    transaction_service.update_transaction(db, food["id"], TransactionUpdate(category_id=LEISURE), USER_ID)
+    assert _amounts(db, goals)["food"] == Decimal("0.00")
+
+    # Saída da janela das metas do primeiro semestre, entrada na do segundo
+    transaction_service.update_transaction(
+        db, leisure["id"], TransactionUpdate(date=datetime(2024, 8, 1), category_id=FOOD), USER_ID
+    )
+    assert recalculated[-1] == {goals["all_expenses"], goals["savings"], goals["food_later"]}
+    amounts = _amounts(db, goals)
+    assert (amounts["food"], amounts["food_later"]) == (Decimal("0.00"), Decimal("50.00"))
+    assert (amounts["all_expenses"], amounts["savings"]) == (Decimal("100.00"), Decimal("900.00"))
+
+    transaction_service.delete_transaction(db, leisure["id"], USER_ID)
+    assert recalculated[-1] == {goals["food_later"]}
+    assert _amounts(db, goals)["food_later"] == Decimal("0.00")
+    assert goal_progress_service.compute_goal_progress(db, USER_ID) == {
+        goals[name]: amount for name, amount in _amounts(db, goals).items()
+    }
+
+
+def test_investment_writes_update_investment_goals(db, goals, recalculated):
+    investment = investment_service.create_investment(db, InvestmentCreate(
+        name="CDB", type="funds", amount_invested=2000, current_value=2100, purchase_date=datetime(2024, 2, 1),
+    ), USER_ID)
+    assert recalculated[-1] == {goals["investing"]}
+    assert _amounts(db, goals)["investing"] == Decimal("2000.00")
+
+    investment_service.update_investment(db, investment.id, InvestmentUpdate(amount_invested=3000), USER_ID)
+    assert _amounts(db, goals)["investing"] == Decimal("3000.00")
+
+    investment_service.update_investment(
+        db, investment.id, InvestmentUpdate(purchase_date=datetime(2025, 1, 15)), USER_ID
+    )
+    amounts = _amounts(db, goals)
+    assert amounts["investing"] == Decimal("0.00")
+    # Metas de transações não são tocadas por investimentos
+    assert all(amount == Decimal("0.00") for amount in amounts.values())
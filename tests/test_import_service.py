@@ -0,0 +1,76 @@
+"""
+Testes da importação em lote de transações.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.models import Category, Transaction, TransactionRollup, User
+from app.schemas.transaction import TransactionCreate
+from app.services.import_parsers import get_parser
+from app.services.import_service import TransactionImporter
+from app.services.transaction_service import create_transaction
+
+USER_ID = 40
+CATEGORY_ID = 400
+
+CSV = """description,amount,type,date,category_id
+Sem fuso,10.00,expense,2024-03-10T12:00:00,{category_id}
+UTC,20.00,expense,2024-01-05T08:00:00+00:00,{category_id}
+São Paulo,30.00,expense,2024-05-20T21:30:00-03:00,{category_id}
+"""
+
+
+def test_bulk_import_accepts_mixed_naive_and_aware_dates(db):
+    db.add(User(id=USER_ID, username="import", email="import@ruviopay.com",
+                full_name="Import", hashed_password="x"))
+    category = Category(id=CATEGORY_ID, name="Mercado", type="expense", user_id=USER_ID)
+    db.add(category)
+    db.commit()
+
+    parser = get_parser("csv")
+    importer = TransactionImporter(db, USER_ID)
+    importer.add_rows(parser.feed(CSV.format(category_id=CATEGORY_ID).encode()))
+    importer.add_rows(parser.close())
+    result = importer.finish()
+
+    assert (result["inserted"], result["failed"]) == (3, 0)
+    assert importer._first_date == datetime(2024, 1, 5, 8, 0)
+    assert importer._last_date == datetime(2024, 5, 20, 21, 30)
+    dates = db.execute(
+        select(Transaction.date).where(Transaction.user_id == USER_ID).order_by(Transaction.date)
+    ).scalars().all()
+    assert [d.replace(tzinfo=None) for d in dates] == [
+        datetime(2024, 1, 5, 8, 0), datetime(2024, 3, 10, 12, 0), datetime(2024, 5, 20, 21, 30),
+    ]
+
+
+def test_single_and_bulk_creation_store_the_same_date_and_month(db):
+    user_id, category_id = USER_ID + 1, CATEGORY_ID + 1
+    db.add(User(id=user_id, username="import2", email="import2@ruviopay.com",
+                full_name="Import", hashed_password="x"))
+    db.add(Category(id=category_id, name="Mercado", type="expense", user_id=user_id))
+    db.commit()
+    late_evening = "2026-05-31T22:00:00-03:00"
+
+    create_transaction(db, TransactionCreate(
+        description="Unitária", amount="10.00", type="expense", date=late_evening, category_id=category_id,
+    ), user_id)
+    parser = get_parser("csv")
+    importer = TransactionImporter(db, user_id)
+    importer.add_rows(parser.feed(
+        f"description,amount,type,date,category_id\nLote,10.00,expense,{late_evening},{category_id}\n".encode()
+    ))
+    importer.add_rows(parser.close())
+    importer.finish()
+
+    stored = db.execute(
+        select(Transaction.description, Transaction.date).where(Transaction.user_id == user_id)
+    ).all()
+    assert {d.replace(tzinfo=None) for _, d in stored} == {datetime(2026, 5, 31, 22, 0)}
+    assert len(stored) == 2
+    rollups = db.execute(
+        select(TransactionRollup.year_month, TransactionRollup.count).where(TransactionRollup.user_id == user_id)
+    ).all()
+    assert rollups == [("2026-05", 2)]
@@ -0,0 +1,56 @@
+"""
+Testes do endpoint /metrics e do modo multiprocesso.
+"""
+
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.services.metrics_service import registry
+from config import settings
+from main import create_app
+
+
+def _sample(text: str, prefix: str) -> float:
+    return sum(float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(prefix))
+
+
+def test_metrics_use_route_templates_and_count_queries(database):
+    registry.clear()
+    client = TestClient(create_app())
+    assert client.get("/api/v1/transactions/999999").status_code == 404
+    assert client.get("/api/v1/transactions/888888").status_code == 404
+    client.get("/api/v1/transactions/balance")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    route = 'method="GET",route="/api/v1/transactions/{transaction_id}"'
+    assert f'ruviopay_http_requests_total{{{route},status="404"}} 2' in text
+    assert f'ruviopay_http_request_duration_seconds_count{{{route}}} 2' in text
+    assert "999999" not in text
+    assert _sample(text, f"ruviopay_db_queries_per_request_sum{{{route}}}") >= 2
+    assert 'ruviopay_cache_hit_ratio{cache="response"}' in text
+    assert "ruviopay_db_pool_checkout_seconds_count" in text
+
+
+def test_multiprocess_mode_sums_worker_snapshots(database, tmp_path, monkeypatch):
+    registry.clear()
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    labels = [["method", "GET"], ["route", "/health"], ["status", "200"]]
+    # Snapshot de um worker já encerrado: contadores somam, gauges não
+    (tmp_path / "metrics_999999999.json").write_text(json.dumps({
+        "counters": [["ruviopay_http_requests_total", labels, 5]],
+        "gauges": [["ruviopay_http_requests_in_progress", labels[:2], 3]],
+        "histograms": [],
+    }))
+
+    client = TestClient(create_app())
+    client.get("/health")
+    text = client.get("/metrics").text
+
+    assert 'ruviopay_http_requests_total{method="GET",route="/health",status="200"} 6' in text
+    assert 'ruviopay_http_requests_in_progress{method="GET",route="/health"}' not in text
+    assert 'ruviopay_http_requests_in_progress{method="GET",route="/metrics"} 1' in text
+    assert os.path.exists(tmp_path / f"metrics_{os.getpid()}.json")
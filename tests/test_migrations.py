@@ -0,0 +1,122 @@
+"""
+Testes da verificação de schema na startup e da reconstrução de tabelas
+em lotes.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import create_engine, delete, event, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.migrations import (
+    ensure_schema, rebuild_table_online, run_migrations, schema_copy_progress, schema_migrations,
+)
+from app.models import Category, Transaction, User
+from app.services.rollup_service import check_rollups_consistency
+
+
+def _fresh_engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+
+
+def test_startup_skips_reflection_when_schema_hash_matches(tmp_path):
+    engine = _fresh_engine(tmp_path)
+    assert ensure_schema(engine)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert ensure_schema(engine) == []
+    assert len(statements) == 1 and "schema_version" in statements[0]
+
+
+def test_rebuild_copies_in_resumable_batches(tmp_path):
+    engine = _fresh_engine(tmp_path)
+    ensure_schema(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{"id": 1, "username": "a", "email": "a@ruviopay.com", "full_name": "A",
+                                               "hashed_password": "x"}])
+        conn.execute(insert(Category.__table__), [
+            {"id": i, "name": f"c{i}", "type": "expense", "user_id": 1, "created_at": datetime(2024, 1, 1)}
+            for i in range(1, 26)
+        ])
+
+    table = Base.metadata.tables["categories"]
+    assert rebuild_table_online(engine, table, batch_size=10, max_batches=1) is False
+    with engine.connect() as conn:
+        assert conn.execute(select(schema_copy_progress.c.copied)).scalar_one() == 10
+        # Escrita concorrente depois do primeiro lote
+        conn.execute(text("INSERT INTO categories (id, name, type, user_id) VALUES (26, 'nova', 'income', 1)"))
+        conn.commit()
+
+    assert rebuild_table_online(engine, table, batch_size=10) is True
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM categories")).scalar() == 26
+        assert conn.execute(select(schema_copy_progress)).first() is None
+        tables = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))}
+    assert "categories__new" not in tables
+
+
+def test_upgrade_backfills_rollups_from_existing_transactions(tmp_path):
+    engine = _fresh_engine(tmp_path)
+    ensure_schema(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{"id": 1, "username": "a", "email": "a@ruviopay.com", "full_name": "A",
+                                               "hashed_password": "x"}])
+        conn.execute(insert(Category.__table__), [{"id": 1, "name": "c", "type": "expense", "user_id": 1}])
+        # Transações gravadas antes da tabela de rollups existir
+        conn.execute(insert(Transaction.__table__), [
+            {"description": f"t{i}", "amount": 1000 + i, "type": "expense", "date": datetime(2024, 1 + i % 3, 10),
+             "user_id": 1, "category_id": 1}
+            for i in range(9)
+        ])
+        conn.execute(delete(schema_migrations).where(schema_migrations.c.name == "0004_backfill_rollups"))
+
+    assert run_migrations(engine) == ["0004_backfill_rollups"]
+    with Session(engine) as db:
+        assert check_rollups_consistency(db) == []
+        assert db.execute(text("SELECT SUM(count) FROM transaction_rollups")).scalar() == 9
+
+
+LEGACY_INVESTMENTS = """
+    CREATE TABLE investments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(100) NOT NULL,
+        type VARCHAR(50) NOT NULL,
+        initial_amount DECIMAL(10, 2) NOT NULL,
+        current_amount DECIMAL(10, 2) NOT NULL,
+        purchase_date DATE NOT NULL,
+        description TEXT,
+        status VARCHAR(20) DEFAULT 'active',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def test_update_database_converts_legacy_investments_without_losing_rows(tmp_path):
+    from update_database import update_database
+
+    engine = _fresh_engine(tmp_path)
+    User.__table__.create(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{"id": 7, "username": "dono", "email": "dono@ruviopay.com",
+                                               "full_name": "Dono", "hashed_password": "x"}])
+        conn.execute(text(LEGACY_INVESTMENTS))
+        for i in range(1, 13):
+            conn.execute(text(
+                "INSERT INTO investments (name, type, initial_amount, current_amount, purchase_date) "
+                "VALUES (:name, 'stocks', :initial, :current, '2024-01-01')"
+            ), {"name": f"inv{i}", "initial": 100.10 * i, "current": 110.05 * i})
+
+    update_database(engine)
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT id, amount_invested, current_value, user_id FROM investments ORDER BY id"
+        )).all()
+        migrated = set(conn.execute(text("SELECT name FROM schema_migrations")).scalars())
+    assert [r.id for r in rows] == list(range(1, 13))
+    assert rows[0].amount_invested == 10010 and rows[0].current_value == 11005
+    assert rows[11].amount_invested == 120120
+    assert {r.user_id for r in rows} == {7}
+    assert {"0001_composite_indexes", "0003_money_cents", "0004_backfill_rollups"} <= migrated
@@ -0,0 +1,45 @@
+"""
+Testes do tipo Money (centavos inteiros) e da agregação exata.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from app.models import Category, Transaction, User
+from app.models.types import cents, from_cents, to_cents
+
+USER_ID = 7
+
+
+def test_to_cents_rounds_half_up_and_avoids_float_error():
+    assert to_cents(Decimal("12.345")) == 1235
+    assert to_cents(0.1) == 10
+    assert to_cents("19.99") == 1999
+    assert to_cents(-2) == -200
+
+
+def test_from_cents_keeps_two_places():
+    assert from_cents(1999) == Decimal("19.99")
+    assert str(from_cents(100)) == "1.00"
+
+
+def test_amounts_are_stored_as_integer_cents_and_sum_exactly(db):
+    db.add(User(id=USER_ID, username="money", email="money@ruviopay.com",
+                full_name="Money", hashed_password="x"))
+    db.add(Category(id=70, name="Centavos", type="expense", user_id=USER_ID))
+    db.add_all([
+        Transaction(description=f"t{i}", amount=Decimal("0.10"), type="expense",
+                    date=datetime(2024, 1, 1), category_id=70, user_id=USER_ID)
+        for i in range(3)
+    ])
+    db.flush()
+
+    raw = db.execute(select(cents(Transaction.amount)).where(Transaction.user_id == USER_ID)).scalars().all()
+    assert raw == [10, 10, 10]
+
+    total = db.execute(
+        select(func.sum(Transaction.amount)).where(Transaction.user_id == USER_ID)
+    ).scalar_one()
+    assert total == Decimal("0.30")
@@ -0,0 +1,50 @@
+"""
+Testes do pool de hashing de senhas.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.services.password_service import PasswordHasher, PasswordPoolSaturated
+
+
+def test_hash_and_verify_in_pool():
+    hasher = PasswordHasher(workers=1, queue_size=1, rounds=4)
+
+    async def scenario():
+        hashed = await hasher.hash("segredo")
+        return (
+            await hasher.verify_and_update("segredo", hashed),
+            await hasher.verify_and_update("errada", hashed),
+        )
+
+    ok, wrong = asyncio.run(scenario())
+    assert ok == (True, None)
+    assert wrong == (False, None)
+    assert hasher.stats()["completed"] == 3
+
+
+def test_rehashes_when_rounds_change():
+    old = PasswordHasher(workers=1, queue_size=0, rounds=4)
+    new = PasswordHasher(workers=1, queue_size=0, rounds=5)
+
+    hashed = old.context.hash("segredo")
+    valid, new_hash = asyncio.run(new.verify_and_update("segredo", hashed))
+    assert valid and new_hash and new_hash.startswith("$2b$05$")
+
+
+def test_rejects_when_workers_and_queue_are_full():
+    hasher = PasswordHasher(workers=1, queue_size=1, rounds=4)
+    release = threading.Event()
+    blocked = [hasher._submit(release.wait) for _ in range(2)]
+
+    with pytest.raises(PasswordPoolSaturated):
+        hasher._submit(release.wait)
+
+    release.set()
+    for future in blocked:
+        future.result(timeout=5)
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["in_flight"] == 0
@@ -0,0 +1,253 @@
+"""
+Testes de regressão de plano de consulta.
+
+Executa cada consulta dos services (e do dashboard) contra um banco
+populado, roda EXPLAIN QUERY PLAN em todos os comandos SQL emitidos e
+falha se algum deles fizer varredura completa das tabelas principais.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.models import Category, Goal, Investment, Transaction, User
+from app.schemas.goal import GoalCreate, GoalUpdate
+from app.schemas.investment import InvestmentCreate, InvestmentUpdate
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services import (
+    category_service, dashboard_service, goal_service, investment_service,
+    rollup_service, transaction_service,
+)
+from app.services.cache_service import bump_user_version
+from app.services.query_tracker import track_queries
+
+USER_ID = 1
+GUARDED_TABLES = ("transactions", "goals", "investments", "transaction_rollups")
+
+
+@pytest.fixture(scope="module")
+def seeded(database):
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    db.add(User(id=USER_ID, username="plan", email="plan@ruviopay.com",
+                full_name="Plan", hashed_password="x"))
+    db.add_all([
+        Category(id=1, name="Salário", type="income", user_id=USER_ID),
+        Category(id=2, name="Alimentação", type="expense", user_id=USER_ID),
+        Category(id=3, name="Transporte", type="expense", user_id=USER_ID),
+    ])
+    start = datetime(2024, 1, 1)
+    for i in range(600):
+        is_income = i % 5 == 0
+        db.add(Transaction(
+            description=f"Transação {i}",
+            amount=Decimal("10.50") + i,
+            type="income" if is_income else "expense",
+            date=start + timedelta(days=i),
+            category_id=1 if is_income else 2 + i % 2,
+            user_id=USER_ID,
+        ))
+    for i in range(20):
+        db.add(Investment(
+            name=f"Investimento {i}", type="stocks" if i % 2 else "funds",
+            amount_invested=Decimal("1000"), current_value=Decimal("1100"),
+            purchase_date=start + timedelta(days=30 * i), user_id=USER_ID,
+        ))
+    for goal_type, category_id in (("expense_limit", 2), ("expense_limit", None),
+                                   ("savings_target", None), ("investment_goal", None)):
+        db.add(Goal(
+            title=goal_type, goal_type=goal_type, target_amount=Decimal("5000"),
+            period_type="yearly", start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 12, 31), user_id=USER_ID, category_id=category_id,
+        ))
+    db.commit()
+    rollup_service.rebuild_rollups(db)
+    db.close()
+    return database
+
+
+@contextmanager
+def captured_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def full_scans(engine, statements):
+    """Retorna os passos 'SCAN <tabela>' dos planos das consultas capturadas"""
+    scans = []
+    with engine.connect() as conn:
+        raw = conn.connection.driver_connection
+        for statement, parameters in statements:
+            if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+                continue
+            for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()):
+                detail = row[-1]
+                # Compara o nome inteiro: "SCAN transactions_fts VIRTUAL TABLE INDEX"
+                # é uma consulta MATCH no índice FTS, não uma varredura
+                words = detail.split()
+                if words[:1] == ["SCAN"] and len(words) > 1 and words[1] in GUARDED_TABLES:
+                    scans.append((detail, statement))
+    return scans
+
+
+def _txn(**overrides):
+    data = dict(description="Nova", amount=Decimal("42.00"), type="expense",
+                date=datetime(2024, 6, 15), category_id=2)
+    data.update(overrides)
+    return TransactionCreate(**data)
+
+
+def _cursor_pages(db):
+    page = transaction_service.get_transactions_page(db, USER_ID, limit=20, cursor="")
+    transaction_service.get_transactions_page(db, USER_ID, limit=20, cursor=page["next_cursor"])
+
+
+def _create_update_delete_transaction(db):
+    created = transaction_service.create_transaction(db, _txn(), USER_ID)
+    transaction_service.update_transaction(
+        db, created["id"], TransactionUpdate(amount=Decimal("43.00"), category_id=3), USER_ID
+    )
+    transaction_service.delete_transaction(db, created["id"], USER_ID)
+
+
+def _create_update_delete_goal(db):
+    goal = goal_service.create_goal(db, GoalCreate(
+        title="Meta", goal_type="expense_limit", target_amount=100, period_type="monthly",
+        start_date=datetime(2024, 6, 1), end_date=datetime(2024, 6, 30),
+    ), USER_ID)
+    goal_service.update_goal(db, goal.id, GoalUpdate(target_amount=200), USER_ID)
+    goal_service.delete_goal(db, goal.id, USER_ID)
+
+
+def _create_update_delete_investment(db):
+    investment = investment_service.create_investment(db, InvestmentCreate(
+        name="CDB", type="fixed_income", amount_invested=500, current_value=510,
+        purchase_date=datetime(2024, 6, 1),
+    ), USER_ID)
+    investment_service.update_investment(db, investment.id, InvestmentUpdate(current_value=520), USER_ID)
+    investment_service.delete_investment(db, investment.id, USER_ID)
+
+
+SERVICE_CALLS = {
+    "transactions.list": lambda db: transaction_service.get_transactions_by_user(db, USER_ID),
+    "transactions.list_filtered": lambda db: transaction_service.get_transactions_by_user(
+        db, USER_ID, start_date=datetime(2024, 3, 1), end_date=datetime(2024, 6, 1),
+        transaction_type="expense", category_id=2),
+    "transactions.list_by_amount": lambda db: transaction_service.get_transactions_by_user(
+        db, USER_ID, sort_by="amount"),
+    "transactions.list_by_description": lambda db: transaction_service.get_transactions_by_user(
+        db, USER_ID, sort_by="description", order="asc"),
+    "transactions.cursor_pages": _cursor_pages,
+    "transactions.export": lambda db: list(transaction_service.iter_transactions_for_export(db, USER_ID)),
+    "transactions.search": lambda db: transaction_service.search_transactions(db, USER_ID, "trans"),
+    "transactions.search_filtered": lambda db: transaction_service.search_transactions(
+        db, USER_ID, "Transação 1", start_date=datetime(2024, 3, 1), transaction_type="expense"),
+    "transactions.by_id": lambda db: transaction_service.get_transaction_by_id(db, 1, USER_ID),
+    "transactions.recent": lambda db: transaction_service.get_recent_transactions(db, USER_ID),
+    "transactions.balance": lambda db: transaction_service.get_user_balance(db, USER_ID),
+    "transactions.monthly_summary": lambda db: transaction_service.get_monthly_summary(db, USER_ID, 2024, 5),
+    "transactions.writes": _create_update_delete_transaction,
+    "rollups.rebuild_user": lambda db: rollup_service.rebuild_rollups(db, USER_ID),
+    "rollups.check_user": lambda db: rollup_service.check_rollups_consistency(db, USER_ID),
+    "categories.list": lambda db: category_service.get_categories_by_user(db, USER_ID),
+    "categories.by_type": lambda db: category_service.get_categories_by_type(db, USER_ID, "expense"),
+    "categories.stats": lambda db: category_service.get_category_stats(db, USER_ID),
+    "categories.stats_months": lambda db: category_service.get_category_stats(
+        db, USER_ID, start_date=datetime(2024, 3, 1), end_date=datetime(2024, 6, 1)),
+    "categories.stats_range": lambda db: category_service.get_category_stats(
+        db, USER_ID, start_date=datetime(2024, 3, 10), end_date=datetime(2024, 5, 20),
+        category_type="expense"),
+    "goals.list": lambda db: goal_service.get_goals_by_user(db, USER_ID),
+    "goals.list_page": lambda db: goal_service.get_goals_by_user(db, USER_ID, skip=1, limit=2),
+    "goals.progress": lambda db: goal_service.update_goal_progress(db, USER_ID),
+    "goals.summary": lambda db: goal_service.get_goals_summary(db, USER_ID),
+    "goals.writes": _create_update_delete_goal,
+    "investments.list": lambda db: investment_service.get_investments_by_user(db, USER_ID),
+    "investments.summary": lambda db: investment_service.get_investments_summary(db, USER_ID),
+    "investments.writes": _create_update_delete_investment,
+    "dashboard.stats": lambda db: dashboard_service.get_dashboard_stats(db, USER_ID),
+    "dashboard.chart_data": lambda db: dashboard_service.get_chart_data(db, USER_ID),
+}
+
+
+@pytest.mark.parametrize("name", sorted(SERVICE_CALLS))
+def test_service_queries_use_indexes(seeded, db, name):
+    bump_user_version(USER_ID)
+    with captured_statements(seeded) as statements:
+        SERVICE_CALLS[name](db)
+
+    assert statements, f"{name} não executou nenhuma consulta"
+    scans = full_scans(seeded, statements)
+    assert not scans, "\n".join(f"{detail}: {sql}" for detail, sql in scans)
+
+
+# Orçamento de comandos SQL por chamada: cresceu, provavelmente é um N+1
+QUERY_BUDGETS = {
+    "transactions.list": 1,
+    "transactions.list_filtered": 1,
+    "transactions.list_by_amount": 1,
+    "transactions.list_by_description": 1,
+    "transactions.cursor_pages": 2,
+    "transactions.export": 1,
+    "transactions.search": 1,
+    "transactions.search_filtered": 1,
+    "transactions.by_id": 1,
+    "transactions.recent": 1,
+    "transactions.balance": 1,
+    "transactions.monthly_summary": 2,
+    "transactions.writes": 25,
+    "rollups.rebuild_user": 2,
+    "rollups.check_user": 2,
+    "categories.list": 1,
+    "categories.by_type": 1,
+    "categories.stats": 1,
+    "categories.stats_months": 1,
+    "categories.stats_range": 1,
+    "goals.list": 1,
+    "goals.list_page": 1,
+    "goals.progress": 3,
+    "goals.summary": 1,
+    "goals.writes": 12,
+    "investments.list": 1,
+    "investments.summary": 3,
+    "investments.writes": 18,
+    "dashboard.stats": 2,
+    "dashboard.chart_data": 1,
+}
+
+
+@pytest.mark.parametrize("name", sorted(SERVICE_CALLS))
+def test_service_query_budgets(seeded, db, name):
+    bump_user_version(USER_ID)
+    with track_queries(name, max_queries=QUERY_BUDGETS[name]):
+        SERVICE_CALLS[name](db)
+
+
+@pytest.mark.parametrize("sort_by", sorted(transaction_service.SORT_COLUMNS))
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_cursor_pages_visit_every_transaction_once(seeded, db, sort_by, order):
+    expected = db.query(Transaction.id).filter(Transaction.user_id == USER_ID).count()
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        page = transaction_service.get_transactions_page(
+            db, USER_ID, limit=37, cursor=cursor, sort_by=sort_by, order=order
+        )
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        assert len(seen) <= expected, "paginação repetiu páginas"
+
+    assert len(seen) == len(set(seen)) == expected
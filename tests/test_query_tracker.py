@@ -0,0 +1,30 @@
+"""
+Testes do contador de comandos SQL por escopo e da detecção de N+1.
+"""
+
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app.services.query_tracker import statement_shape, track_queries
+
+
+def test_statement_shape_ignores_literals_and_in_list_sizes():
+    assert statement_shape("SELECT * FROM t WHERE id = 42 AND name = 'ana'") == \
+        "SELECT * FROM t WHERE id = ? AND name = ?"
+    assert statement_shape("SELECT a1 FROM t2\n  WHERE id IN (?, ?, ?)") == \
+        statement_shape("SELECT a1 FROM t2 WHERE id IN (?)")
+
+
+def test_repeated_statement_warns_and_budget_fails(db, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.services.query_tracker"):
+        with pytest.raises(AssertionError, match="12 comandos SQL, orçamento 5"):
+            with track_queries("loop", max_queries=5) as outer:
+                for i in range(12):
+                    with track_queries() as inner:
+                        db.execute(text(f"SELECT {i}"))
+
+    assert inner.count == 1 and inner.seconds > 0
+    assert outer.shapes["SELECT ?"] == 12
+    assert "Possible N+1 in loop: statement executed 12 times: SELECT ?" in caplog.text
@@ -0,0 +1,117 @@
+"""
+Testes do cache de respostas: limites do LRU, TTL, período de graça,
+invalidação por versão e versões compartilhadas entre workers.
+"""
+
+import pytest
+
+from app.services import cache_service
+from app.services.cache_service import ResponseCache, SharedVersions, cache_active
+from config import settings
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_service.time, "monotonic", clock)
+    return clock
+
+
+def _counting(value):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+
+    return compute, calls
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = ResponseCache(max_entries=2)
+    cache.get_or_compute(1, "a", (), lambda: "a")
+    cache.get_or_compute(1, "b", (), lambda: "b")
+    cache.get_or_compute(1, "a", (), lambda: "novo")  # "a" passa a ser o mais recente
+    cache.get_or_compute(1, "c", (), lambda: "c")
+
+    assert cache.stats()["entries"] == 2 and cache.evictions == 1
+    assert cache.get_or_compute(1, "a", (), lambda: "recalculado") == "a"
+    assert cache.get_or_compute(1, "b", (), lambda: "recalculado") == "recalculado"
+
+
+def test_byte_limit_evicts_and_skips_oversized_values():
+    value = "x" * 1000
+    size = cache_service._estimate_size(value)
+    cache = ResponseCache(max_bytes=size * 2)
+    for endpoint in ("a", "b", "c"):
+        cache.get_or_compute(1, endpoint, (), lambda: value)
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] <= size * 2
+
+    cache.get_or_compute(1, "grande", (), lambda: "y" * 10000)
+    assert cache.stats()["entries"] == 2
+
+
+def test_ttl_expiry_recomputes(clock):
+    cache = ResponseCache(ttl=10)
+    compute, calls = _counting(42)
+    cache.get_or_compute(1, "a", (), compute)
+    clock.now += 9
+    cache.get_or_compute(1, "a", (), compute)
+    assert len(calls) == 1
+    clock.now += 2
+    cache.get_or_compute(1, "a", (), compute)
+    assert len(calls) == 2
+
+
+def test_stale_value_is_served_only_within_grace_window(clock):
+    cache = ResponseCache(ttl=10, stale_grace=5)
+    cache.get_or_compute(1, "a", (), lambda: "antigo")
+
+    def failing():
+        raise RuntimeError("banco fora")
+
+    clock.now += 12
+    assert cache.get_or_compute(1, "a", (), failing) == "antigo"
+    assert cache.stale_hits == 1
+    clock.now += 5
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute(1, "a", (), failing)
+
+
+def test_version_bump_invalidates_only_that_user():
+    cache = ResponseCache()
+    compute, calls = _counting("saldo")
+    cache.get_or_compute(1, "balance", (), compute)
+    cache.get_or_compute(2, "balance", (), compute)
+    cache.bump_user_version(1)
+    cache.get_or_compute(1, "balance", (), compute)
+    cache.get_or_compute(2, "balance", (), compute)
+    assert len(calls) == 3
+
+
+def test_shared_versions_invalidate_across_workers(tmp_path):
+    # Dois caches com o mesmo diretório fazem o papel de dois workers
+    worker_a = ResponseCache(versions=SharedVersions(str(tmp_path)))
+    worker_b = ResponseCache(versions=SharedVersions(str(tmp_path)))
+    assert worker_b.get_or_compute(1, "balance", (), lambda: 100) == 100
+
+    worker_a.bump_user_version(1)
+    assert worker_b.get_or_compute(1, "balance", (), lambda: 250) == 250
+    assert worker_a.get_user_version(1) == worker_b.get_user_version(1) == 1
+
+
+def test_cache_stays_off_with_several_workers_and_local_versions(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 1)
+    assert cache_active()
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    assert not cache_active()
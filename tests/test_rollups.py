@@ -0,0 +1,48 @@
+"""
+Testes da manutenção incremental dos rollups mensais.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from app.models import Category, TransactionRollup, User
+from app.schemas.transaction import TransactionCreate, TransactionUpdate
+from app.services import transaction_service
+from app.services.rollup_service import check_rollups_consistency
+
+USER_ID = 42
+
+
+def test_writes_keep_rollups_consistent(db):
+    db.add(User(id=USER_ID, username="rollup", email="rollup@ruviopay.com",
+                full_name="Rollup", hashed_password="x"))
+    db.add_all([
+        Category(id=420, name="Mercado", type="expense", user_id=USER_ID),
+        Category(id=421, name="Lazer", type="expense", user_id=USER_ID),
+        Category(id=422, name="Salário", type="income", user_id=USER_ID),
+    ])
+    db.commit()
+
+    created = [
+        transaction_service.create_transaction(db, TransactionCreate(
+            description=f"t{i}", amount=Decimal("12.34") * (i + 1), type="expense",
+            date=datetime(2024, 1 + i % 2, 15), category_id=420,
+        ), USER_ID)
+        for i in range(4)
+    ]
+    assert check_rollups_consistency(db, USER_ID) == []
+
+    # Troca de mês, de categoria, de tipo e de valor
+    transaction_service.update_transaction(db, created[0]["id"], TransactionUpdate(date=datetime(2024, 3, 1)), USER_ID)
+    transaction_service.update_transaction(db, created[1]["id"], TransactionUpdate(category_id=421), USER_ID)
+    transaction_service.update_transaction(db, created[3]["id"], TransactionUpdate(amount=Decimal("0.01")), USER_ID)
+    transaction_service.update_transaction(db, created[2]["id"], TransactionUpdate(
+        type="income", category_id=422, amount=Decimal("1000.00"), date=datetime(2023, 12, 31, 23, 59),
+    ), USER_ID)
+    assert check_rollups_consistency(db, USER_ID) == []
+
+    for transaction in created:
+        transaction_service.delete_transaction(db, transaction["id"], USER_ID)
+    assert check_rollups_consistency(db, USER_ID) == []
+    # Chaves zeradas são removidas
+    assert db.query(TransactionRollup).filter(TransactionRollup.user_id == USER_ID).count() == 0
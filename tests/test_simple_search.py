@@ -0,0 +1,114 @@
+"""
+Testes da busca textual (FTS5) do main_simple_fixed.py: relevância,
+prefixos e triggers que mantêm o índice junto com a tabela.
+"""
+
+import importlib
+import os
+import sqlite3
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def simple_app(tmp_path_factory):
+    database = str(tmp_path_factory.mktemp("simple") / "simple.db")
+    # init_db() espera a tabela de categorias já existente
+    conn = sqlite3.connect(database)
+    conn.execute("CREATE TABLE categories (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+                 "type TEXT NOT NULL, color TEXT, is_default INTEGER DEFAULT 0, created_at TEXT)")
+    conn.commit()
+    conn.close()
+
+    previous = os.environ.get("RUVIPAY_SIMPLE_DB")
+    os.environ["RUVIPAY_SIMPLE_DB"] = database
+    sys.modules.pop("main_simple_fixed", None)
+    module = importlib.import_module("main_simple_fixed")
+    try:
+        yield module
+    finally:
+        module._pool.close_all()
+        sys.modules.pop("main_simple_fixed", None)
+        if previous is None:
+            os.environ.pop("RUVIPAY_SIMPLE_DB", None)
+        else:
+            os.environ["RUVIPAY_SIMPLE_DB"] = previous
+
+
+@pytest.fixture
+def client(simple_app):
+    with TestClient(simple_app.app) as client:
+        yield client
+    conn = sqlite3.connect(simple_app.DATABASE)
+    conn.execute("DELETE FROM transactions")
+    conn.commit()
+    conn.close()
+
+
+def _create(client, description, category="Alimentação", date="2024-05-10"):
+    response = client.post("/api/v1/transactions", json={
+        "description": description, "amount": 10.0, "type": "expense", "category": category, "date": date,
+    })
+    return response.json()["data"]["id"]
+
+
+def _search(client, q, **filters):
+    response = client.get("/api/v1/transactions/search", params={"q": q, **filters})
+    assert response.status_code == 200
+    return [row["description"] for row in response.json()["data"]]
+
+
+def _index_is_consistent(simple_app):
+    conn = sqlite3.connect(simple_app.DATABASE)
+    try:
+        # Falha com SQLITE_CORRUPT se o índice divergir da tabela de conteúdo
+        conn.execute("INSERT INTO transactions_fts(transactions_fts, rank) VALUES ('integrity-check', 1)")
+    finally:
+        conn.close()
+
+
+def test_results_are_ranked_by_relevance(client):
+    _create(client, "Conta de luz paga no caixa eletrônico do mercado livre de energia", date="2024-05-20")
+    _create(client, "Mercado", date="2024-05-01")
+    _create(client, "Farmácia")
+
+    # Documento curto com o termo vem antes, mesmo sendo mais antigo
+    assert _search(client, "mercado") == [
+        "Mercado", "Conta de luz paga no caixa eletrônico do mercado livre de energia",
+    ]
+
+
+def test_prefix_accent_and_category_matching(client):
+    _create(client, "Supermercado Extra")
+    _create(client, "Mensalidade academia", category="Saúde")
+    _create(client, "Padaria")
+
+    assert _search(client, "super") == ["Supermercado Extra"]
+    assert _search(client, "academ mens") == ["Mensalidade academia"]
+    # remove_diacritics: "saude" encontra a categoria "Saúde"
+    assert _search(client, "saude") == ["Mensalidade academia"]
+    assert _search(client, "padaria", type="income") == []
+
+
+def test_triggers_keep_index_in_sync_on_update_and_delete(simple_app, client):
+    transaction_id = _create(client, "Cinema com amigos", category="Lazer")
+    assert _search(client, "cinema") == ["Cinema com amigos"]
+
+    client.put(f"/api/v1/transactions/{transaction_id}", json={"description": "Teatro municipal"})
+    assert _search(client, "cinema") == []
+    assert _search(client, "teatro") == ["Teatro municipal"]
+
+    client.put(f"/api/v1/transactions/{transaction_id}", json={"category": "Transporte"})
+    assert _search(client, "lazer") == []
+    assert _search(client, "transporte") == ["Teatro municipal"]
+
+    # Atualização de outras colunas não mexe no índice
+    client.put(f"/api/v1/transactions/{transaction_id}", json={"amount": 99.0})
+    assert _search(client, "teatro") == ["Teatro municipal"]
+    _index_is_consistent(simple_app)
+
+    client.delete(f"/api/v1/transactions/{transaction_id}")
+    assert _search(client, "teatro") == []
+    _index_is_consistent(simple_app)